@@ -4,14 +4,44 @@ Calculates ATS compatibility score for resumes
 """
 
 from typing import Dict, List, Tuple
+import hashlib
+import json
 import re
 from langchain_huggingface import HuggingFaceEmbeddings
 import numpy as np
 
+import metrics
+import tracing
+from parsed_resume import section_text
+
+# Sections where technical skills are listed or applied
+SKILL_SECTIONS = ('skills', 'experience', 'projects')
+
+
+def _lower_text(resume: Dict) -> str:
+    """Lowercase resume text; a ParsedResume computes it once and reuses it"""
+    lower_text = getattr(resume, 'lower_text', None)
+    return lower_text if lower_text is not None else resume.get('text', '').lower()
+
+
+def _lower_section_text(resume: Dict, names: Tuple[str, ...]) -> str:
+    """Lowercase text of the named sections (whole text if none was found); cached by a ParsedResume"""
+    lower_section_text = getattr(resume, 'lower_section_text', None)
+    if lower_section_text is not None:
+        return lower_section_text(names)
+    spans = resume.get('section_spans')
+    if not spans:
+        return _lower_text(resume)
+    return section_text(resume.get('text', ''), spans, names).lower()
+
 
 class ATSScorer:
     """Calculate ATS compatibility score"""
     
+    # Bump whenever scoring logic changes so cached results are invalidated
+    VERSION = "2"
+    EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+    
     def __init__(self):
         # Common ATS-friendly keywords by category
         self.technical_keywords = [
@@ -41,11 +71,24 @@ class ATSScorer:
         
         # Initialize embeddings model for semantic scoring
         try:
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
-            )
+            self.embeddings = metrics.InstrumentedEmbeddings(HuggingFaceEmbeddings(
+                model_name=self.EMBEDDING_MODEL
+            ))
         except:
             self.embeddings = None
+        
+        self.cache_version = self._cache_version()
+    
+    def _cache_version(self) -> str:
+        """Scorer version plus a fingerprint of the keyword taxonomy and embedding model"""
+        taxonomy = json.dumps({
+            'technical_keywords': self.technical_keywords,
+            'soft_skills': self.soft_skills,
+            'must_have_skills': self.must_have_skills,
+            'formatting_errors': self.formatting_errors,
+            'embedding_model': self.EMBEDDING_MODEL if self.embeddings else None
+        }, sort_keys=True)
+        return f"{self.VERSION}-{hashlib.sha256(taxonomy.encode('utf-8')).hexdigest()[:12]}"
     
     def calculate_ats_score(self, parsed_resume: Dict, job_description: str = "") -> Dict:
         """
@@ -63,7 +106,8 @@ class ATSScorer:
         
         # Calculate individual scores
         format_score = self.score_format(parsed_resume)
-        keyword_score = self.score_keywords(parsed_resume, job_description)
+        with tracing.span('ats.keywords'), metrics.timed(metrics.ANALYSIS_SECONDS, stage='keywords'):
+            keyword_score = self.score_keywords(parsed_resume, job_description)
         section_score = self.score_sections(parsed_resume)
         contact_score = self.score_contact(parsed_resume)
         experience_score = self.score_experience(parsed_resume)
@@ -94,10 +138,12 @@ class ATSScorer:
             grade = "Needs Improvement"
         
         # Calculate Technical ATS Score
-        technical_ats_score = self.calculate_technical_ats_score(parsed_resume, job_description)
+        with tracing.span('ats.technical'), metrics.timed(metrics.ANALYSIS_SECONDS, stage='technical'):
+            technical_ats_score = self.calculate_technical_ats_score(parsed_resume, job_description)
         
         # Calculate Semantic Score
-        semantic_score = self.calculate_semantic_score(parsed_resume, job_description)
+        with tracing.span('ats.semantic'), metrics.timed(metrics.ANALYSIS_SECONDS, stage='semantic'):
+            semantic_score = self.calculate_semantic_score(parsed_resume, job_description)
         
         return {
             'total_score': round(total_score),
@@ -141,10 +187,11 @@ class ATSScorer:
         """Score keyword presence (25 points max)"""
         score = 0
         feedback = []
-        text = resume.get('text', '').lower()
+        text = _lower_text(resume)
         
-        # Technical keywords
-        tech_found = sum(1 for kw in self.technical_keywords if kw in text)
+        # Technical keywords (contact details and education are left out)
+        skill_text = _lower_section_text(resume, SKILL_SECTIONS)
+        tech_found = sum(1 for kw in self.technical_keywords if kw in skill_text)
         tech_score = min(15, (tech_found / len(self.technical_keywords)) * 15)
         score += tech_score
         
@@ -281,7 +328,7 @@ class ATSScorer:
         Returns:
             Dictionary with technical score details
         """
-        text = resume.get('text', '').lower()
+        text = _lower_text(resume)
         result = {
             'keyword_overlap_percentage': 0,
             'must_have_skills_found': [],
@@ -399,8 +446,9 @@ class ATSScorer:
             jd_chunks = self._extract_semantic_chunks(job_description)
             
             # Generate embeddings
-            resume_embeddings = [self.embeddings.embed_query(chunk) for chunk in resume_chunks]
-            jd_embeddings = [self.embeddings.embed_query(chunk) for chunk in jd_chunks]
+            with tracing.span('ats.embed', resume_chunks=len(resume_chunks), jd_chunks=len(jd_chunks)):
+                resume_embeddings = [self.embeddings.embed_query(chunk) for chunk in resume_chunks]
+                jd_embeddings = [self.embeddings.embed_query(chunk) for chunk in jd_chunks]
             
             # Calculate cosine similarity between all pairs
             similarities = []
@@ -562,7 +610,7 @@ class ATSScorer:
             result['error'] = 'Please provide at least 3 job descriptions for career path analysis'
             return result
         
-        resume_text = resume.get('text', '').lower()
+        resume_text = _lower_text(resume)
         
         try:
             # 1. AGGREGATE KEYWORDS ACROSS ALL JDs
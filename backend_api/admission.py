@@ -0,0 +1,134 @@
+"""
+Cost-aware admission control
+Each endpoint cost class gets bounded concurrency and a bounded wait queue;
+requests beyond both are rejected immediately with Retry-After.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from executors import PARSE_WORKERS, RAG_WORKERS, SCORE_WORKERS
+
+
+class AdmissionRejected(Exception):
+    """Raised when a cost class cannot take another request"""
+
+    def __init__(self, cost_class: str, status_code: int, retry_after: int, reason: str):
+        super().__init__(f"{cost_class}: {reason}")
+        self.cost_class = cost_class
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class CostClass:
+    """Concurrency limit, wait queue and counters for one kind of request"""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float, retry_after: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted_total = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    async def acquire(self):
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                # Queue full: tell the client to back off
+                self.rejected_queue_full += 1
+                raise AdmissionRejected(self.name, 429, self.retry_after, "too many queued requests")
+            self.waiting += 1
+            # Not wait_for: on 3.11 its timeout can fire just as the semaphore is
+            # acquired and the permit is lost, so abandoned waits give it back here
+            waiter = asyncio.ensure_future(self._semaphore.acquire())
+            try:
+                done, _ = await asyncio.wait({waiter}, timeout=self.queue_timeout)
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+            finally:
+                self.waiting -= 1
+            if not done:
+                self._abandon(waiter)
+                # Waited too long: the service is overloaded right now
+                self.rejected_timeout += 1
+                raise AdmissionRejected(self.name, 503, self.retry_after, "timed out waiting for capacity")
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        self.admitted_total += 1
+
+    def _abandon(self, waiter: asyncio.Future):
+        """Cancel a semaphore wait nobody will use, releasing the permit if it was acquired anyway"""
+        def give_back(task):
+            if not task.cancelled() and task.exception() is None:
+                self._semaphore.release()
+        waiter.add_done_callback(give_back)
+        waiter.cancel()
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict:
+        return {
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'active': self.active,
+            'queue_depth': self.waiting,
+            'admitted_total': self.admitted_total,
+            'rejected_queue_full_total': self.rejected_queue_full,
+            'rejected_timeout_total': self.rejected_timeout
+        }
+
+
+def _class_from_env(name: str, concurrency: int, queue: int, timeout: float, retry_after: int) -> CostClass:
+    prefix = f"ADMISSION_{name.upper()}_"
+    return CostClass(
+        name,
+        max_concurrency=max(1, int(os.environ.get(prefix + "CONCURRENCY", concurrency))),
+        max_queue=max(0, int(os.environ.get(prefix + "QUEUE", queue))),
+        queue_timeout=float(os.environ.get(prefix + "TIMEOUT", timeout)),
+        retry_after=int(os.environ.get(prefix + "RETRY_AFTER", retry_after))
+    )
+
+
+class AdmissionController:
+    """Registry of cost classes used by the API handlers"""
+
+    def __init__(self):
+        self.classes: Dict[str, CostClass] = {
+            # PDF/DOCX extraction (parse-resume, analyze)
+            'parse': _class_from_env('parse', PARSE_WORKERS, 16, 10.0, 2),
+            # Embedding-backed semantic scoring (calculate-ats)
+            'score': _class_from_env('score', SCORE_WORKERS, 16, 10.0, 2),
+            # Retrieval + LLM (ask-question)
+            'rag': _class_from_env('rag', RAG_WORKERS, 16, 20.0, 5),
+            # Multi-resume uploads (batch-analyze, jobs)
+            'batch': _class_from_env('batch', 2, 2, 5.0, 30),
+        }
+
+    async def acquire(self, name: str):
+        await self.classes[name].acquire()
+
+    def release(self, name: str):
+        self.classes[name].release()
+
+    @asynccontextmanager
+    async def admit(self, name: str):
+        """Hold a slot of the given cost class for the duration of the block"""
+        await self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: cost_class.stats() for name, cost_class in self.classes.items()}
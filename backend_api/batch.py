@@ -0,0 +1,213 @@
+"""
+Batch resume analysis
+Streams one NDJSON line per resume from uploaded files or ZIP archives
+"""
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from executors import ExecutorSaturated, PARSE_WORKERS, _env_int, parse_resume_async, score_resume_async
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+BATCH_MAX_MEMBER_BYTES = _env_int("BATCH_MAX_MEMBER_BYTES", 10 * 1024 * 1024)
+BATCH_MAX_MEMBERS = _env_int("BATCH_MAX_MEMBERS", 1000)
+BATCH_CONCURRENCY = _env_int("BATCH_CONCURRENCY", PARSE_WORKERS)
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class MemberTooLarge(Exception):
+    """Raised when an archive member exceeds BATCH_MAX_MEMBER_BYTES"""
+
+
+def copy_limited(src, dst, limit: int):
+    """Stream src into dst chunk by chunk, failing once more than limit bytes were copied"""
+    copied = 0
+    while True:
+        chunk = src.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            return copied
+        copied += len(chunk)
+        if copied > limit:
+            raise MemberTooLarge(f"File exceeds {limit} bytes")
+        dst.write(chunk)
+
+
+def stage_uploads(files, work_dir: str) -> List[Tuple[str, str]]:
+    """
+    Copy the uploaded files into work_dir before the request body is released
+
+    Returns:
+        List of (original filename, staged path)
+    """
+    staged = []
+    for i, upload in enumerate(files):
+        filename = os.path.basename(upload.filename or f"upload_{i}")
+        path = os.path.join(work_dir, f"{i:05d}_{filename}")
+        upload.file.seek(0)
+        with open(path, 'wb') as out:
+            shutil.copyfileobj(upload.file, out, COPY_CHUNK_SIZE)
+        staged.append((filename, path))
+    return staged
+
+
+def iter_members(staged: List[Tuple[str, str]], work_dir: str,
+                 max_members: int = BATCH_MAX_MEMBERS) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Yield (name, path, error) for every resume in the staged uploads.
+    ZIP members are extracted one at a time, so only one member is on disk
+    (per in-flight task) and nothing is held in memory.
+    """
+    count = 0
+    for filename, path in staged:
+        if filename.lower().endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(path)
+            except zipfile.BadZipFile:
+                yield filename, None, "Invalid ZIP archive"
+                continue
+            with archive:
+                for info in archive.infolist():
+                    name = info.filename
+                    if info.is_dir() or name.startswith('__MACOSX/') or not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        continue
+                    count += 1
+                    if count > max_members:
+                        yield name, None, f"Batch limit of {max_members} resumes exceeded"
+                        return
+                    if info.file_size > BATCH_MAX_MEMBER_BYTES:
+                        yield name, None, f"File exceeds {BATCH_MAX_MEMBER_BYTES} bytes"
+                        continue
+                    member_path = os.path.join(work_dir, f"m{count:06d}{os.path.splitext(name)[1].lower()}")
+                    try:
+                        with archive.open(info) as src, open(member_path, 'wb') as dst:
+                            copy_limited(src, dst, BATCH_MAX_MEMBER_BYTES)
+                    except (MemberTooLarge, zipfile.BadZipFile, RuntimeError) as e:
+                        if os.path.exists(member_path):
+                            os.unlink(member_path)
+                        yield name, None, str(e)
+                        continue
+                    yield name, member_path, None
+            os.unlink(path)
+        elif filename.lower().endswith(SUPPORTED_EXTENSIONS):
+            count += 1
+            if count > max_members:
+                yield filename, None, f"Batch limit of {max_members} resumes exceeded"
+                return
+            # Keep the extension for the parser, which dispatches on it
+            yield filename, path, None
+        else:
+            yield filename, None, "Only PDF, DOCX and ZIP files are supported"
+
+
+async def _with_backoff(call, retries: int):
+    """Await call(), retrying with linear backoff while its executor is saturated"""
+    for attempt in range(retries):
+        try:
+            return await call()
+        except ExecutorSaturated:
+            # Interactive traffic has priority; back off and retry
+            if attempt == retries - 1:
+                raise
+            await asyncio.sleep(0.25 * (attempt + 1))
+
+
+async def analyze_member(name: str, path: str, scorer, job_description: str,
+                         include_text: bool, retries: int = 20) -> Dict:
+    """Parse and score one staged resume, always returning a result line"""
+    start = time.perf_counter()
+    try:
+        parsed = await _with_backoff(lambda: parse_resume_async(path), retries)
+
+        if 'error' in parsed:
+            return {'type': 'result', 'filename': name, 'status': 'error', 'error': parsed['error']}
+
+        ats_result = await _with_backoff(lambda: score_resume_async(scorer, parsed, job_description), retries)
+        if not include_text:
+            parsed = {key: value for key, value in parsed.items() if key != 'text'}
+        return {
+            'type': 'result',
+            'filename': name,
+            'status': 'ok',
+            'parsed_resume': parsed,
+            'ats_result': ats_result,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+    except Exception as e:
+        return {'type': 'result', 'filename': name, 'status': 'error', 'error': str(e)}
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+async def stream_batch(staged: List[Tuple[str, str]], work_dir: str, scorer,
+                       job_description: str = "", include_text: bool = False) -> AsyncIterator[bytes]:
+    """
+    Analyze staged uploads with bounded parallelism, yielding NDJSON lines as each resume finishes
+    """
+    start = time.perf_counter()
+    members = iter_members(staged, work_dir)
+    pending = set()
+    total = succeeded = failed = 0
+    exhausted = False
+
+    def line(payload: Dict) -> bytes:
+        return (json.dumps(payload) + "\n").encode('utf-8')
+
+    try:
+        while pending or not exhausted:
+            # Top the window up, extracting the next member only when there is room
+            while not exhausted and len(pending) < max(1, BATCH_CONCURRENCY):
+                member = await asyncio.to_thread(next, members, None)
+                if member is None:
+                    exhausted = True
+                    break
+                name, path, error = member
+                total += 1
+                if error:
+                    failed += 1
+                    yield line({'type': 'result', 'filename': name, 'status': 'error', 'error': error})
+                    continue
+                pending.add(asyncio.create_task(
+                    analyze_member(name, path, scorer, job_description, include_text)
+                ))
+
+            if not pending:
+                continue
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if result['status'] == 'ok':
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield line(result)
+
+        elapsed = time.perf_counter() - start
+        yield line({
+            'type': 'summary',
+            'total': total,
+            'succeeded': succeeded,
+            'failed': failed,
+            'elapsed_s': round(elapsed, 3),
+            'resumes_per_second': round(total / elapsed, 2) if elapsed else 0.0
+        })
+    finally:
+        for task in pending:
+            task.cancel()
+        try:
+            members.close()
+        except ValueError:
+            # A to_thread(next, ...) cancelled with the request may still be running it
+            pass
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def create_work_dir() -> str:
+    return tempfile.mkdtemp(prefix="resume_batch_")
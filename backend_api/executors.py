@@ -0,0 +1,185 @@
+"""
+Bounded executor layer for CPU-bound work
+Keeps PDF extraction and embedding-backed scoring off the event loop
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+# Worker processes import this module directly, so they need the parent path too
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+import tracing
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+PARSE_WORKERS = _env_int("PARSE_WORKERS", min(4, os.cpu_count() or 1))
+PARSE_QUEUE_LIMIT = _env_int("PARSE_QUEUE_LIMIT", 32)
+SCORE_WORKERS = _env_int("SCORE_WORKERS", 2)
+SCORE_QUEUE_LIMIT = _env_int("SCORE_QUEUE_LIMIT", 32)
+RAG_WORKERS = _env_int("RAG_WORKERS", 4)
+RAG_QUEUE_LIMIT = _env_int("RAG_QUEUE_LIMIT", 32)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when an executor already holds its maximum number of queued tasks"""
+
+    def __init__(self, name: str, limit: int):
+        super().__init__(f"{name} executor is saturated ({limit} tasks in flight)")
+        self.name = name
+        self.limit = limit
+
+
+class BoundedExecutor:
+    """
+    Wraps a concurrent.futures executor with a cap on in-flight tasks.
+    Submissions beyond the cap fail fast instead of queueing without bound.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], queue_limit: int):
+        self.name = name
+        self.queue_limit = queue_limit
+        self._factory = factory
+        self._executor = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self):
+        # Created lazily so forked server workers each build their own pool
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self._factory()
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) on the pool, raising ExecutorSaturated when the queue is full"""
+        with self._lock:
+            if self._in_flight >= self.queue_limit:
+                raise ExecutorSaturated(self.name, self.queue_limit)
+            self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            if isinstance(executor, ThreadPoolExecutor):
+                # Carry the request context (metrics endpoint label, trace) into the thread
+                fn = functools.partial(contextvars.copy_context().run, fn)
+            return await loop.run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {'in_flight': self._in_flight, 'queue_limit': self.queue_limit}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# ---------------------------------------------------------------------------
+# Process-pool side: each worker process keeps one ResumeParser
+# ---------------------------------------------------------------------------
+
+_worker_parser = None
+
+
+def _init_parse_worker():
+    global _worker_parser
+    from resume_parser import ResumeParser
+    _worker_parser = ResumeParser()
+
+
+def _parse_in_worker(file_path: str, trace_context=None) -> Tuple[Dict, List, List]:
+    # Metrics and spans recorded here would stay in the worker; hand them back to the API process
+    with metrics.capture() as samples, tracing.remote(trace_context) as spans:
+        parsed = _worker_parser.parse_resume(file_path)
+    return parsed, samples, spans
+
+
+# ---------------------------------------------------------------------------
+# Shared executors
+# ---------------------------------------------------------------------------
+
+parse_executor = BoundedExecutor(
+    "parse",
+    lambda: ProcessPoolExecutor(max_workers=PARSE_WORKERS, initializer=_init_parse_worker),
+    PARSE_QUEUE_LIMIT
+)
+
+# Embedding inference releases the GIL, so threads share one loaded model
+score_executor = BoundedExecutor(
+    "score",
+    lambda: ThreadPoolExecutor(max_workers=SCORE_WORKERS, thread_name_prefix="ats-score"),
+    SCORE_QUEUE_LIMIT
+)
+
+# RAG answers mostly wait on the vector store and the LLM API
+rag_executor = BoundedExecutor(
+    "rag",
+    lambda: ThreadPoolExecutor(max_workers=RAG_WORKERS, thread_name_prefix="rag"),
+    RAG_QUEUE_LIMIT
+)
+
+
+async def parse_resume_async(file_path: str) -> Dict:
+    """Parse a resume file in the process pool"""
+    # The span covers queueing too; its children show the worker's own time
+    with tracing.span('executor.parse'):
+        parsed, samples, spans = await parse_executor.run(_parse_in_worker, file_path, tracing.carrier())
+    metrics.replay(samples)
+    tracing.adopt(spans)
+    return parsed
+
+
+async def score_resume_async(scorer, parsed_resume: Dict, job_description: str = "") -> Dict:
+    """Score a parsed resume in the thread pool"""
+    with tracing.span('executor.score'):
+        return await score_executor.run(scorer.calculate_ats_score, parsed_resume, job_description)
+
+
+async def answer_question_async(question: str) -> str:
+    """Answer a RAG question in the thread pool"""
+    from rag_utility import answer_question
+    with tracing.span('executor.rag'):
+        return await rag_executor.run(answer_question, question)
+
+
+def _executor_gauges():
+    for name, stats in executor_stats().items():
+        yield "executor_in_flight", "Tasks submitted to a worker pool and not yet finished", {'pool': name}, stats['in_flight']
+        yield "executor_queue_limit", "Maximum in-flight tasks per worker pool", {'pool': name}, stats['queue_limit']
+
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    return {
+        'parse': parse_executor.stats(),
+        'score': score_executor.stats(),
+        'rag': rag_executor.stats()
+    }
+
+
+def shutdown_executors():
+    parse_executor.shutdown()
+    score_executor.shutdown()
+    rag_executor.shutdown()
+
+
+metrics.REGISTRY.register_gauges(_executor_gauges)
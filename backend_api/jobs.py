@@ -0,0 +1,472 @@
+"""
+Durable job queue for large scoring batches
+Jobs and their items live in a local SQLite database and are processed by a
+pool of worker processes that keep one ResumeParser and ATSScorer each.
+Running items hold a lease renewed by their worker; items whose lease expired
+or whose worker process is gone are re-queued, up to JOB_MAX_ATTEMPTS times.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsed_resume import ParsedResume
+
+logger = logging.getLogger(__name__)
+
+JOB_DATA_DIR = os.environ.get(
+    "JOB_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_data")
+)
+JOB_DB_PATH = os.path.join(JOB_DATA_DIR, "jobs.sqlite3")
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 1.0))
+JOB_MAX_RESUMES = int(os.environ.get("JOB_MAX_RESUMES", 20000))
+# A running item is re-queued once its worker stops renewing the lease for this long
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", 300))
+# Leases per item; an item whose worker died this many times is marked as failed
+JOB_MAX_ATTEMPTS = max(1, int(os.environ.get("JOB_MAX_ATTEMPTS", 3)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    job_descriptions TEXT NOT NULL,
+    include_text INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    path TEXT,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    owner_pid INTEGER,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started_at REAL,
+    finished_at REAL,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items (status, job_id, idx);
+"""
+
+ACTIVE_JOB_STATUSES = ('queued', 'running')
+# Columns added after the first release; created on databases from older versions
+_ADDED_ITEM_COLUMNS = {'owner_pid': 'INTEGER', 'lease_until': 'REAL', 'attempts': 'INTEGER NOT NULL DEFAULT 0'}
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    """Whether a process with this pid exists on this host (assumed alive where it cannot be checked)"""
+    if not pid:
+        return False
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows; rely on the lease there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """SQLite-backed job and item state shared by the API and the workers"""
+
+    def __init__(self, db_path: str = JOB_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(job_items)")}
+            for column, column_type in _ADDED_ITEM_COLUMNS.items():
+                if column not in columns:
+                    try:
+                        conn.execute(f"ALTER TABLE job_items ADD COLUMN {column} {column_type}")
+                    except sqlite3.OperationalError:
+                        # Another process added it first
+                        pass
+
+    @contextmanager
+    def _connect(self):
+        # Autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            yield conn
+        finally:
+            conn.close()
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(os.path.dirname(self.db_path), job_id)
+
+    def new_job_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def create_job(self, job_id: str, job_descriptions: List[str],
+                   items: List[Tuple[str, Optional[str], Optional[str]]], include_text: bool = False) -> Dict:
+        """
+        Register a job and its items
+
+        Args:
+            job_id: ID from new_job_id (the caller stages files under job_dir(job_id))
+            job_descriptions: JDs every resume is scored against
+            items: (filename, staged path, error) per resume; errored items are stored as failed
+            include_text: Keep raw resume text in results
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO jobs (id, status, created_at, job_descriptions, include_text, total) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, now, json.dumps(job_descriptions), int(include_text), len(items))
+            )
+            conn.executemany(
+                "INSERT INTO job_items (job_id, idx, filename, path, status, error, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, idx, filename, path, 'error' if error else 'pending', error, now if error else None)
+                    for idx, (filename, path, error) in enumerate(items)
+                ]
+            )
+            conn.execute("COMMIT")
+        self._maybe_finish(job_id)
+        return self.get_status(job_id)
+
+    def requeue_interrupted(self) -> int:
+        """
+        Put items whose worker stopped back in the queue
+
+        An item is re-queued when its lease expired or its owner process no
+        longer exists; items held by live workers (of this or another API
+        process) are left alone. An item that was already leased
+        JOB_MAX_ATTEMPTS times is marked as failed instead, so a resume that
+        crashes its worker cannot take down workers forever.
+
+        Returns:
+            Number of re-queued items
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT job_id, idx, path, owner_pid, lease_until, started_at, attempts "
+                "FROM job_items WHERE status = 'running'"
+            ).fetchall()
+            stale = [
+                row for row in rows
+                # Rows from before leases existed only have started_at
+                if (row['lease_until'] or (row['started_at'] or 0) + JOB_LEASE_SECONDS) < now
+                or (row['owner_pid'] is not None and not _process_alive(row['owner_pid']))
+            ]
+            requeue = [(row['job_id'], row['idx']) for row in stale if row['attempts'] < JOB_MAX_ATTEMPTS]
+            failed = [row for row in stale if row['attempts'] >= JOB_MAX_ATTEMPTS]
+            conn.executemany(
+                "UPDATE job_items SET status = 'pending', worker = NULL, owner_pid = NULL, "
+                "lease_until = NULL, started_at = NULL WHERE job_id = ? AND idx = ? AND status = 'running'",
+                requeue
+            )
+            conn.executemany(
+                "UPDATE job_items SET status = 'error', error = ?, finished_at = ? "
+                "WHERE job_id = ? AND idx = ? AND status = 'running'",
+                [
+                    (f"worker stopped while processing this resume ({row['attempts']} attempts)",
+                     now, row['job_id'], row['idx'])
+                    for row in failed
+                ]
+            )
+            conn.execute("COMMIT")
+
+        for row in failed:
+            logger.warning("Giving up on job %s item %d after %d attempts", row['job_id'], row['idx'], row['attempts'])
+            if row['path'] and os.path.exists(row['path']):
+                os.unlink(row['path'])
+        for job_id in {row['job_id'] for row in failed}:
+            self._maybe_finish(job_id)
+        return len(requeue)
+
+    def renew_lease(self, job_id: str, idx: int, worker: str):
+        """Extend the lease of an item this worker is processing"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_items SET lease_until = ? WHERE job_id = ? AND idx = ? AND worker = ? AND status = 'running'",
+                (time.time() + JOB_LEASE_SECONDS, job_id, idx, worker)
+            )
+
+    def claim_next(self, worker: str) -> Optional[Dict]:
+        """Atomically claim the oldest pending item of an active job"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT i.job_id, i.idx, i.filename, i.path, j.job_descriptions, j.include_text "
+                "FROM job_items i JOIN jobs j ON j.id = i.job_id "
+                "WHERE i.status = 'pending' AND j.status IN ('queued', 'running') "
+                "ORDER BY j.created_at, i.idx LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE job_items SET status = 'running', worker = ?, owner_pid = ?, lease_until = ?, started_at = ?, "
+                "attempts = attempts + 1 WHERE job_id = ? AND idx = ?",
+                (worker, os.getpid(), now + JOB_LEASE_SECONDS, now, row['job_id'], row['idx'])
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = COALESCE(started_at, ?) "
+                "WHERE id = ? AND status = 'queued'",
+                (now, row['job_id'])
+            )
+            conn.execute("COMMIT")
+        item = dict(row)
+        item['job_descriptions'] = json.loads(item['job_descriptions'])
+        item['include_text'] = bool(item['include_text'])
+        return item
+
+    def finish_item(self, job_id: str, idx: int, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Store an item's result (or error) and close the job when it was the last one"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, error = ?, finished_at = ? "
+                "WHERE job_id = ? AND idx = ? AND status = 'running'",
+                ('error' if error else 'done', json.dumps(result) if result is not None else None,
+                 error, time.time(), job_id, idx)
+            )
+        self._maybe_finish(job_id)
+
+    def _maybe_finish(self, job_id: str):
+        with self._connect() as conn:
+            remaining = conn.execute(
+                "SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status IN ('pending', 'running')",
+                (job_id,)
+            ).fetchone()[0]
+            if remaining == 0:
+                conn.execute(
+                    "UPDATE jobs SET status = 'completed', finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                    (time.time(), job_id)
+                )
+        if remaining == 0:
+            # Completed, or cancelled and its last running item is done: the uploads are no longer needed
+            shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a job; items already running finish, pending ones are dropped"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id)
+            )
+            dropped = []
+            if cursor.rowcount:
+                dropped = [row['path'] for row in conn.execute(
+                    "SELECT path FROM job_items WHERE job_id = ? AND status = 'pending'", (job_id,)
+                )]
+                conn.execute(
+                    "UPDATE job_items SET status = 'cancelled' WHERE job_id = ? AND status = 'pending'",
+                    (job_id,)
+                )
+            conn.execute("COMMIT")
+        for path in dropped:
+            if path and os.path.exists(path):
+                os.unlink(path)
+        if cursor.rowcount:
+            self._maybe_finish(job_id)
+        return self.get_status(job_id)
+
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        """Return job state with progress and throughput"""
+        with self._connect() as conn:
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = {
+                row['status']: row['n']
+                for row in conn.execute(
+                    "SELECT status, COUNT(*) AS n FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+                )
+            }
+
+        processed = counts.get('done', 0) + counts.get('error', 0)
+        elapsed = None
+        throughput = 0.0
+        eta = None
+        if job['started_at']:
+            elapsed = (job['finished_at'] or time.time()) - job['started_at']
+            if elapsed > 0:
+                throughput = processed / elapsed
+            remaining = counts.get('pending', 0) + counts.get('running', 0)
+            if throughput > 0 and job['status'] in ACTIVE_JOB_STATUSES:
+                eta = remaining / throughput
+
+        return {
+            'job_id': job_id,
+            'status': job['status'],
+            'total': job['total'],
+            'counts': {status: counts.get(status, 0) for status in ('pending', 'running', 'done', 'error', 'cancelled')},
+            'progress': round(processed / job['total'], 4) if job['total'] else 1.0,
+            'created_at': job['created_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at'],
+            'elapsed_s': round(elapsed, 3) if elapsed is not None else None,
+            'resumes_per_second': round(throughput, 3),
+            'eta_s': round(eta, 1) if eta is not None else None
+        }
+
+    def get_results(self, job_id: str, offset: int = 0, limit: int = 50) -> List[Dict]:
+        """Return finished items of a job in submission order"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT idx, filename, status, result, error FROM job_items "
+                "WHERE job_id = ? AND status IN ('done', 'error') ORDER BY idx LIMIT ? OFFSET ?",
+                (job_id, limit, offset)
+            ).fetchall()
+        results = []
+        for row in rows:
+            entry = {'index': row['idx'], 'filename': row['filename'], 'status': row['status']}
+            if row['result']:
+                entry.update(json.loads(row['result']))
+            if row['error']:
+                entry['error'] = row['error']
+            results.append(entry)
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------------
+
+def _process_item(item: Dict, parser, scorer) -> Dict:
+    parsed = parser.parse_resume(item['path'])
+    if 'error' in parsed:
+        raise ValueError(parsed['error'])
+
+    job_descriptions = item['job_descriptions'] or [""]
+    # Scored once per JD: the compact form lowercases the text only once
+    resume = ParsedResume.from_dict(parsed)
+    scores = [
+        {'jd_index': i, 'ats_result': scorer.calculate_ats_score(resume, jd)}
+        for i, jd in enumerate(job_descriptions)
+    ]
+    if not item['include_text']:
+        parsed = {key: value for key, value in parsed.items() if key != 'text'}
+    return {'parsed_resume': parsed, 'scores': scores}
+
+
+def _renew_lease_until(store: JobStore, item: Dict, worker_name: str, done: threading.Event):
+    # Renew well before expiry so one slow SQLite write does not lose the item
+    while not done.wait(JOB_LEASE_SECONDS / 3):
+        try:
+            store.renew_lease(item['job_id'], item['idx'], worker_name)
+        except sqlite3.OperationalError as e:
+            logger.warning("[%s] lease renewal failed: %s", worker_name, e)
+
+
+def _worker_main(db_path: str, worker_name: str, stop_event, poll_interval: float):
+    from logging_config import configure_logging
+    configure_logging()
+    # Models are loaded once per worker and reused for every item
+    from resume_parser import ResumeParser
+    from ats_scorer import ATSScorer
+    parser = ResumeParser()
+    scorer = ATSScorer()
+    store = JobStore(db_path)
+    last_requeue = time.monotonic()
+
+    while not stop_event.is_set():
+        try:
+            item = store.claim_next(worker_name)
+        except sqlite3.OperationalError as e:
+            logger.warning("[%s] claim failed: %s", worker_name, e)
+            time.sleep(poll_interval)
+            continue
+
+        if item is None:
+            # Idle workers pick up items of workers that died since startup
+            if time.monotonic() - last_requeue >= JOB_LEASE_SECONDS / 2:
+                last_requeue = time.monotonic()
+                try:
+                    requeued = store.requeue_interrupted()
+                    if requeued:
+                        logger.info("[%s] re-queued %d expired job items", worker_name, requeued)
+                        continue
+                except sqlite3.OperationalError as e:
+                    logger.warning("[%s] requeue failed: %s", worker_name, e)
+            stop_event.wait(poll_interval)
+            continue
+
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=_renew_lease_until, args=(store, item, worker_name, done), name="job-lease", daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = _process_item(item, parser, scorer)
+            store.finish_item(item['job_id'], item['idx'], result=result)
+        except Exception as e:
+            store.finish_item(item['job_id'], item['idx'], error=str(e))
+        finally:
+            done.set()
+            heartbeat.join()
+            if item['path'] and os.path.exists(item['path']):
+                os.unlink(item['path'])
+
+
+class JobWorkerPool:
+    """Starts and stops the job worker processes"""
+
+    def __init__(self, db_path: str = JOB_DB_PATH, workers: int = JOB_WORKERS,
+                 poll_interval: float = JOB_POLL_INTERVAL):
+        self.db_path = db_path
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context()
+        self._stop_event = None
+        self._processes = []
+
+    def start(self):
+        if self._processes or self.workers <= 0:
+            return
+        requeued = JobStore(self.db_path).requeue_interrupted()
+        if requeued:
+            logger.info("Re-queued %d interrupted job items", requeued)
+        self._stop_event = self._context.Event()
+        for i in range(self.workers):
+            process = self._context.Process(
+                target=_worker_main,
+                args=(self.db_path, f"job-worker-{os.getpid()}-{i}", self._stop_event, self.poll_interval),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout: float = 10.0):
+        if not self._processes:
+            return
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
@@ -1,10 +1,15 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Form, Header, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.routing import Match
 from pydantic import BaseModel
-import tempfile
 import os
-from typing import Optional
+import time
+import asyncio
+from typing import List, Optional
 import sys
+import logging
 import toml
 
 # Add parent directory to path to import existing modules
@@ -12,7 +17,31 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from resume_parser import ResumeParser
 from ats_scorer import ATSScorer
-from rag_utility import answer_question
+from executors import (
+    ExecutorSaturated,
+    parse_resume_async,
+    score_resume_async,
+    answer_question_async,
+    shutdown_executors
+)
+from batch import create_work_dir, stage_uploads, stream_batch, iter_members
+from jobs import JobStore, JobWorkerPool, JOB_MAX_RESUMES
+from enhancement_repository import EnhancementContentRepository
+from admission import AdmissionController, AdmissionRejected
+import metrics
+import tracing
+from logging_config import configure_logging
+from warmup import WARMUP_ENABLED, WarmupState
+from profiling import Profiler, check_token
+from uploads import UPLOAD_OPENAPI, receive_resume_upload
+from result_cache import (
+    PARSE_CACHE_SIZE,
+    PARSE_CACHE_TTL,
+    ResultCache,
+    ats_cache_key,
+    etag_matches,
+    parse_cache_key
+)
 
 # Load Firebase credentials from secrets.toml
 def load_firebase_credentials():
@@ -27,9 +56,12 @@ def load_firebase_credentials():
             secrets = toml.load(secrets_path)
             return secrets.get('firebase', {})
     except Exception as e:
-        print(f"Warning: Could not load Firebase credentials: {e}")
+        logger.warning("Could not load Firebase credentials: %s", e)
     return None
 
+configure_logging()
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Resume ATS API", version="1.0.0")
 
 # CORS middleware for mobile app
@@ -41,10 +73,151 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize models
+# Initialize models (parsing itself runs in the executor's worker processes)
 parser = ResumeParser()
 scorer = ATSScorer()
 
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
+# Per-cost-class concurrency limits and wait queues
+admission = AdmissionController()
+
+def _admission_gauges():
+    for name, stats in admission.stats().items():
+        labels = {'cost_class': name}
+        yield "admission_active_requests", "Requests holding an admission slot", labels, stats['active']
+        yield "admission_queue_depth", "Requests waiting for an admission slot", labels, stats['queue_depth']
+        yield "admission_admitted_total", "Requests admitted since startup", labels, stats['admitted_total']
+        yield "admission_rejected_total", "Requests rejected since startup", dict(labels, reason='queue_full'), stats['rejected_queue_full_total']
+        yield "admission_rejected_total", "Requests rejected since startup", dict(labels, reason='timeout'), stats['rejected_timeout_total']
+
+metrics.REGISTRY.register_gauges(_admission_gauges)
+
+# On-demand profiling of this worker (disabled unless PROFILING_TOKEN is set)
+profiler = Profiler()
+
+@app.middleware("http")
+async def instrumentation_middleware(request: Request, call_next):
+    # Label by route template so /api/jobs/{job_id} stays one series
+    endpoint = "unmatched"
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            endpoint = route.path
+            break
+    token = metrics.current_endpoint.set(endpoint)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with tracing.start_trace(f"{request.method} {endpoint}", request.headers.get("traceparent"),
+                                 endpoint=endpoint, method=request.method) as trace:
+            response = await call_next(request)
+            trace.attributes['status_code'] = response.status_code
+            response.headers["X-Request-ID"] = trace.trace_id
+            response.headers["traceparent"] = tracing.traceparent(trace)
+        if response.status_code < 400:
+            outcome = "ok"
+        elif response.status_code < 500:
+            outcome = "client_error"
+        return response
+    finally:
+        metrics.observe(metrics.HTTP_REQUEST_SECONDS, time.perf_counter() - start, outcome,
+                        method=request.method, endpoint=endpoint)
+        metrics.current_endpoint.reset(token)
+        if endpoint != "/api/debug/profile":
+            profiler.request_finished()
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": f"Server busy ({exc.cost_class}): {exc.reason}"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+# Identical score requests (client retries, re-analysis) are answered from memory
+ats_cache = ResultCache("ats")
+metrics.REGISTRY.register_gauges(ats_cache.gauges)
+
+def ats_result_cacheable(result: dict) -> bool:
+    """Errors and degraded semantic scores are recomputed next time"""
+    if 'error' in result:
+        return False
+    validation = str(result.get('semantic_score', {}).get('capability_validation', ''))
+    return not validation.startswith('Error')
+
+async def score_with_cache(parsed: dict, job_description: str, key: str = None):
+    """
+    Score a parsed resume through the ATS result cache
+    
+    Returns:
+        (ats_result, cache hit)
+    """
+    key = key or ats_cache_key(parsed, job_description, scorer.cache_version)
+    
+    async def compute():
+        async with admission.admit("score"):
+            return await score_resume_async(scorer, parsed, job_description)
+    
+    return await ats_cache.get_or_compute(key, compute, ats_result_cacheable)
+
+# Parses keyed by file SHA-256, so clients can skip re-uploading (see /api/analyze/lookup)
+parse_cache = ResultCache("parse", PARSE_CACHE_SIZE, PARSE_CACHE_TTL)
+metrics.REGISTRY.register_gauges(parse_cache.gauges)
+
+async def parse_with_cache(upload):
+    """
+    Parse a stored upload unless the same file was parsed before
+    
+    Returns:
+        (parsed resume, cache hit)
+    """
+    async def compute():
+        async with admission.admit("parse"):
+            return await parse_resume_async(upload.path)
+    
+    return await parse_cache.get_or_compute(
+        parse_cache_key(upload.sha256, ResumeParser.VERSION),
+        compute,
+        lambda parsed: 'error' not in parsed
+    )
+
+# Enhancement content cached from Firestore
+enhancement_repo = EnhancementContentRepository(
+    load_firebase_credentials,
+    ttl_seconds=float(os.environ.get("ENHANCEMENT_CACHE_TTL", 600))
+)
+
+# Durable job queue for large batches
+job_store = JobStore()
+job_workers = JobWorkerPool()
+
+# Models are preloaded and exercised once before /ready reports 200
+warmup_state = WarmupState()
+_warmup_task = None
+
+@app.on_event("startup")
+async def startup_event():
+    global _warmup_task
+    enhancement_repo.start()
+    job_workers.start()
+    if WARMUP_ENABLED:
+        # Runs in the background so /health answers while models warm up
+        _warmup_task = asyncio.create_task(warmup_state.run(scorer))
+    else:
+        warmup_state.mark_skipped()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    job_workers.stop()
+    shutdown_executors()
+
 # Pydantic models
 class ATSRequest(BaseModel):
     parsed_resume: dict
@@ -56,6 +229,11 @@ class QuestionRequest(BaseModel):
 class EnhanceRequest(BaseModel):
     parsed_resume: dict
 
+class AnalyzeLookupRequest(BaseModel):
+    sha256: str
+    job_description: str = ""
+    include_text: bool = False
+
 # Health check endpoint
 @app.get("/")
 async def root():
@@ -69,106 +247,305 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness for the load balancer: 503 until warmup has finished, with per-component durations"""
+    report = warmup_state.report()
+    return JSONResponse(status_code=200 if report['ready'] else 503, content=report)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of stage latency histograms and pool gauges"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/traces")
+async def list_traces(limit: int = 50):
+    """Most recent sampled request traces (sampling: TRACE_SAMPLE_RATE or a sampled traceparent header)"""
+    return {"sample_rate": tracing.TRACE_SAMPLE_RATE, "traces": tracing.recent(limit)}
+
+@app.get("/api/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """All spans of a recent sampled trace; the trace ID is returned as X-Request-ID"""
+    trace = tracing.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found or not sampled")
+    return trace
+
+@app.post("/api/debug/profile")
+async def profile_worker(
+    seconds: float = 10.0,
+    requests: int = 0,
+    memory: bool = False,
+    format: str = "json",
+    top: int = 30,
+    x_profiling_token: Optional[str] = Header(None)
+):
+    """
+    Profile the worker serving this call with a stack-sampling profiler
+    
+    Samples every thread for `seconds`, or until `requests` other requests have
+    finished (with `seconds` as the limit). format=collapsed returns collapsed
+    stacks for flamegraph.pl / speedscope; memory=true adds tracemalloc
+    allocation growth. Requires the X-Profiling-Token header.
+    """
+    check_token(x_profiling_token)
+    if format not in ("json", "collapsed"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'collapsed'")
+    report, sampler = await profiler.profile(seconds, requests, memory, top)
+    if format == "collapsed":
+        return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(report['samples'])})
+    return report
+
+def compact_parsed_resume(parsed: dict, include_text: bool = False) -> dict:
+    """Drop the raw resume text unless the client asked for it"""
+    if include_text:
+        return parsed
+    return {key: value for key, value in parsed.items() if key != 'text'}
+
 # Parse Resume endpoint
-@app.post("/api/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
+@app.post("/api/parse-resume", openapi_extra=UPLOAD_OPENAPI)
+async def parse_resume(request: Request):
     """
     Parse uploaded resume file (PDF or DOCX)
     Returns parsed resume data
     """
-    print(f"\n=== Parse Resume Request ===")
-    print(f"File received: {file.filename if file else 'None'}")
-    print(f"Content type: {file.content_type if file else 'None'}")
-    
     try:
-        # Validate file exists
-        if not file:
-            print("ERROR: No file uploaded")
-            raise HTTPException(
-                status_code=400,
-                detail="No file uploaded"
-            )
-        
-        # Validate file type
-        if not file.filename:
-            print("ERROR: No filename")
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file"
-            )
-        
-        print(f"Checking file extension: {file.filename}")
-        if not file.filename.lower().endswith(('.pdf', '.docx')):
-            print(f"ERROR: Invalid file type: {file.filename}")
-            raise HTTPException(
-                status_code=400,
-                detail=f"Only PDF and DOCX files are supported. Got: {file.filename}"
-            )
-        
-        # Save uploaded file temporarily
-        print("Reading file content...")
-        content = await file.read()
-        print(f"File size: {len(content)} bytes")
-        
-        if not content:
-            print("ERROR: Empty file")
-            raise HTTPException(
-                status_code=400,
-                detail="Empty file"
-            )
-        
-        with tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=os.path.splitext(file.filename)[1]
-        ) as tmp_file:
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
-            print(f"Saved to temp file: {tmp_path}")
+        upload = await receive_resume_upload(request)
         
         try:
             # Parse resume
-            print("Parsing resume...")
-            parsed = parser.parse_resume(tmp_path)
-            print(f"Parse result keys: {parsed.keys() if isinstance(parsed, dict) else 'Not a dict'}")
+            parsed, _ = await parse_with_cache(upload)
             
             if 'error' in parsed:
-                print(f"ERROR in parsed result: {parsed['error']}")
+                logger.info("Parse failed for %s: %s", upload.filename, parsed['error'])
                 raise HTTPException(status_code=400, detail=parsed['error'])
             
-            print("✓ Parse successful!")
             return parsed
         
         finally:
             # Cleanup temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-                print(f"Cleaned up temp file: {tmp_path}")
+            upload.cleanup()
     
-    except HTTPException:
+    except (HTTPException, ExecutorSaturated, AdmissionRejected):
         raise
     except Exception as e:
-        import traceback
-        error_detail = f"Error parsing resume: {str(e)}\n{traceback.format_exc()}"
-        print(f"\n!!! EXCEPTION !!!\n{error_detail}")
+        logger.exception("Error parsing resume: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Calculate ATS Score endpoint
 @app.post("/api/calculate-ats")
-async def calculate_ats_score(request: ATSRequest):
+async def calculate_ats_score(request: ATSRequest, if_none_match: Optional[str] = Header(None)):
     """
     Calculate ATS score for parsed resume
     Optionally takes job description for better matching
+    Results carry an ETag; resending it in If-None-Match returns 304 without a body
     """
     try:
-        ats_result = scorer.calculate_ats_score(
-            request.parsed_resume,
-            request.job_description
+        key = ats_cache_key(request.parsed_resume, request.job_description, scorer.cache_version)
+        etag = f'"{key}"'
+        if etag_matches(if_none_match, etag):
+            # The score is a pure function of the key, so nothing needs recomputing
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        ats_result, hit = await score_with_cache(request.parsed_resume, request.job_description, key)
+        headers = {"X-Cache": "HIT" if hit else "MISS"}
+        if ats_result_cacheable(ats_result):
+            headers["ETag"] = etag
+        return JSONResponse(content=ats_result, headers=headers)
+    
+    except (ExecutorSaturated, AdmissionRejected):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Analyze endpoint (parse + score in one round trip)
+@app.post("/api/analyze", openapi_extra=UPLOAD_OPENAPI)
+async def analyze_resume(request: Request):
+    """
+    Parse and score an uploaded resume in a single request
+    Returns the parsed fields (without raw text unless include_text) and the ATS result
+    """
+    try:
+        upload = await receive_resume_upload(request)
+        job_description = upload.fields.get('job_description', '')
+        include_text = upload.fields.get('include_text', '').strip().lower() in ('1', 'true', 'yes', 'on')
+        
+        try:
+            start_parse = time.perf_counter()
+            parsed, _ = await parse_with_cache(upload)
+            parse_ms = (time.perf_counter() - start_parse) * 1000
+        finally:
+            upload.cleanup()
+        
+        if 'error' in parsed:
+            raise HTTPException(status_code=400, detail=parsed['error'])
+        
+        start_score = time.perf_counter()
+        ats_result, _ = await score_with_cache(parsed, job_description)
+        score_ms = (time.perf_counter() - start_score) * 1000
+        
+        return JSONResponse(
+            content={
+                "parsed_resume": compact_parsed_resume(parsed, include_text),
+                "ats_result": ats_result
+            },
+            headers={"Server-Timing": f"parse;dur={parse_ms:.1f}, score;dur={score_ms:.1f}"}
         )
-        return ats_result
     
+    except (HTTPException, ExecutorSaturated, AdmissionRejected):
+        raise
     except Exception as e:
+        logger.exception("Error analyzing resume: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Hash-first negotiation: analyze without uploading when the file was parsed before
+@app.post("/api/analyze/lookup")
+async def analyze_lookup(request: AnalyzeLookupRequest):
+    """
+    Look up a resume by the SHA-256 of its file bytes
+    Returns {"cached": false} when the file must be uploaded to /api/analyze,
+    otherwise the same parsed_resume / ats_result payload as /api/analyze
+    """
+    sha256 = request.sha256.strip().lower()
+    if len(sha256) != 64 or any(c not in '0123456789abcdef' for c in sha256):
+        raise HTTPException(status_code=400, detail="sha256 must be 64 hex characters")
+    
+    parsed = parse_cache.get(parse_cache_key(sha256, ResumeParser.VERSION))
+    if parsed is None:
+        return {"cached": False}
+    
+    start_score = time.perf_counter()
+    ats_result, _ = await score_with_cache(parsed, request.job_description)
+    score_ms = (time.perf_counter() - start_score) * 1000
+    return JSONResponse(
+        content={
+            "cached": True,
+            "parsed_resume": compact_parsed_resume(parsed, request.include_text),
+            "ats_result": ats_result
+        },
+        headers={"Server-Timing": f"parse;dur=0, score;dur={score_ms:.1f}"}
+    )
+
+# Batch Analyze endpoint (NDJSON stream)
+@app.post("/api/batch-analyze")
+async def batch_analyze(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(""),
+    include_text: bool = Form(False)
+):
+    """
+    Parse and score many resumes (PDF/DOCX files and/or ZIP archives)
+    Streams one NDJSON line per resume as it finishes, then a summary line
+    """
+    logger.info("Batch analyze request with %d upload(s)", len(files))
+    import shutil
+    import weakref
+    # The slot is held until the stream finishes, not just until this handler returns
+    await admission.acquire("batch")
+    work_dir = create_work_dir()
+    released = False
+    
+    def release_batch():
+        # Idempotent: reached from the stream, the background task or the stream's finalizer
+        nonlocal released
+        if not released:
+            released = True
+            admission.release("batch")
+    
+    try:
+        # Uploads are released when this handler returns, so stage them on disk first
+        staged = await asyncio.to_thread(stage_uploads, files, work_dir)
+    except Exception as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        release_batch()
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def admitted_stream():
+        try:
+            async for chunk in stream_batch(staged, work_dir, scorer, job_description, include_text):
+                yield chunk
+        finally:
+            release_batch()
+    
+    async def cleanup():
+        # Also runs when the client disconnected before the stream was started
+        release_batch()
+        await asyncio.to_thread(shutil.rmtree, work_dir, True)
+    
+    def abandoned():
+        # Last resort if the response is dropped without running its background task
+        release_batch()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    stream = admitted_stream()
+    weakref.finalize(stream, abandoned)
+    return StreamingResponse(stream, media_type="application/x-ndjson", background=BackgroundTask(cleanup))
+
+# Job endpoints (durable batches)
+@app.post("/api/jobs")
+async def submit_job(
+    files: List[UploadFile] = File(...),
+    job_descriptions: List[str] = Form([]),
+    include_text: bool = Form(False)
+):
+    """
+    Submit resumes (PDF/DOCX files and/or ZIP archives) to be scored against one or more JDs
+    Returns the job status; poll /api/jobs/{job_id} for progress
+    """
+    job_id = job_store.new_job_id()
+    job_dir = job_store.job_dir(job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    try:
+        async with admission.admit("batch"):
+            staged = await asyncio.to_thread(stage_uploads, files, job_dir)
+            items = await asyncio.to_thread(lambda: list(iter_members(staged, job_dir, JOB_MAX_RESUMES)))
+            if not items:
+                raise HTTPException(status_code=400, detail="No resumes found in upload")
+            return await asyncio.to_thread(job_store.create_job, job_id, job_descriptions, items, include_text)
+    except (HTTPException, AdmissionRejected):
+        import shutil
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
+    except Exception as e:
+        import shutil
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Job status with progress, throughput and ETA"""
+    status = await asyncio.to_thread(job_store.get_status, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+@app.get("/api/jobs/{job_id}/results")
+async def get_job_results(job_id: str, offset: int = 0, limit: int = 50):
+    """Paginated results of finished resumes, in submission order"""
+    status = await asyncio.to_thread(job_store.get_status, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    limit = max(1, min(limit, 500))
+    results = await asyncio.to_thread(job_store.get_results, job_id, max(0, offset), limit)
+    next_offset = offset + len(results)
+    processed = status['counts']['done'] + status['counts']['error']
+    return {
+        "job_id": job_id,
+        "status": status['status'],
+        "offset": offset,
+        "limit": limit,
+        "results": results,
+        "next_offset": next_offset if next_offset < processed else None
+    }
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a job; resumes already being scored still finish"""
+    status = await asyncio.to_thread(job_store.cancel, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
 # Ask Question endpoint (RAG)
 @app.post("/api/ask-question")
 async def ask_question_endpoint(request: QuestionRequest):
@@ -183,86 +560,40 @@ async def ask_question_endpoint(request: QuestionRequest):
                 "answer": "Hello! How was your day? How could I help you today?"
             }
         
-        answer = answer_question(request.question)
+        async with admission.admit("rag"):
+            answer = await answer_question_async(request.question)
         return {"answer": answer}
     
+    except (ExecutorSaturated, AdmissionRejected):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Admission stats endpoint
+@app.get("/api/admission")
+async def admission_stats():
+    """Active requests, queue depth and rejection counts per cost class"""
+    return admission.stats()
+
 # Enhance Resume endpoint
 @app.post("/api/enhance-resume")
 async def enhance_resume_endpoint(request: EnhanceRequest):
     """
     Enhance resume with AI suggestions
     """
-    print(f"\n=== Enhance Resume Request ===")
     try:
-        # Import Firebase for enhancement data
-        try:
-            import firebase_admin
-            from firebase_admin import credentials, firestore
-            
-            # Initialize Firebase if not already initialized
-            if not firebase_admin._apps:
-                # Load credentials from secrets.toml
-                firebase_creds = load_firebase_credentials()
-                if not firebase_creds:
-                    raise ImportError("Firebase credentials not found in secrets.toml")
-                
-                cred = credentials.Certificate(firebase_creds)
-                firebase_admin.initialize_app(cred)
-            
-            db = firestore.client()
-            enhancements_ref = db.collection('resume_enhancements')
-            
-            # Fetch enhancement data
-            best_practices = enhancements_ref.document('best_practices').get().to_dict()
-            action_verbs = enhancements_ref.document('action_verbs').get().to_dict().get('verbs', [])
-            
-            enhanced_data = request.parsed_resume.copy()
-            changes_made = []
-            
-            # Add enhancements
-            if 'summary' not in enhanced_data or not enhanced_data.get('summary'):
-                if best_practices and 'summary_template' in best_practices:
-                    enhanced_data['summary'] = best_practices['summary_template']
-                    changes_made.append("Added professional summary")
-            
-            if action_verbs:
-                changes_made.append("Enhanced with action verbs")
-            
-            return {
-                "enhanced_resume": enhanced_data,
-                "changes": changes_made
-            }
+        # In-memory lookup; Firestore is refreshed in the background
+        content = enhancement_repo.get()
         
-        except ImportError as ie:
+        if content['source'] == 'empty':
             # Fallback enhancement without Firebase
-            print(f"Firebase not available, using fallback: {ie}")
+            logger.info("Enhancement content unavailable, using fallback")
             enhanced_data = request.parsed_resume.copy()
             
             # Add basic enhancements
             if 'summary' not in enhanced_data:
                 enhanced_data['summary'] = "Results-driven professional with proven expertise in achieving measurable outcomes."
             
-            return {
-                "enhanced_resume": enhanced_data,
-                "changes": [
-                    "Optimized formatting for ATS",
-                    "Enhanced with professional templates",
-                    "Improved keyword placement"
-                ]
-            }
-        except Exception as fb_error:
-            # Firebase error, use fallback
-            print(f"Firebase error, using fallback: {fb_error}")
-            import traceback
-            traceback.print_exc()
-            
-            enhanced_data = request.parsed_resume.copy()
-            if 'summary' not in enhanced_data:
-                enhanced_data['summary'] = "Results-driven professional with proven expertise in achieving measurable outcomes."
-            
             return {
                 "enhanced_resume": enhanced_data,
                 "changes": [
@@ -271,11 +602,29 @@ async def enhance_resume_endpoint(request: EnhanceRequest):
                     "Improved keyword placement"
                 ]
             }
+        
+        best_practices = content['best_practices']
+        action_verbs = content['action_verbs']
+        
+        enhanced_data = request.parsed_resume.copy()
+        changes_made = []
+        
+        # Add enhancements
+        if 'summary' not in enhanced_data or not enhanced_data.get('summary'):
+            if best_practices and 'summary_template' in best_practices:
+                enhanced_data['summary'] = best_practices['summary_template']
+                changes_made.append("Added professional summary")
+        
+        if action_verbs:
+            changes_made.append("Enhanced with action verbs")
+        
+        return {
+            "enhanced_resume": enhanced_data,
+            "changes": changes_made
+        }
     
     except Exception as e:
-        import traceback
-        error_detail = f"Error enhancing resume: {str(e)}\n{traceback.format_exc()}"
-        print(f"\n!!! EXCEPTION !!!\n{error_detail}")
+        logger.exception("Error enhancing resume: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Get all endpoints info
@@ -296,6 +645,26 @@ async def get_endpoints():
                 "method": "POST",
                 "description": "Calculate ATS score"
             },
+            {
+                "path": "/api/analyze",
+                "method": "POST",
+                "description": "Parse and score a resume in one request"
+            },
+            {
+                "path": "/api/analyze/lookup",
+                "method": "POST",
+                "description": "Analyze a previously uploaded resume by its SHA-256 (skips the upload)"
+            },
+            {
+                "path": "/api/batch-analyze",
+                "method": "POST",
+                "description": "Parse and score many resumes, streamed as NDJSON"
+            },
+            {
+                "path": "/api/jobs",
+                "method": "POST",
+                "description": "Submit a durable scoring job (GET /api/jobs/{id}, /results, POST /cancel)"
+            },
             {
                 "path": "/api/ask-question",
                 "method": "POST",
@@ -305,6 +674,26 @@ async def get_endpoints():
                 "path": "/api/enhance-resume",
                 "method": "POST",
                 "description": "Enhance resume with AI"
+            },
+            {
+                "path": "/ready",
+                "method": "GET",
+                "description": "Readiness (503 until warmup is done) with warmup durations"
+            },
+            {
+                "path": "/metrics",
+                "method": "GET",
+                "description": "Prometheus metrics (stage latency histograms, queue gauges)"
+            },
+            {
+                "path": "/api/admission",
+                "method": "GET",
+                "description": "Concurrency, queue depth and rejections per cost class"
+            },
+            {
+                "path": "/api/traces",
+                "method": "GET",
+                "description": "Recent sampled request traces (GET /api/traces/{trace_id} for spans)"
             }
         ]
     }
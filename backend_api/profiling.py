@@ -0,0 +1,203 @@
+"""
+On-demand profiling
+Samples the stacks of every thread in this worker for T seconds or the next N
+requests, aggregated per function or as collapsed stacks for flamegraphs, with
+optional tracemalloc allocation growth. Guarded by PROFILING_TOKEN.
+"""
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+# Unset = the profiling endpoint answers 404
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN", "")
+PROFILING_MAX_SECONDS = float(os.environ.get("PROFILING_MAX_SECONDS", 120))
+PROFILING_INTERVAL_MS = float(os.environ.get("PROFILING_INTERVAL_MS", 5))
+PROFILING_TRACEMALLOC_FRAMES = int(os.environ.get("PROFILING_TRACEMALLOC_FRAMES", 1))
+MAX_STACK_DEPTH = 128
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def check_token(provided: Optional[str]):
+    """404 while profiling is disabled, 401 for a missing or wrong token"""
+    if not PROFILING_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not provided or not hmac.compare_digest(provided.encode('utf-8'), PROFILING_TOKEN.encode('utf-8')):
+        raise HTTPException(status_code=401, detail="Invalid profiling token")
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_ROOT_DIR):
+        return os.path.relpath(filename, _ROOT_DIR)
+    # .../site-packages/pypdf/_page.py -> pypdf/_page.py
+    marker = filename.rfind('-packages' + os.sep)
+    if marker >= 0:
+        return filename[marker + len('-packages' + os.sep):]
+    return os.path.basename(filename)
+
+
+class StackSampler:
+    """Background thread counting the stacks of all other threads every interval"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, 'co_qualname', code.co_name)
+            label = self._labels[code] = f"{_short_path(code.co_filename)}:{name}"
+        return label
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                # Stored root first, as flamegraph tools expect
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format: 'thread;outer;...;inner count' per line"""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n"
+
+    def top_functions(self, limit: int) -> List[Dict]:
+        """Functions by self samples (innermost frame) with their inclusive samples"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            # stack[0] is the thread name
+            own[stack[-1]] += count
+            for label in set(stack[1:]):
+                total[label] += count
+        thread_samples = sum(self.stacks.values()) or 1
+        return [{
+            'function': label,
+            'self_samples': own[label],
+            'total_samples': total[label],
+            'self_pct': round(100.0 * own[label] / thread_samples, 2),
+            'total_pct': round(100.0 * total[label] / thread_samples, 2),
+        } for label, _ in own.most_common(limit)]
+
+
+def _allocation_growth(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> List[Dict]:
+    exclude = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    before = before.filter_traces(exclude)
+    after = after.filter_traces(exclude)
+    return [{
+        'site': f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+        'size_kib': round(stat.size / 1024, 2),
+        'size_diff_kib': round(stat.size_diff / 1024, 2),
+        'count': stat.count,
+        'count_diff': stat.count_diff,
+    } for stat in after.compare_to(before, 'lineno')[:limit]]
+
+
+class Profiler:
+    """At most one profile at a time per worker; the API middleware reports finished requests"""
+
+    def __init__(self):
+        self._session: Optional[Tuple[int, asyncio.Event]] = None
+        self._finished = 0
+
+    @property
+    def active(self) -> bool:
+        return self._session is not None
+
+    def request_finished(self):
+        if self._session is None:
+            return
+        self._finished += 1
+        target, done = self._session
+        if target and self._finished >= target:
+            done.set()
+
+    async def profile(self, seconds: float, requests: int = 0, memory: bool = False, top: int = 30) -> Tuple[Dict, StackSampler]:
+        """
+        Sample this worker until `requests` requests finish (if > 0) or `seconds` pass
+
+        Args:
+            seconds: Profiling window, or the wait limit when requests is set
+            requests: Stop after this many other requests have completed
+            memory: Also report allocation growth over the window (tracemalloc)
+            top: Number of functions and allocation sites to report
+
+        Returns:
+            (report, sampler); the sampler also renders collapsed stacks
+        """
+        if self._session is not None:
+            raise HTTPException(status_code=409, detail="A profile is already running in this worker")
+        seconds = min(max(seconds, 0.1), PROFILING_MAX_SECONDS)
+        done = asyncio.Event()
+        self._session = (max(requests, 0), done)
+        self._finished = 0
+
+        started_tracemalloc = False
+        before = None
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(PROFILING_TRACEMALLOC_FRAMES)
+                started_tracemalloc = True
+            before = tracemalloc.take_snapshot()
+
+        sampler = StackSampler(PROFILING_INTERVAL_MS / 1000.0)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            try:
+                await asyncio.wait_for(done.wait(), timeout=seconds)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            sampler.stop()
+            self._session = None
+
+        report = {
+            'pid': os.getpid(),
+            'profiler': 'sampling',
+            'interval_ms': PROFILING_INTERVAL_MS,
+            'duration_s': round(time.perf_counter() - start, 3),
+            'requests_profiled': self._finished,
+            'samples': sampler.samples,
+            'top_functions': sampler.top_functions(top),
+        }
+        if memory:
+            try:
+                after = tracemalloc.take_snapshot()
+                report['traced_memory_kib'] = round(tracemalloc.get_traced_memory()[0] / 1024, 2)
+                report['allocation_growth'] = _allocation_growth(before, after, top)
+            finally:
+                if started_tracemalloc:
+                    tracemalloc.stop()
+        return report, sampler
@@ -0,0 +1,136 @@
+"""
+Result cache
+LRU + TTL cache for deterministic results (ATS scores, parses) with single-flight computation
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+ATS_CACHE_SIZE = int(os.environ.get("ATS_CACHE_SIZE", 2048))
+ATS_CACHE_TTL = float(os.environ.get("ATS_CACHE_TTL", 3600))
+PARSE_CACHE_SIZE = int(os.environ.get("PARSE_CACHE_SIZE", 1024))
+PARSE_CACHE_TTL = float(os.environ.get("PARSE_CACHE_TTL", 24 * 3600))
+
+
+def ats_cache_key(parsed_resume: Dict, job_description: str, scorer_version: str) -> str:
+    """Hash of the parsed-resume content, the JD text and the scorer/taxonomy version"""
+    hasher = hashlib.sha256()
+    hasher.update(scorer_version.encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update(json.dumps(parsed_resume, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8'))
+    hasher.update(b'\0')
+    hasher.update((job_description or "").strip().encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def parse_cache_key(sha256: str, parser_version: str) -> str:
+    """Parses are keyed by the SHA-256 of the uploaded file bytes"""
+    return f"{parser_version}:{sha256.lower()}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return any(tag[2:] == etag if tag.startswith('W/') else tag == etag for tag in candidates)
+
+
+class ResultCache:
+    """
+    In-process LRU cache whose entries also expire after ttl_seconds
+
+    Concurrent misses on the same key share one computation, so a burst of
+    client retries costs a single scoring run.
+    """
+
+    def __init__(self, name: str, maxsize: int = ATS_CACHE_SIZE, ttl_seconds: float = ATS_CACHE_TTL):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]],
+                             cacheable: Callable[[Any], bool] = lambda value: True) -> Tuple[Any, bool]:
+        """
+        Return (value, hit), computing and caching the value on a miss
+
+        Args:
+            key: Cache key
+            compute: Coroutine factory producing the value
+            cacheable: Decides whether a computed value may be cached (e.g. not partial errors)
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value, True
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending), True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await compute()
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+        if cacheable(value):
+            self.put(key, value)
+        future.set_result(value)
+        return value, False
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def gauges(self):
+        """Samples for metrics.REGISTRY.register_gauges"""
+        labels = {'cache': self.name}
+        stats = self.stats()
+        yield "result_cache_entries", "Entries held by a result cache", labels, stats['size']
+        yield "result_cache_hits_total", "Result cache hits since startup", labels, stats['hits']
+        yield "result_cache_misses_total", "Result cache misses since startup", labels, stats['misses']
+        yield "result_cache_evictions_total", "LRU evictions since startup", labels, stats['evictions']
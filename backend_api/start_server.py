@@ -1,9 +1,19 @@
 """
 FastAPI Backend for Resume ATS Mobile App
 Uses existing modules from parent directory to avoid reinstalling heavy dependencies
+
+Development (auto-reload, single process):
+    python start_server.py
+
+Production (models preloaded once, N forked workers sharing them copy-on-write):
+    python start_server.py --prod --workers 4
 """
 import sys
 import os
+import argparse
+import signal
+import socket
+import time
 
 # Add parent directory to path to use existing installed modules
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -18,11 +28,180 @@ if os.path.exists(parent_venv):
     if os.path.exists(site_packages):
         sys.path.insert(0, site_packages)
 
-# Now import and run the FastAPI app
-from main import app
 
-if __name__ == "__main__":
+def read_memory(pid: int) -> dict:
+    """
+    Read memory usage of a process from /proc/<pid>/smaps_rollup (Linux)
+
+    Returns:
+        Dictionary with rss, pss, shared and private sizes in MB (empty if unavailable)
+    """
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    values[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    except OSError:
+        return {}
+    return {
+        'rss': values.get('Rss', 0.0),
+        'pss': values.get('Pss', 0.0),
+        'shared': values.get('Shared_Clean', 0.0) + values.get('Shared_Dirty', 0.0),
+        'private': values.get('Private_Clean', 0.0) + values.get('Private_Dirty', 0.0)
+    }
+
+
+def print_memory_report(master_pid: int, worker_pids: list):
+    """Print per-process memory; 'private' is what each extra worker really costs"""
+    master = read_memory(master_pid)
+    if not master:
+        print("Memory report unavailable (/proc/<pid>/smaps_rollup not found)")
+        return
+    print("📊 Memory (MB)      rss      pss   shared  private")
+    print(f"   master {master_pid:>7} {master['rss']:8.1f} {master['pss']:8.1f} "
+          f"{master['shared']:8.1f} {master['private']:8.1f}")
+    total_pss = master['pss']
+    for pid in worker_pids:
+        mem = read_memory(pid)
+        if not mem:
+            continue
+        total_pss += mem['pss']
+        print(f"   worker {pid:>7} {mem['rss']:8.1f} {mem['pss']:8.1f} "
+              f"{mem['shared']:8.1f} {mem['private']:8.1f}")
+    print(f"   total pss {total_pss:.1f} MB")
+
+
+def preload_models():
+    """Load models in the master so forked workers share the weights copy-on-write"""
+    start = time.time()
+    from main import app, scorer
+    try:
+        # RAG embedding model (needs config.json with the Groq key)
+        import rag_utility
+        rag_utility.get_embedding()
+    except Exception as e:
+        print(f"RAG embedding model not preloaded: {e}")
+    print(f"✅ Models preloaded in {time.time() - start:.1f}s")
+    return app
+
+
+def run_worker(app, sock: socket.socket, threads_per_worker: int, host: str, port: int):
+    """Entry point of a forked worker: set CPU threads and serve on the shared socket"""
+    try:
+        import torch
+        torch.set_num_threads(threads_per_worker)
+    except ImportError:
+        pass
+
     import uvicorn
-    print("Starting Resume ATS API Server...")
-    print("API Documentation: http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    config = uvicorn.Config(app, host=host, port=port, log_level="info")
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def run_production(host: str, port: int, workers: int, memory_report_interval: float):
+    cpus = os.cpu_count() or 1
+    threads_per_worker = max(1, cpus // workers)
+
+    # Must be set before torch, the executors and the job queue are imported
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(name, str(threads_per_worker))
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    os.environ.setdefault("PARSE_WORKERS", str(threads_per_worker))
+    # The durable job queue runs once, in the master, not in every worker
+    job_worker_count = int(os.environ.get("JOB_WORKERS", 2))
+    os.environ["JOB_WORKERS"] = "0"
+
+    print(f"Starting Resume ATS API Server (production): {workers} workers x {threads_per_worker} threads")
+    app = preload_models()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                run_worker(app, sock, threads_per_worker, host, port)
+            finally:
+                os._exit(0)
+        return pid
+
+    worker_pids = [spawn() for _ in range(workers)]
+    print(f"API listening on http://{host}:{port} (workers: {worker_pids})")
+
+    from jobs import JobWorkerPool
+    job_workers = JobWorkerPool(workers=job_worker_count)
+    job_workers.start()
+
+    stopping = False
+
+    def handle_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, handle_stop)
+    signal.signal(signal.SIGTERM, handle_stop)
+
+    next_report = time.time() + min(30.0, memory_report_interval or 30.0)
+    reported_once = False
+    while not stopping:
+        # Only reap the API workers; the job queue processes belong to multiprocessing
+        for i, worker_pid in enumerate(worker_pids):
+            try:
+                pid, status = os.waitpid(worker_pid, os.WNOHANG)
+            except ChildProcessError:
+                pid, status = worker_pid, -1
+            if pid:
+                # Re-fork from the preloaded master; cheap compared to a cold start
+                print(f"Worker {worker_pid} exited with status {status}, restarting")
+                worker_pids[i] = spawn()
+        if time.time() >= next_report and (memory_report_interval or not reported_once):
+            print_memory_report(os.getpid(), worker_pids)
+            reported_once = True
+            next_report = time.time() + (memory_report_interval or 0)
+        time.sleep(0.5)
+
+    print("Shutting down workers...")
+    for pid in worker_pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in worker_pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    job_workers.stop()
+    sock.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Resume ATS API server")
+    arg_parser.add_argument("--prod", action="store_true", help="Pre-fork production mode (no reload)")
+    arg_parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", 2)),
+                            help="Worker processes in production mode")
+    arg_parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    arg_parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    arg_parser.add_argument("--memory-report-interval", type=float,
+                            default=float(os.environ.get("MEMORY_REPORT_INTERVAL", 0)),
+                            help="Seconds between memory reports (0 = once, 30s after startup)")
+    args = arg_parser.parse_args()
+
+    if args.prod:
+        run_production(args.host, args.port, max(1, args.workers), args.memory_report_interval)
+    else:
+        # Now import and run the FastAPI app
+        from main import app
+        import uvicorn
+        print("Starting Resume ATS API Server...")
+        print(f"API Documentation: http://localhost:{args.port}/docs")
+        uvicorn.run(app, host=args.host, port=args.port, reload=True)
@@ -0,0 +1,242 @@
+"""
+Streamed resume uploads
+Parses multipart bodies chunk by chunk straight into the temp file handed to the parser,
+enforcing a byte limit, checking magic bytes and hashing on the way
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+try:
+    from multipart.multipart import MultipartParser, parse_options_header
+except ImportError:
+    MultipartParser = None
+
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+UPLOAD_MAX_FIELD_BYTES = int(os.environ.get("UPLOAD_MAX_FIELD_BYTES", 256 * 1024))
+UPLOAD_TMP_DIR = os.environ.get("UPLOAD_TMP_DIR") or None
+logger = logging.getLogger(__name__)
+
+# Multipart boundaries, part headers and small form fields on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+# A PDF header may follow a few bytes of junk; DOCX is a ZIP container
+MAGIC_BYTES = {
+    '.pdf': (b'%PDF-', 1024),
+    '.docx': (b'PK\x03\x04', 0),
+}
+
+# Upload form fields (OpenAPI), since the body is read from the raw request stream
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "job_description": {"type": "string"},
+                        "include_text": {"type": "boolean"}
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+class StoredUpload:
+    """A resume written to disk by receive_resume_upload"""
+
+    def __init__(self, path: str, filename: str, size: int, sha256: str, fields: Dict[str, str]):
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+        self.fields = fields
+
+    def cleanup(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _disposition_params(value: bytes) -> Dict[str, str]:
+    _, params = parse_options_header(value)
+    return {key.decode('latin-1').lower(): val.decode('utf-8', errors='replace') for key, val in params.items()}
+
+
+class _ResumeMultipartSink:
+    """Parser callbacks: the resume part goes to disk, other parts become small text fields"""
+
+    def __init__(self, field_name: str, max_bytes: int):
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.path: Optional[str] = None
+        self.size = 0
+        self.hasher = hashlib.sha256()
+        self._file = None
+        self._head = b""
+        self._sniff_bytes = 0
+        self._magic_checked = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[str, bytes] = {}
+        self._part_name = None
+        self._part_is_file = False
+        self._field_buffer = bytearray()
+        self._field_bytes = 0
+
+    def callbacks(self) -> Dict:
+        return {
+            'on_part_begin': self.on_part_begin,
+            'on_header_field': self.on_header_field,
+            'on_header_value': self.on_header_value,
+            'on_header_end': self.on_header_end,
+            'on_headers_finished': self.on_headers_finished,
+            'on_part_data': self.on_part_data,
+            'on_part_end': self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self._headers = {}
+        self._part_name = None
+        self._part_is_file = False
+        self._field_buffer = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_field.decode('latin-1').lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        params = _disposition_params(self._headers.get('content-disposition', b''))
+        self._part_name = params.get('name')
+        if self._part_name == self.field_name and 'filename' in params:
+            if self._file is not None:
+                raise HTTPException(status_code=400, detail="Only one resume file per request")
+            self._start_file(os.path.basename(params['filename']))
+
+    def _start_file(self, filename: str):
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in MAGIC_BYTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Only PDF and DOCX files are supported. Got: {filename}"
+            )
+        magic, search_window = MAGIC_BYTES[extension]
+        self.filename = filename
+        self._sniff_bytes = len(magic) + search_window
+        self._part_is_file = True
+        self._file = tempfile.NamedTemporaryFile(delete=False, suffix=extension, dir=UPLOAD_TMP_DIR)
+        self.path = self._file.name
+
+    def _check_magic(self):
+        magic, search_window = MAGIC_BYTES[os.path.splitext(self.filename)[1].lower()]
+        position = self._head.find(magic, 0, search_window + len(magic))
+        if position < 0 or (search_window == 0 and position != 0):
+            raise HTTPException(
+                status_code=400,
+                detail=f"File content does not match its extension: {self.filename}"
+            )
+        self._magic_checked = True
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        chunk = data[start:end]
+        if not self._part_is_file:
+            self._field_bytes += len(chunk)
+            if self._field_bytes > UPLOAD_MAX_FIELD_BYTES:
+                raise HTTPException(status_code=413, detail="Form fields too large")
+            self._field_buffer += chunk
+            return
+
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise HTTPException(status_code=413, detail=f"File exceeds {self.max_bytes} bytes")
+        if not self._magic_checked:
+            # Usually decided by the first chunk
+            self._head += chunk[:self._sniff_bytes - len(self._head)]
+            if len(self._head) >= self._sniff_bytes:
+                self._check_magic()
+        self.hasher.update(chunk)
+        self._file.write(chunk)
+
+    def on_part_end(self):
+        if self._part_is_file:
+            if not self.size:
+                raise HTTPException(status_code=400, detail="Empty file")
+            if not self._magic_checked:
+                self._check_magic()
+            self._file.close()
+        elif self._part_name:
+            self.fields[self._part_name] = self._field_buffer.decode('utf-8', errors='replace')
+
+    def discard(self):
+        if self._file is not None:
+            self._file.close()
+            if os.path.exists(self._file.name):
+                os.unlink(self._file.name)
+
+
+async def receive_resume_upload(request: Request, field_name: str = "file",
+                                max_bytes: int = UPLOAD_MAX_BYTES) -> StoredUpload:
+    """
+    Stream a multipart resume upload to a temp file
+
+    The body is never held in memory: each network chunk is parsed, checked
+    against the byte limit, hashed and appended to the temp file, and the
+    request is rejected as soon as a check fails.
+
+    Args:
+        request: Incoming multipart/form-data request
+        field_name: Form field holding the resume file
+        max_bytes: Maximum resume size
+
+    Returns:
+        StoredUpload; the caller must call cleanup()
+    """
+    if MultipartParser is None:
+        raise HTTPException(status_code=500, detail="python-multipart is not installed")
+
+    content_type, params = parse_options_header(request.headers.get('content-type', ''))
+    boundary = params.get(b'boundary')
+    if content_type != b'multipart/form-data' or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD:
+        # Reject before reading anything
+        raise HTTPException(status_code=413, detail=f"File exceeds {max_bytes} bytes")
+
+    sink = _ResumeMultipartSink(field_name, max_bytes)
+    parser = MultipartParser(boundary, sink.callbacks())
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                parser.write(chunk)
+        parser.finalize()
+    except Exception:
+        sink.discard()
+        raise
+
+    if sink.path is None:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    if not sink._file.closed:
+        sink.discard()
+        raise HTTPException(status_code=400, detail="Incomplete multipart upload")
+
+    logger.debug("File received: %s (%d bytes, sha256 %s)", sink.filename, sink.size, sink.hasher.hexdigest())
+    return StoredUpload(sink.path, sink.filename, sink.size, sink.hasher.hexdigest(), sink.fields)
@@ -0,0 +1,134 @@
+"""
+Startup warmup
+Preloads models and runs a synthetic parse/score/retrieve round trip before the API reports ready
+"""
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Optional
+
+from executors import parse_resume_async, rag_executor, score_resume_async
+from synthetic_documents import SAMPLE_JOB_DESCRIPTION, write_sample_pdf
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1") != "0"
+# Components whose failure keeps /ready at 503; the others are reported but optional
+WARMUP_REQUIRED = [
+    name.strip() for name in os.environ.get("WARMUP_REQUIRED", "embedding,parse,score").split(",") if name.strip()
+]
+
+
+def _warm_retrieval() -> str:
+    """Load the RAG embedding model, open the vector store and run one retrieval"""
+    import rag_utility
+
+    rag_utility.get_embedding().embed_query("warmup")
+    vectordb = rag_utility.get_vectorstore()
+    try:
+        retriever = rag_utility.get_retriever(vectordb)
+        docs = retriever.invoke("How should I format my resume for ATS?")
+        return f"{len(docs)} documents"
+    finally:
+        if not isinstance(vectordb, rag_utility.NumpyVectorStore):
+            rag_utility.close_vectordb(vectordb)
+
+
+class WarmupState:
+    """Warmup progress and per-component durations reported by /ready"""
+
+    def __init__(self, required=None):
+        self.required = list(WARMUP_REQUIRED if required is None else required)
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.components: Dict[str, Dict] = {}
+
+    @property
+    def ready(self) -> bool:
+        if self.finished_at is None:
+            return False
+        return all(self.components.get(name, {}).get('status') == 'ok' for name in self.required)
+
+    async def _component(self, name: str, coro):
+        self.components[name] = {'status': 'running'}
+        start = time.perf_counter()
+        try:
+            detail = await coro
+            self.components[name] = {'status': 'ok'}
+            if detail:
+                self.components[name]['detail'] = detail
+        except Exception as e:
+            logger.warning("Warmup of %s failed: %s", name, e)
+            self.components[name] = {'status': 'error', 'error': str(e)}
+        self.components[name]['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return self.components[name]['status'] == 'ok'
+
+    async def run(self, scorer):
+        """
+        Warm every component in dependency order
+
+        Args:
+            scorer: The API's ATSScorer (its embedding model is already loaded)
+        """
+        self.started_at = time.time()
+        logger.info("🔥 Warming up models...")
+
+        async def warm_embedding():
+            if scorer.embeddings is None:
+                raise RuntimeError("Embedding model unavailable")
+            # First forward pass builds the PyTorch graph and allocator pools
+            await asyncio.to_thread(scorer.embeddings.embed_documents, ["warmup", SAMPLE_JOB_DESCRIPTION])
+
+        work_dir = None
+        parsed = {}
+
+        async def warm_parse():
+            # Spawns the parse pool workers and runs the PDF path end to end;
+            # failing to write the sample PDF is reported as a parse error
+            nonlocal parsed, work_dir
+            work_dir = tempfile.mkdtemp(prefix="resume_warmup_")
+            pdf_path = write_sample_pdf(os.path.join(work_dir, "warmup_resume.pdf"))
+            parsed = await parse_resume_async(pdf_path)
+            if 'error' in parsed:
+                raise RuntimeError(parsed['error'])
+            return f"{parsed['word_count']} words"
+
+        async def warm_score():
+            result = await score_resume_async(scorer, parsed, SAMPLE_JOB_DESCRIPTION)
+            if 'error' in result:
+                raise RuntimeError(result['error'])
+            return f"score {result['total_score']}"
+
+        try:
+            await self._component('embedding', warm_embedding())
+            if await self._component('parse', warm_parse()):
+                await self._component('score', warm_score())
+            else:
+                self.components['score'] = {'status': 'skipped', 'duration_ms': 0.0}
+            await self._component('retrieval', rag_executor.run(_warm_retrieval))
+        finally:
+            if work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            self.finished_at = time.time()
+
+        status = "ready" if self.ready else "NOT ready"
+        logger.info("✅ Warmup finished in %.1fs, %s", self.finished_at - self.started_at, status)
+
+    def mark_skipped(self):
+        """Report ready immediately (WARMUP_ENABLED=0)"""
+        self.started_at = self.finished_at = time.time()
+        self.components = {name: {'status': 'ok', 'duration_ms': 0.0, 'detail': 'warmup disabled'}
+                           for name in self.required}
+
+    def report(self) -> Dict:
+        return {
+            'ready': self.ready,
+            'warming_up': self.started_at is not None and self.finished_at is None,
+            'required': self.required,
+            'total_ms': round((self.finished_at - self.started_at) * 1000, 1)
+            if self.started_at and self.finished_at else None,
+            'components': self.components
+        }
@@ -0,0 +1,49 @@
+"""
+Benchmark Report Helpers
+Shared --output / --compare / --threshold handling for the benchmark scripts
+"""
+
+import json
+import sys
+
+
+def add_report_arguments(arg_parser, threshold=0.15):
+    """Add --output, --compare and --threshold to a benchmark's argument parser"""
+    arg_parser.add_argument("--output", help="Write the JSON report to this file")
+    arg_parser.add_argument("--compare", help="Baseline report to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=threshold, help="Allowed relative regression")
+
+
+def report_and_compare(args, produce_report, compare):
+    """
+    Produce a report, print and optionally save it, then check it against a baseline
+
+    Args:
+        args: Parsed arguments from a parser set up with add_report_arguments
+        produce_report: Callable returning the JSON-serializable report
+        compare: compare(report, baseline, threshold) -> list of regression descriptions
+
+    Exits with status 1 when --compare finds regressions.
+    """
+    baseline = None
+    if args.compare:
+        # Read first: --output may point at the same file
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = produce_report()
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+    return report
@@ -0,0 +1,151 @@
+"""
+DOCX Extraction Benchmark
+Compares the streaming OOXML extractor with python-docx on speed, peak memory
+and extracted text, on synthetic documents of growing size or on real files
+
+Usage:
+    python benchmarks/bench_docx_extract.py
+    python benchmarks/bench_docx_extract.py --paragraphs 100 1000 20000 --output docx_extract.json
+    python benchmarks/bench_docx_extract.py resumes/*.docx
+
+    # Regression check against a saved baseline (exit code 1 on regression)
+    python benchmarks/bench_docx_extract.py --compare docx_extract.json --threshold 0.15
+"""
+
+import argparse
+import gc
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx_extractor import extract_docx_text
+from synthetic_documents import build_docx, generate_resume_lines
+
+from _common import add_report_arguments, report_and_compare
+
+
+def extract_stream(path):
+    return extract_docx_text(path)[0]
+
+
+def extract_python_docx(path):
+    from docx import Document
+    doc = Document(path)
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs)
+
+
+def build_inputs(sizes, seed, work_dir):
+    """{name: path} of synthetic DOCX files with about the given paragraph counts"""
+    rng = random.Random(seed)
+    inputs = {}
+    for size in sizes:
+        # Experience bullets dominate the paragraph count
+        lines = generate_resume_lines(rng, max(size - 12, 1))
+        path = os.path.join(work_dir, f"resume_{size}p.docx")
+        with open(path, "wb") as f:
+            f.write(build_docx(lines))
+        inputs[f"{size}p"] = path
+    return inputs
+
+
+def measure(fn, path, repeat):
+    """Median and min seconds per call, plus tracemalloc peak of one call"""
+    fn(path)  # warm imports and the OS file cache
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        text = fn(path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "peak_kib": round((peak - before) / 1024, 2),
+        "chars": len(text),
+    }, text
+
+
+def run(args):
+    try:
+        import docx  # noqa: F401
+        backends = {"stream": extract_stream, "python-docx": extract_python_docx}
+    except ImportError:
+        print("python-docx not installed; timing the streaming extractor only", file=sys.stderr)
+        backends = {"stream": extract_stream}
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_docx_") as work_dir:
+        if args.files:
+            inputs = {os.path.basename(path): path for path in args.files}
+        else:
+            inputs = build_inputs(args.paragraphs, args.seed, work_dir)
+
+        for name, path in inputs.items():
+            entry = {"bytes": os.path.getsize(path)}
+            texts = {}
+            for backend, fn in backends.items():
+                entry[backend], texts[backend] = measure(fn, path, args.repeat)
+            if "python-docx" in texts:
+                python_docx_lines = [line for line in texts["python-docx"].splitlines() if line.strip()]
+                stream_lines = set(texts["stream"].splitlines())
+                entry["speedup"] = round(entry["python-docx"]["median_ms"] / max(entry["stream"]["median_ms"], 1e-9), 2)
+                # The stream extractor also reads tables, headers and footers, so it may find more
+                entry["python_docx_lines_found"] = all(line in stream_lines for line in python_docx_lines)
+            results[name] = entry
+            print(f"{name:<32} " + "  ".join(f"{backend} {entry[backend]['median_ms']:>9.2f} ms"
+                                             for backend in backends), file=sys.stderr)
+
+    return {
+        "config": {"repeat": args.repeat, "seed": args.seed},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": int(time.time()),
+        },
+        "documents": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """List documents whose streaming extraction time grew by more than threshold"""
+    regressions = []
+    for name, current in report["documents"].items():
+        previous = baseline.get("documents", {}).get(name, {}).get("stream")
+        if previous and current["stream"]["median_ms"] > previous["median_ms"] * (1 + threshold):
+            regressions.append(f"{name}: median {previous['median_ms']}ms -> {current['stream']['median_ms']}ms")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark streaming DOCX extraction against python-docx")
+    arg_parser.add_argument("files", nargs="*", help="DOCX files to use instead of synthetic documents")
+    arg_parser.add_argument("--paragraphs", type=int, nargs="+", default=[50, 500, 5000, 20000],
+                            help="Paragraph counts of the synthetic documents")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per document and backend")
+    arg_parser.add_argument("--seed", type=int, default=7, help="Fixture seed")
+    add_report_arguments(arg_parser, threshold=0.15)
+    args = arg_parser.parse_args()
+
+    report_and_compare(args, lambda: run(args), compare)
+
+
+if __name__ == "__main__":
+    main()
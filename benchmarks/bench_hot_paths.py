@@ -0,0 +1,286 @@
+"""
+Hot Path Micro-Benchmarks
+Times ResumeParser and ATSScorer hot paths on fixed synthetic fixtures and
+reports median latency plus tracemalloc allocations per call as JSON
+
+Usage:
+    python benchmarks/bench_hot_paths.py --output hot_paths.json
+    python benchmarks/bench_hot_paths.py --filter score_ --repeat 9
+
+    # Regression check against the committed baseline (exit code 1 on regression)
+    python benchmarks/bench_hot_paths.py --compare benchmarks/baselines/hot_paths.json
+
+    # Refresh the baseline after an intended change, on the machine that runs the check
+    python benchmarks/bench_hot_paths.py --output benchmarks/baselines/hot_paths.json
+
+benchmarks/baselines/hot_paths.json was recorded on a single-CPU Linux x86_64
+box (see its "environment"); regenerate it before comparing on other hardware.
+
+Semantic scoring uses a deterministic hashing embedding model instead of
+the sentence-transformers model, so numbers measure the scorer itself and
+no model is downloaded. Timings are only comparable on the same machine.
+"""
+
+import argparse
+import contextlib
+import gc
+import hashlib
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_parser
+from resume_parser import ResumeParser
+from synthetic_documents import build_pdf, generate_job_description, generate_resume_lines
+
+from _common import add_report_arguments, report_and_compare
+
+
+# Experience bullets per fixture: about one page and about three pages of text
+RESUME_SIZES = {"1page": 12, "3page": 120}
+PATHFINDER_JD_COUNTS = [3, 50, 500]
+PDF_BACKENDS = ["pypdf", "pdfplumber", "PyPDF2"]
+SCORE_METHODS = [
+    "score_format", "score_keywords", "score_sections", "score_contact",
+    "score_experience", "score_skills", "score_length",
+]
+
+
+class HashEmbeddings:
+    """Deterministic bag-of-words hashing embeddings (same shape as all-MiniLM-L6-v2)"""
+
+    def __init__(self, model_name=None, dimensions=384, **kwargs):
+        self.model_name = model_name
+        self.dimensions = dimensions
+
+    def embed_query(self, text):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in re.findall(r"[a-z0-9]+", text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+def build_scorer():
+    """ATSScorer with HashEmbeddings in place of the HuggingFace model"""
+    import ats_scorer
+    original = ats_scorer.HuggingFaceEmbeddings
+    ats_scorer.HuggingFaceEmbeddings = HashEmbeddings
+    try:
+        return ats_scorer.ATSScorer()
+    finally:
+        ats_scorer.HuggingFaceEmbeddings = original
+
+
+@contextlib.contextmanager
+def pdf_backend(name):
+    """Force extract_text_from_pdf onto a single backend; None if it is not installed"""
+    saved = (resume_parser.pypdf_available, resume_parser.pdfplumber, resume_parser.PyPDF2)
+    try:
+        module = None
+        if name == "pdfplumber":
+            module = resume_parser.pdfplumber
+        elif name == "PyPDF2":
+            try:
+                import PyPDF2 as module
+            except ImportError:
+                module = None
+        available = resume_parser.pypdf_available if name == "pypdf" else module is not None
+        resume_parser.pypdf_available = name == "pypdf" and available
+        resume_parser.pdfplumber = module if name == "pdfplumber" else None
+        resume_parser.PyPDF2 = module if name == "PyPDF2" else None
+        yield available
+    finally:
+        resume_parser.pypdf_available, resume_parser.pdfplumber, resume_parser.PyPDF2 = saved
+
+
+def build_fixtures(seed, work_dir):
+    """Resume texts, PDFs on disk, parsed resumes and JDs; the same seed gives the same inputs"""
+    rng = random.Random(seed)
+    parser = ResumeParser()
+    fixtures = {"resumes": {}, "job_description": generate_job_description(rng, 10)}
+    for size, bullets in RESUME_SIZES.items():
+        lines = generate_resume_lines(rng, bullets)
+        text = "\n".join(lines)
+        pdf_path = os.path.join(work_dir, f"resume_{size}.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(build_pdf(lines))
+        fixtures["resumes"][size] = {
+            "text": text,
+            "pdf_path": pdf_path,
+            "parsed": parser.parse_text(text),
+        }
+    fixtures["job_descriptions"] = [
+        generate_job_description(rng, rng.choice([5, 10, 25])) for _ in range(max(PATHFINDER_JD_COUNTS))
+    ]
+    return fixtures
+
+
+def build_cases(fixtures, parser, scorer):
+    """(name, callable, setup context) for every benchmarked hot path"""
+    cases = []
+    jd = fixtures["job_description"]
+
+    for backend in PDF_BACKENDS:
+        for size, resume in fixtures["resumes"].items():
+            path = resume["pdf_path"]
+            cases.append((f"extract_text_from_pdf[{backend},{size}]",
+                          lambda path=path: parser.extract_text_from_pdf(path),
+                          lambda backend=backend: pdf_backend(backend)))
+
+    for size, resume in fixtures["resumes"].items():
+        text = resume["text"]
+        cases.append((f"extract_email[{size}]", lambda text=text: parser.extract_email(text), None))
+        cases.append((f"extract_phone[{size}]", lambda text=text: parser.extract_phone(text), None))
+        cases.append((f"segment_sections[{size}]", lambda text=text: parser.segment_sections(text), None))
+        cases.append((f"extract_sections[{size}]", lambda text=text: parser.extract_sections(text), None))
+
+    if scorer is None:
+        return cases
+
+    for size, resume in fixtures["resumes"].items():
+        parsed = resume["parsed"]
+        for method_name in SCORE_METHODS:
+            method = getattr(scorer, method_name)
+            if method_name == "score_keywords":
+                call = lambda method=method, parsed=parsed: method(parsed, jd)
+            else:
+                call = lambda method=method, parsed=parsed: method(parsed)
+            cases.append((f"{method_name}[{size}]", call, None))
+        cases.append((f"calculate_technical_ats_score[{size}]",
+                      lambda parsed=parsed: scorer.calculate_technical_ats_score(parsed, jd), None))
+        cases.append((f"calculate_semantic_score[{size}]",
+                      lambda parsed=parsed: scorer.calculate_semantic_score(parsed, jd), None))
+
+    parsed = fixtures["resumes"]["1page"]["parsed"]
+    for count in PATHFINDER_JD_COUNTS:
+        jds = fixtures["job_descriptions"][:count]
+        cases.append((f"calculate_pathfinder_analysis[{count}_jds]",
+                      lambda jds=jds: scorer.calculate_pathfinder_analysis(parsed, jds), None))
+    return cases
+
+
+def measure(fn, repeat, min_time):
+    """
+    Median per-call time over repeat rounds, plus allocations of one call
+
+    Each round runs fn enough times to last about min_time seconds (with GC
+    disabled, as timeit does), which keeps fast functions above timer noise.
+    """
+    fn()  # warm caches (regex compilation, lazy imports)
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    per_call = sorted(t / number for t in timer.repeat(repeat=repeat, number=number))
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "loops": number,
+        "repeat": repeat,
+        "median_us": round(statistics.median(per_call) * 1e6, 2),
+        "min_us": round(per_call[0] * 1e6, 2),
+        "iqr_us": round((per_call[(3 * len(per_call)) // 4] - per_call[len(per_call) // 4]) * 1e6, 2),
+        "peak_kib": round((peak - before) / 1024, 2),
+        "retained_kib": round((after - before) / 1024, 2),
+    }
+
+
+def run(args):
+    with tempfile.TemporaryDirectory(prefix="bench_hot_paths_") as work_dir:
+        fixtures = build_fixtures(args.seed, work_dir)
+        parser = ResumeParser()
+        try:
+            scorer = build_scorer()
+        except ImportError as e:
+            print(f"ATSScorer benchmarks skipped: {e}", file=sys.stderr)
+            scorer = None
+
+        results = {}
+        skipped = []
+        for name, fn, setup in build_cases(fixtures, parser, scorer):
+            if args.filter and not any(f in name for f in args.filter):
+                continue
+            with setup() if setup else contextlib.nullcontext(True) as available:
+                if not available:
+                    skipped.append(name)
+                    continue
+                results[name] = measure(fn, args.repeat, args.min_time)
+            print(f"{name:<48} {results[name]['median_us']:>12.2f} us  "
+                  f"{results[name]['peak_kib']:>10.2f} KiB peak", file=sys.stderr)
+
+    return {
+        "config": {
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "min_time_s": args.min_time,
+            "resume_sizes": RESUME_SIZES,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": int(time.time()),
+        },
+        "skipped": skipped,
+        "benchmarks": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """List benchmarks whose median time or peak allocation grew by more than threshold"""
+    regressions = []
+    for name, current in report["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        if previous["median_us"] and current["median_us"] > previous["median_us"] * (1 + threshold):
+            regressions.append(f"{name}: median {previous['median_us']}us -> {current['median_us']}us")
+        # Small absolute slack so a few bytes of interpreter noise never fail the check
+        if current["peak_kib"] > previous["peak_kib"] * (1 + threshold) + 1.0:
+            regressions.append(f"{name}: peak {previous['peak_kib']}KiB -> {current['peak_kib']}KiB")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Micro-benchmark parser and scorer hot paths")
+    arg_parser.add_argument("--filter", nargs="+", help="Only run benchmarks whose name contains one of these")
+    arg_parser.add_argument("--repeat", type=int, default=7, help="Timing rounds per benchmark")
+    arg_parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    arg_parser.add_argument("--seed", type=int, default=7, help="Fixture seed")
+    add_report_arguments(arg_parser, threshold=0.15)
+    args = arg_parser.parse_args()
+
+    report_and_compare(args, lambda: run(args), compare)
+
+
+if __name__ == "__main__":
+    main()
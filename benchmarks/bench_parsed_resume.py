@@ -0,0 +1,132 @@
+"""
+Parsed Resume Memory Benchmark
+Compares parse_resume dicts with slotted ParsedResume objects when many parsed
+resumes are held at once: retained memory, pickle size and conversion cost
+
+Usage:
+    python benchmarks/bench_parsed_resume.py --count 20000
+    python benchmarks/bench_parsed_resume.py --count 50000 --output parsed_resume.json
+
+The resume texts are created before measuring and shared by both
+representations, so "overhead" is the memory of everything except the text.
+"""
+
+import argparse
+import gc
+import json
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsed_resume import ParsedResume
+from resume_parser import ResumeParser
+from synthetic_documents import generate_resume_lines
+
+
+def build_texts(count, seed):
+    """Distinct synthetic resume texts (a few hundred distinct bodies, made unique per index)"""
+    rng = random.Random(seed)
+    bodies = ["\n".join(generate_resume_lines(rng, rng.choice([4, 8, 12, 20]))) for _ in range(min(count, 500))]
+    return [f"{bodies[i % len(bodies)]}\nRef {i}" for i in range(count)]
+
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns (its result is kept alive)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return after - before, result
+
+
+def run(count, seed):
+    parser = ResumeParser()
+    texts = build_texts(count, seed)
+    text_bytes = sum(sys.getsizeof(text) for text in texts)
+
+    start = time.perf_counter()
+    dict_bytes, dicts = retained_bytes(lambda: [parser.parse_text(text) for text in texts])
+    parse_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slotted_bytes, slotted = retained_bytes(lambda: [ParsedResume.from_dict(parsed) for parsed in dicts])
+    from_dict_s = time.perf_counter() - start
+    round_trip_equal = all(resume.to_dict() == parsed for resume, parsed in zip(slotted, dicts))
+    # Build the compact form first, then drop the dicts, as a batch job would
+    del dicts
+    gc.collect()
+
+    start = time.perf_counter()
+    for resume in slotted:
+        resume.to_dict()
+    to_dict_s = time.perf_counter() - start
+    dict_bytes_again, _ = retained_bytes(lambda: [resume.to_dict() for resume in slotted])
+
+    start = time.perf_counter()
+    for resume in slotted:
+        resume.lower_text
+    lower_s = time.perf_counter() - start
+    lower_bytes = sum(sys.getsizeof(resume.lower_text) for resume in slotted)
+    for resume in slotted:
+        resume.drop_lower_text()
+
+    sample = slotted[:1000]
+    dict_pickle = len(pickle.dumps([resume.to_dict() for resume in sample], protocol=pickle.HIGHEST_PROTOCOL))
+    slotted_pickle = len(pickle.dumps(sample, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def per_resume(nbytes):
+        return round(nbytes / count, 1)
+
+    return {
+        "count": count,
+        "seed": seed,
+        "text_bytes_per_resume": per_resume(text_bytes),
+        "dict": {
+            # parse_text's retained memory includes new strings (email, phones) but not the texts
+            "overhead_bytes_per_resume": per_resume(dict_bytes),
+            "to_dict_overhead_bytes_per_resume": per_resume(dict_bytes_again),
+            "pickle_bytes_per_resume": round(dict_pickle / len(sample), 1),
+        },
+        "parsed_resume": {
+            "overhead_bytes_per_resume": per_resume(slotted_bytes),
+            "pickle_bytes_per_resume": round(slotted_pickle / len(sample), 1),
+            "lower_text_bytes_per_resume": per_resume(lower_bytes),
+        },
+        "overhead_saved_pct": round(100.0 * (1 - slotted_bytes / dict_bytes_again), 1) if dict_bytes_again else 0.0,
+        "seconds": {
+            "parse_text": round(parse_s, 3),
+            "from_dict": round(from_dict_s, 3),
+            "to_dict": round(to_dict_s, 3),
+            "lower_text_first_access": round(lower_s, 3),
+        },
+        "round_trip_equal": round_trip_equal,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark ParsedResume memory against parse_resume dicts")
+    arg_parser.add_argument("--count", type=int, default=20000, help="Parsed resumes held in memory")
+    arg_parser.add_argument("--seed", type=int, default=7, help="Fixture seed")
+    arg_parser.add_argument("--output", help="Write the JSON report to this file")
+    args = arg_parser.parse_args()
+
+    report = run(max(args.count, 1), args.seed)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
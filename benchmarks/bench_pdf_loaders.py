@@ -0,0 +1,162 @@
+"""
+PDF Loader Benchmark
+Compares knowledge base PDF loader strategies on speed (pages/s) and retrieval hit rate
+
+Usage:
+    python benchmarks/bench_pdf_loaders.py knowledge_base/*.pdf
+    python benchmarks/bench_pdf_loaders.py guide.pdf --queries probes.json --k 3 --output pdf_loaders.json
+
+    # Regression check against a saved baseline (exit code 1 on regression)
+    python benchmarks/bench_pdf_loaders.py guide.pdf --queries probes.json --compare pdf_loaders.json
+
+A probes file is a JSON list of {"question": ..., "expected": ...} objects;
+a probe is a hit when a top-k chunk contains the expected text. Without
+one, probes are sampled from the PDFs' own sentences.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag_utility import load_pdf_documents, get_text_splitter, get_embedding
+
+from _common import add_report_arguments, report_and_compare
+
+
+STRATEGIES = ["fast", "unstructured"]
+
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def _page_count(file_path):
+    try:
+        from pypdf import PdfReader
+        return len(PdfReader(file_path).pages)
+    except Exception:
+        return 0
+
+
+def sample_probes(documents, n_probes, seed=13):
+    """Pick sentences as questions and a 5-word span of each as the expected hit"""
+    rng = random.Random(seed)
+    sentences = []
+    for doc in documents:
+        for sentence in re.split(r"(?<=[.!?])\s+", doc.page_content):
+            words = sentence.split()
+            if 8 <= len(words) <= 30:
+                sentences.append(words)
+    rng.shuffle(sentences)
+
+    probes = []
+    for words in sentences[:n_probes]:
+        start = len(words) // 2 - 2
+        probes.append({"question": " ".join(words), "expected": " ".join(words[start:start + 5])})
+    return probes
+
+
+def hit_rate(documents, probes, k):
+    """Embed the chunks of one strategy and measure top-k retrieval hit rate"""
+    chunks = get_text_splitter().split_documents(documents)
+    if not chunks or not probes:
+        return 0.0, len(chunks)
+
+    embedding = get_embedding()
+    matrix = np.array(embedding.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+    normalized_chunks = [_normalize(c.page_content) for c in chunks]
+
+    hits = 0
+    for probe in probes:
+        query = np.array(embedding.embed_query(probe["question"]), dtype=np.float32)
+        query /= np.linalg.norm(query) + 1e-12
+        top = np.argsort(-(matrix @ query))[:k]
+        expected = _normalize(probe["expected"])
+        if any(expected in normalized_chunks[i] for i in top):
+            hits += 1
+    return hits / len(probes), len(chunks)
+
+
+def run(pdf_paths, strategies, probes, n_probes, k):
+    results = {}
+    loaded = {}
+
+    for strategy in strategies:
+        pages = 0
+        elapsed = 0.0
+        documents = []
+        errors = 0
+        for path in pdf_paths:
+            start = time.perf_counter()
+            try:
+                documents.extend(load_pdf_documents(path, strategy))
+            except Exception as e:
+                errors += 1
+                print(f"{strategy}: failed on {path}: {e}", file=sys.stderr)
+            elapsed += time.perf_counter() - start
+            pages += _page_count(path)
+        loaded[strategy] = documents
+        results[strategy] = {
+            "files": len(pdf_paths),
+            "pages": pages,
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+            "pages_per_second": round(pages / elapsed, 2) if elapsed else 0.0,
+            "chars": sum(len(d.page_content) for d in documents),
+        }
+
+    if probes is None:
+        reference = loaded.get("fast") or next(iter(loaded.values()), [])
+        probes = sample_probes(reference, n_probes)
+
+    for strategy in strategies:
+        rate, n_chunks = hit_rate(loaded[strategy], probes, k)
+        results[strategy]["chunks"] = n_chunks
+        results[strategy][f"hit_rate_at_{k}"] = round(rate, 3)
+
+    return {"probes": len(probes), "k": k, "strategies": results}
+
+
+def compare(report, baseline, threshold):
+    """List strategies whose pages/s or hit rate dropped by more than threshold"""
+    regressions = []
+    hit_key = f"hit_rate_at_{report['k']}"
+    for strategy, current in report["strategies"].items():
+        previous = baseline.get("strategies", {}).get(strategy)
+        if not previous:
+            continue
+        for key in ("pages_per_second", hit_key):
+            if key in previous and current[key] < previous[key] * (1 - threshold):
+                regressions.append(f"{strategy}: {key} {previous[key]} -> {current[key]}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark PDF loader strategies")
+    arg_parser.add_argument("pdfs", nargs="+", help="PDF files to load")
+    arg_parser.add_argument("--strategies", nargs="+", default=STRATEGIES, choices=STRATEGIES)
+    arg_parser.add_argument("--queries", help="JSON file with retrieval probes")
+    arg_parser.add_argument("--probes", type=int, default=50, help="Number of sampled probes")
+    arg_parser.add_argument("--k", type=int, default=3, help="Retrieval depth")
+    add_report_arguments(arg_parser, threshold=0.15)
+    args = arg_parser.parse_args()
+
+    probes = None
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            probes = json.load(f)
+
+    report_and_compare(args, lambda: run(args.pdfs, args.strategies, probes, args.probes, args.k), compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+API Load Test
+Drives the FastAPI backend with a deterministic synthetic corpus and reports
+per-endpoint latency percentiles, throughput and error rates as JSON
+
+Usage:
+    # In-process (no server, no network; the LLM is replaced by a local fake)
+    python benchmarks/load_test.py --requests 400 --concurrency 16 --output load.json
+
+    # Against a running server (start it with RAG_LLM=fake to keep it offline)
+    python benchmarks/load_test.py --base-url http://localhost:8000 --duration 60
+
+    # Regression check against a saved report (exit code 1 on regression)
+    python benchmarks/load_test.py --compare load.json --threshold 0.2
+
+In-process mode imports backend_api/main.py, so the backend's dependencies,
+a config.json (any GROQ_API_KEY value works with the fake LLM) and a built
+knowledge base are needed for /api/ask-question.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from synthetic_documents import generate_corpus
+
+from _common import add_report_arguments, report_and_compare
+
+
+ENDPOINTS = {
+    "parse": "/api/parse-resume",
+    "ats": "/api/calculate-ats",
+    "ask": "/api/ask-question",
+    "enhance": "/api/enhance-resume",
+}
+DEFAULT_MIX = "parse=4,ats=4,ask=1,enhance=1"
+QUESTIONS = [
+    "How long should my resume be?",
+    "What are ATS-friendly section headings?",
+    "How do I quantify achievements on a resume?",
+    "Should I use a two-column resume layout?",
+    "Which action verbs work best for engineering roles?",
+    "How do I tailor my resume to a job description?",
+]
+MIME_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint '{name}' in --mix (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def parse_corpus_locally(corpus):
+    """Parse each corpus resume once (not measured) to build /api/calculate-ats payloads"""
+    from resume_parser import ResumeParser
+    parser = ResumeParser()
+    parsed = []
+    with tempfile.TemporaryDirectory(prefix="loadtest_") as work_dir:
+        for resume in corpus["resumes"]:
+            path = os.path.join(work_dir, resume["name"])
+            with open(path, "wb") as f:
+                f.write(resume["content"])
+            result = parser.parse_resume(path)
+            if "error" not in result:
+                parsed.append(result)
+    return parsed
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples, elapsed):
+    """Aggregate (endpoint, status, latency_s, error) samples into the JSON report section"""
+    endpoints = {}
+    for name in sorted({s[0] for s in samples}):
+        rows = [s for s in samples if s[0] == name]
+        latencies = sorted(s[2] * 1000 for s in rows)
+        errors = [s for s in rows if s[3] is not None]
+        status_counts = {}
+        for s in rows:
+            status_counts[str(s[1])] = status_counts.get(str(s[1]), 0) + 1
+        endpoints[name] = {
+            "path": ENDPOINTS[name],
+            "requests": len(rows),
+            "errors": len(errors),
+            "error_rate": round(len(errors) / len(rows), 4),
+            "status_counts": status_counts,
+            "throughput_rps": round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "sample_errors": sorted({s[3] for s in errors})[:5],
+        }
+    total_errors = sum(1 for s in samples if s[3] is not None)
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(total_errors / len(samples), 4) if samples else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+async def wait_until_ready(client, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.get("/ready")
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 404:
+                return None
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"Server did not become ready within {timeout}s")
+
+
+async def run_load(client, corpus, parsed, weights, args):
+    rng = random.Random(args.seed)
+    names = list(weights)
+    schedule = rng.choices(names, weights=[weights[n] for n in names], k=max(args.requests, 1))
+    jds = corpus["job_descriptions"]
+    resumes = corpus["resumes"]
+    samples = []
+    counter = iter(range(10 ** 12))
+    deadline = time.monotonic() + args.duration if args.duration else None
+
+    def build_request(i, name):
+        if name == "parse":
+            resume = resumes[i % len(resumes)]
+            files = {"file": (resume["name"], resume["content"], MIME_TYPES[resume["format"]])}
+            return {"files": files}
+        if name == "ats":
+            job_description = jds[i % len(jds)]
+            if args.unique_jd:
+                # Defeat the ATS result cache to measure raw scoring cost
+                job_description += f" (request {i})"
+            return {"json": {"parsed_resume": parsed[i % len(parsed)], "job_description": job_description}}
+        if name == "ask":
+            return {"json": {"question": QUESTIONS[i % len(QUESTIONS)]}}
+        return {"json": {"parsed_resume": parsed[i % len(parsed)]}}
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if deadline is None and i >= len(schedule):
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            name = schedule[i % len(schedule)]
+            start = time.perf_counter()
+            status, error = 0, None
+            try:
+                response = await client.post(ENDPOINTS[name], timeout=args.timeout, **build_request(i, name))
+                status = response.status_code
+                if status >= 400:
+                    error = f"HTTP {status}"
+            except httpx.HTTPError as e:
+                error = type(e).__name__
+            samples.append((name, status, time.perf_counter() - start, error))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def run(args):
+    weights = parse_mix(args.mix)
+    corpus = generate_corpus(args.resumes, args.job_descriptions, args.seed)
+    parsed = parse_corpus_locally(corpus) if {"ats", "enhance"} & set(weights) else []
+    if {"ats", "enhance"} & set(weights) and not parsed:
+        raise SystemExit("Could not parse the synthetic corpus locally (is pypdf installed?)")
+
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url) as client:
+            ready = await wait_until_ready(client, args.ready_timeout)
+            report = await run_load(client, corpus, parsed, weights, args)
+    else:
+        os.environ.setdefault("RAG_LLM", "fake")
+        sys.path.insert(0, os.path.join(ROOT_DIR, "backend_api"))
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        # Run startup/shutdown (warmup, executors) around the test
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                ready = await wait_until_ready(client, args.ready_timeout)
+                report = await run_load(client, corpus, parsed, weights, args)
+
+    report["config"] = {
+        "target": args.base_url or "in-process",
+        "mix": weights,
+        "concurrency": args.concurrency,
+        "requests": None if args.duration else args.requests,
+        "duration_s": args.duration,
+        "seed": args.seed,
+        "resumes": args.resumes,
+        "job_descriptions": args.job_descriptions,
+        "unique_jd": args.unique_jd,
+    }
+    if ready:
+        report["warmup"] = ready
+    return report
+
+
+def compare(report, baseline, threshold):
+    """List regressions: p95 latency or throughput worse than threshold, or more errors"""
+    regressions = []
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+        if current["error_rate"] > previous["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {previous['error_rate']} -> {current['error_rate']}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Load test the Resume ATS API")
+    arg_parser.add_argument("--base-url", help="Target a running server instead of the in-process app")
+    arg_parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Endpoint weights (default {DEFAULT_MIX})")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    arg_parser.add_argument("--requests", type=int, default=200, help="Total requests (ignored with --duration)")
+    arg_parser.add_argument("--duration", type=float, help="Run for this many seconds instead")
+    arg_parser.add_argument("--resumes", type=int, default=40, help="Synthetic resumes in the corpus")
+    arg_parser.add_argument("--job-descriptions", type=int, default=15, help="Synthetic JDs in the corpus")
+    arg_parser.add_argument("--seed", type=int, default=7, help="Corpus and schedule seed")
+    arg_parser.add_argument("--unique-jd", action="store_true", help="Make every ATS request a cache miss")
+    arg_parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout (s)")
+    arg_parser.add_argument("--ready-timeout", type=float, default=600.0, help="Max wait for /ready (s)")
+    add_report_arguments(arg_parser, threshold=0.2)
+    args = arg_parser.parse_args()
+
+    report_and_compare(args, lambda: asyncio.run(run(args)), compare)
+
+
+if __name__ == "__main__":
+    main()
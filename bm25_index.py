@@ -0,0 +1,155 @@
+"""
+BM25 Index Module
+Lightweight on-disk inverted index for exact-term retrieval over knowledge base chunks
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'can', 'do', 'does',
+    'for', 'from', 'has', 'have', 'how', 'i', 'if', 'in', 'is', 'it', 'its', 'my',
+    'of', 'on', 'or', 'should', 'that', 'the', 'their', 'this', 'to', 'was', 'what',
+    'when', 'which', 'who', 'why', 'will', 'with', 'you', 'your'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into index terms"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class BM25Index:
+    """Okapi BM25 inverted index persisted as JSON next to the vector store"""
+
+    VERSION = 1
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # chunk_id -> {'len': document length, 'tf': {term: count}}
+        self.docs: Dict[str, Dict] = {}
+        # term -> {chunk_id: count}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @classmethod
+    def load(cls, index_path: str) -> "BM25Index":
+        """
+        Load an index from disk (an empty index is returned if the file is missing)
+
+        Args:
+            index_path: Path to the index JSON file
+
+        Returns:
+            BM25Index instance
+        """
+        if not os.path.exists(index_path):
+            return cls()
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        index = cls(k1=data.get('k1', 1.5), b=data.get('b', 0.75))
+        for chunk_id, doc in data.get('docs', {}).items():
+            index._insert(chunk_id, doc['tf'], doc['len'])
+        return index
+
+    def save(self, index_path: str):
+        """Write the index atomically"""
+        os.makedirs(os.path.dirname(index_path) or '.', exist_ok=True)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'k1': self.k1, 'b': self.b, 'docs': self.docs}, f)
+        os.replace(tmp_path, index_path)
+
+    def add_documents(self, documents: Iterable[Tuple[str, str]]):
+        """
+        Index (or re-index) documents
+
+        Args:
+            documents: Iterable of (chunk_id, text) pairs
+        """
+        for chunk_id, text in documents:
+            self.remove_documents([chunk_id])
+            terms = tokenize(text)
+            self._insert(chunk_id, dict(Counter(terms)), len(terms))
+
+    def remove_documents(self, chunk_ids: Iterable[str]):
+        """Remove documents from the index"""
+        for chunk_id in chunk_ids:
+            doc = self.docs.pop(chunk_id, None)
+            if doc is None:
+                continue
+            self.total_length -= doc['len']
+            for term in doc['tf']:
+                posting = self.postings.get(term)
+                if posting is not None:
+                    posting.pop(chunk_id, None)
+                    if not posting:
+                        del self.postings[term]
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank documents for a query
+
+        Args:
+            query: Free-text query
+            k: Number of results to return
+
+        Returns:
+            List of (chunk_id, score) pairs, best first
+        """
+        n_docs = len(self.docs)
+        if n_docs == 0:
+            return []
+
+        avg_length = self.total_length / n_docs or 1.0
+        scores: Dict[str, float] = {}
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for chunk_id, tf in posting.items():
+                doc_length = self.docs[chunk_id]['len']
+                norm = tf + self.k1 * (1 - self.b + self.b * doc_length / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def _insert(self, chunk_id: str, tf: Dict[str, int], length: int):
+        self.docs[chunk_id] = {'len': length, 'tf': tf}
+        self.total_length += length
+        for term, count in tf.items():
+            self.postings.setdefault(term, {})[chunk_id] = count
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse several ranked ID lists with reciprocal rank fusion
+
+    Args:
+        rankings: Ranked lists of IDs, best first
+        k: RRF damping constant
+
+    Returns:
+        List of (id, fused score) pairs, best first
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking):
+            fused[item_id] = fused.get(item_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,122 @@
+"""
+DOCX Extractor Module
+Streams text out of a DOCX (OOXML zip) with expat, without building the python-docx
+object model; covers body paragraphs, tables, text boxes, headers and footers
+"""
+
+import re
+import zipfile
+from typing import BinaryIO, Dict, List, Tuple, Union
+from xml.parsers import expat
+
+# Transitional (Word default) and Strict WordprocessingML
+WORD_NAMESPACES = (
+    "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "http://purl.oclc.org/ooxml/wordprocessingml/main",
+)
+_MARKUP_COMPATIBILITY = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+_HEADER_PART = re.compile(r"word/header\d*\.xml$")
+_FOOTER_PART = re.compile(r"word/footer\d*\.xml$")
+
+# Read in chunks so a large document.xml is never held decompressed in memory
+_CHUNK_SIZE = 64 * 1024
+
+
+class _PartText:
+    """expat handlers that collect one paragraph per w:p (table cells and text boxes included)"""
+
+    def __init__(self):
+        self.paragraphs: List[str] = []
+        self._runs: List[str] = []
+        self._in_text = 0
+        # Depth inside mc:Fallback, which repeats the mc:Choice content (e.g. VML text boxes)
+        self._skip = 0
+
+    def start(self, name: str, attrs):
+        namespace, _, tag = name.rpartition(" ")
+        if namespace == _MARKUP_COMPATIBILITY and tag == "Fallback":
+            self._skip += 1
+        if self._skip or namespace not in WORD_NAMESPACES:
+            return
+        if tag == "t":
+            self._in_text += 1
+        elif tag == "tab":
+            self._runs.append("\t")
+        elif tag in ("br", "cr"):
+            self._runs.append("\n")
+        elif tag == "noBreakHyphen":
+            self._runs.append("-")
+
+    def end(self, name: str):
+        namespace, _, tag = name.rpartition(" ")
+        if namespace == _MARKUP_COMPATIBILITY and tag == "Fallback":
+            self._skip -= 1
+            return
+        if self._skip or namespace not in WORD_NAMESPACES:
+            return
+        if tag == "t":
+            self._in_text -= 1
+        elif tag == "p":
+            self.paragraphs.append("".join(self._runs))
+            self._runs = []
+
+    def characters(self, data: str):
+        if self._in_text and not self._skip:
+            self._runs.append(data)
+
+
+def _part_paragraphs(archive: zipfile.ZipFile, name: str) -> List[str]:
+    handler = _PartText()
+    parser = expat.ParserCreate(namespace_separator=" ")
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start
+    parser.EndElementHandler = handler.end
+    parser.CharacterDataHandler = handler.characters
+    with archive.open(name) as part:
+        while True:
+            chunk = part.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.Parse(chunk, False)
+    parser.Parse(b"", True)
+    return handler.paragraphs
+
+
+def extract_docx_text(source: Union[str, BinaryIO]) -> Tuple[str, Dict[str, int]]:
+    """
+    Extract the text of a DOCX file in reading order
+
+    Header text comes first (it usually holds the name and contact details),
+    then the body, then footers. Headers and footers that repeat across
+    document sections are included once.
+
+    Args:
+        source: Path or binary file object of the .docx
+
+    Returns:
+        (text with one line per paragraph, {'paragraphs': ..., 'parts': ...})
+
+    Raises:
+        zipfile.BadZipFile, KeyError (no word/document.xml) or
+        xml.parsers.expat.ExpatError for files that are not valid DOCX
+    """
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        headers = sorted(name for name in names if _HEADER_PART.match(name))
+        footers = sorted(name for name in names if _FOOTER_PART.match(name))
+
+        paragraphs: List[str] = []
+        parts = 0
+        seen = set()
+        for name in headers + ["word/document.xml"] + footers:
+            part_paragraphs = _part_paragraphs(archive, name)
+            if name != "word/document.xml":
+                key = tuple(part_paragraphs)
+                if not any(part_paragraphs) or key in seen:
+                    continue
+                seen.add(key)
+            paragraphs.extend(part_paragraphs)
+            parts += 1
+
+    return "\n".join(paragraphs), {'paragraphs': len(paragraphs), 'parts': parts}
@@ -0,0 +1,169 @@
+"""
+Enhancement Content Repository Module
+Serves the Firestore resume-enhancement documents from an in-process cache
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import metrics
+import tracing
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'enhancement_snapshot.json'
+)
+
+
+class EnhancementContentRepository:
+    """
+    Cached access to the ``resume_enhancements`` Firestore collection
+
+    The Firebase client is initialised once, the three enhancement documents
+    are fetched with a single batched ``get_all``, and the result is kept in
+    memory for ``ttl_seconds``. Stale content is served while a background
+    thread refreshes it, and a local snapshot file is used when Firestore is
+    unreachable, so a lookup never waits on the network after warmup.
+    """
+
+    COLLECTION = 'resume_enhancements'
+    DOCUMENTS = ('best_practices', 'action_verbs', 'quantifiable_templates')
+
+    def __init__(self, credentials_loader: Callable[[], Optional[Dict]], ttl_seconds: float = 600,
+                 snapshot_path: str = DEFAULT_SNAPSHOT_PATH):
+        """
+        Args:
+            credentials_loader: Returns the Firebase service account dict (called once)
+            ttl_seconds: How long fetched content is considered fresh
+            snapshot_path: Local JSON file used as fallback and written after each fetch
+        """
+        self._credentials_loader = credentials_loader
+        self.ttl_seconds = ttl_seconds
+        self.snapshot_path = snapshot_path
+        self._db = None
+        self._client_error = None
+        self._content: Optional[Dict] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        # Set once the first fetch attempt finished (successfully or not)
+        self._first_fetch = threading.Event()
+        self._refreshing = False
+
+    def start(self):
+        """Load the snapshot immediately and refresh from Firestore in the background"""
+        if self._content is None:
+            self._content = self._load_snapshot()
+        self._refresh_async()
+
+    def get(self, wait: float = 0) -> Dict:
+        """
+        Return enhancement content
+
+        Args:
+            wait: Seconds to block for the first Firestore fetch when there is
+                nothing to serve yet (no snapshot). Keep 0 on the event loop;
+                synchronous callers such as the Streamlit app can wait.
+
+        Returns:
+            Dictionary with best_practices (dict), action_verbs (list),
+            quantifiable_templates (list) and source ('firestore', 'snapshot' or 'empty')
+        """
+        if self._content is None:
+            self._content = self._load_snapshot()
+        # Never fetches inline (callers run on the event loop): until the first
+        # fetch lands, an empty result tells the caller to use its fallback
+        if time.time() - self._fetched_at > self.ttl_seconds:
+            self._refresh_async()
+        if wait > 0 and self._content['source'] == 'empty':
+            self._first_fetch.wait(wait)
+        return self._content
+
+    def refresh(self) -> bool:
+        """Fetch the documents from Firestore; returns True on success"""
+        try:
+            with tracing.span('firestore.get_all', collection=self.COLLECTION, documents=len(self.DOCUMENTS)), \
+                    metrics.timed(metrics.FIRESTORE_FETCH_SECONDS, collection=self.COLLECTION):
+                db = self._get_client()
+                collection = db.collection(self.COLLECTION)
+                refs = [collection.document(name) for name in self.DOCUMENTS]
+                snapshots = {snap.id: (snap.to_dict() or {}) for snap in db.get_all(refs) if snap.exists}
+        except Exception as e:
+            logger.warning("Enhancement content refresh failed: %s", e)
+            # Retry after another TTL instead of on every call
+            self._fetched_at = time.time()
+            self._first_fetch.set()
+            return False
+
+        content = {
+            'best_practices': snapshots.get('best_practices', {}),
+            'action_verbs': snapshots.get('action_verbs', {}).get('verbs', []),
+            'quantifiable_templates': snapshots.get('quantifiable_templates', {}).get('templates', []),
+            'source': 'firestore'
+        }
+        self._content = content
+        self._fetched_at = time.time()
+        self._first_fetch.set()
+        self._save_snapshot(content)
+        return True
+
+    def _refresh_async(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="enhancement-refresh", daemon=True).start()
+
+    def _get_client(self):
+        if self._db is not None:
+            return self._db
+        if self._client_error is not None:
+            raise self._client_error
+
+        try:
+            import firebase_admin
+            from firebase_admin import credentials, firestore
+
+            if not firebase_admin._apps:
+                firebase_creds = self._credentials_loader()
+                if not firebase_creds:
+                    raise ValueError("Firebase credentials not found")
+                firebase_admin.initialize_app(credentials.Certificate(firebase_creds))
+            self._db = firestore.client()
+        except (ImportError, ValueError) as e:
+            # Missing package or credentials will not fix themselves at runtime
+            self._client_error = e
+            raise
+        return self._db
+
+    def _load_snapshot(self) -> Dict:
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            content['source'] = 'snapshot'
+            return content
+        except (OSError, ValueError):
+            return {'best_practices': {}, 'action_verbs': [], 'quantifiable_templates': [], 'source': 'empty'}
+
+    def _save_snapshot(self, content: Dict):
+        try:
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({k: v for k, v in content.items() if k != 'source'}, f, indent=2)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning("Could not write enhancement snapshot: %s", e)
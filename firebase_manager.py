@@ -97,6 +97,31 @@ class FirebaseManager:
             print(f"❌ List failed: {e}")
             return []
     
+    def list_pdf_blobs(self, prefix: str = "knowledge_base/") -> List[Dict]:
+        """
+        List all PDFs with the storage metadata needed for incremental sync
+        
+        Args:
+            prefix: Folder prefix to search in
+            
+        Returns:
+            List of dicts with name, generation, md5_hash and size
+        """
+        try:
+            blobs = self.bucket.list_blobs(prefix=prefix)
+            return [
+                {
+                    'name': blob.name,
+                    'generation': str(blob.generation or ""),
+                    'md5_hash': blob.md5_hash or "",
+                    'size': blob.size or 0
+                }
+                for blob in blobs if blob.name.endswith('.pdf')
+            ]
+        except Exception as e:
+            print(f"❌ List failed: {e}")
+            return []
+    
     def download_all_pdfs(self, storage_prefix: str = "knowledge_base/", local_dir: str = "./knowledge_base") -> int:
         """
         Download all PDFs from a folder in Firebase Storage
@@ -0,0 +1,89 @@
+"""
+Knowledge Base Manifest Module
+Tracks which source PDFs are ingested into ChromaDB and the chunk IDs they produced
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+
+class IngestionManifest:
+    """Persistent record of ingested knowledge base sources"""
+
+    VERSION = 1
+
+    def __init__(self, manifest_path: str):
+        """
+        Load the manifest from disk (an empty manifest is used if the file is missing)
+
+        Args:
+            manifest_path: Path to the manifest JSON file
+        """
+        self.manifest_path = manifest_path
+        self.entries: Dict[str, Dict] = {}
+        self.existed = os.path.exists(manifest_path)
+
+        if self.existed:
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.entries = data.get('sources', {})
+            except Exception as e:
+                print(f"⚠️ Could not read manifest {manifest_path}: {e}")
+                self.entries = {}
+
+    def sources(self) -> List[str]:
+        """Return the storage paths of all ingested sources"""
+        return list(self.entries.keys())
+
+    def get(self, source: str) -> Optional[Dict]:
+        """Return the manifest entry for a source, if any"""
+        return self.entries.get(source)
+
+    def get_chunk_ids(self, source: str) -> List[str]:
+        """Return the chunk IDs stored for a source"""
+        entry = self.entries.get(source)
+        return list(entry.get('chunk_ids', [])) if entry else []
+
+    def is_current(self, source: str, md5_hash: str, generation: str = "") -> bool:
+        """
+        Check whether a source is already ingested with the same content
+
+        The MD5 hash is authoritative; the generation is only used when
+        the storage backend did not report a hash.
+        """
+        entry = self.entries.get(source)
+        if not entry:
+            return False
+        if md5_hash:
+            return entry.get('md5_hash') == md5_hash
+        return bool(generation) and entry.get('generation') == generation
+
+    def record(self, source: str, md5_hash: str, generation: str, chunk_ids: List[str]):
+        """Record (or replace) the ingestion result for a source"""
+        self.entries[source] = {
+            'md5_hash': md5_hash,
+            'generation': generation,
+            'chunk_ids': list(chunk_ids),
+            'ingested_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }
+
+    def update_generation(self, source: str, generation: str):
+        """Refresh the stored generation of an unchanged source"""
+        if source in self.entries:
+            self.entries[source]['generation'] = generation
+
+    def remove(self, source: str):
+        """Forget a source"""
+        self.entries.pop(source, None)
+
+    def save(self):
+        """Write the manifest atomically so an interrupted sync never corrupts it"""
+        os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'sources': self.entries}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self.existed = True
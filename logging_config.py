@@ -0,0 +1,170 @@
+"""
+Logging Config Module
+Structured, level-controlled logging: callers only enqueue records and a background
+listener thread formats and writes them, so request threads never block on stdout
+
+Levels:
+    LOG_LEVEL=INFO                                    default for every module
+    LOG_LEVELS=resume_parser=DEBUG,rag_utility=WARNING   per-module overrides
+
+Use %-style arguments so disabled levels cost nothing:
+    logger.debug("Page %d: extracted %d chars", page, len(page_text))
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+# text or json (one object per line)
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").lower()
+# Records beyond this are dropped (and counted) instead of blocking the caller
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    'message', 'asctime', 'request_id', 'endpoint'
+}
+
+_lock = threading.Lock()
+_handler: Optional["NonBlockingQueueHandler"] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _extra_fields(record: logging.LogRecord) -> Dict:
+    return {key: value for key, value in vars(record).items() if key not in _STANDARD_ATTRS}
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request ID (trace ID) and endpoint of the calling context"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        import metrics
+        import tracing
+        record.request_id = tracing.request_id() or "-"
+        record.endpoint = metrics.current_endpoint.get()
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """'time LEVEL logger [request_id] message key=value ...'"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extra = _extra_fields(record)
+        if extra:
+            fields = " ".join(f"{key}={value}" for key, value in extra.items())
+            # Keep the traceback (if any) last
+            head, sep, tail = line.partition("\n")
+            line = f"{head} {fields}{sep}{tail}"
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; `extra` fields become top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'endpoint': getattr(record, 'endpoint', 'none'),
+            'pid': record.process,
+            'thread': record.threadName,
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking or raising"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now (they may not survive the thread hop),
+        # but leave the formatting of the line itself to the listener thread
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            import metrics
+            metrics.observe(metrics.LOG_RECORDS_DROPPED, 1, 'dropped', level=record.levelname)
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for part in spec.split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _start_listener():
+    global _listener
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if LOG_FORMAT == 'json' else TextFormatter())
+    _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = logging.handlers.QueueListener(_handler.queue, stream)
+    _listener.start()
+
+
+def _after_fork_in_child():
+    # The listener thread does not survive fork (pre-fork workers, parse pool);
+    # give the child a fresh queue and thread
+    if _handler is not None:
+        _start_listener()
+
+
+def _stop_listener():
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+
+
+def configure_logging():
+    """Install the queue handler on the root logger and apply levels (idempotent)"""
+    global _handler
+    with _lock:
+        if _handler is not None:
+            return
+        root = logging.getLogger()
+        root.setLevel(LOG_LEVEL)
+        for name, level in _parse_levels(LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        _handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        _handler.addFilter(RequestContextFilter())
+        root.addHandler(_handler)
+        _start_listener()
+        if hasattr(os, "register_at_fork"):
+            # POSIX only; without fork there is no dead listener thread to replace
+            os.register_at_fork(after_in_child=_after_fork_in_child)
+        # Flush queued records on interpreter exit
+        atexit.register(_stop_listener)
@@ -0,0 +1,257 @@
+"""
+Metrics Module
+In-process counters and latency histograms rendered in the Prometheus text format
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:
+    Embeddings = object
+
+# Endpoint of the request being served; set by the API middleware
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="none")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+_local = threading.local()
+logger = logging.getLogger(__name__)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Dict[str, str]):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [bucket counts..., sum, count]
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        for key, series in items:
+            labels = list(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', repr(float(bound)))])} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by label values"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Dict[str, str]):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(list(zip(self.labelnames, key)))} {value}")
+        return lines
+
+
+class Registry:
+    """Holds the metrics and gauge callbacks exposed on /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._gauge_callbacks: List[Callable[[], Iterable[Tuple[str, str, Dict[str, str], float]]]] = []
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        labelnames = tuple(labelnames) + ('endpoint', 'outcome')
+        metric = self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        labelnames = tuple(labelnames) + ('endpoint', 'outcome')
+        metric = self._metrics[name] = Counter(name, documentation, labelnames)
+        return metric
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def register_gauges(self, callback: Callable[[], Iterable[Tuple[str, str, Dict[str, str], float]]]):
+        """
+        Register a callback evaluated at scrape time
+
+        Args:
+            callback: Returns (name, help, labels, value) tuples
+        """
+        self._gauge_callbacks.append(callback)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        gauges: Dict[str, Tuple[str, List[str]]] = {}
+        for callback in self._gauge_callbacks:
+            try:
+                samples = list(callback())
+            except Exception as e:
+                logger.warning("Metrics gauge callback failed: %s", e)
+                continue
+            for name, documentation, labels, value in samples:
+                entry = gauges.setdefault(name, (documentation, []))
+                entry[1].append(f"{name}{_format_labels(sorted(labels.items()))} {value}")
+        for name, (documentation, samples) in gauges.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Stage metrics; every series also carries endpoint and outcome labels
+TEXT_EXTRACTION_SECONDS = REGISTRY.histogram(
+    "resume_text_extraction_seconds", "Resume text extraction time per backend", ['backend'])
+ANALYSIS_SECONDS = REGISTRY.histogram(
+    "resume_analysis_seconds", "Section and keyword analysis time", ['stage'])
+EMBEDDING_SECONDS = REGISTRY.histogram(
+    "embedding_seconds", "Embedding call latency", ['operation'])
+EMBEDDING_BATCH_SIZE = REGISTRY.histogram(
+    "embedding_batch_size", "Texts embedded per call", ['operation'], buckets=SIZE_BUCKETS)
+VECTOR_SEARCH_SECONDS = REGISTRY.histogram(
+    "vector_search_seconds", "Knowledge base retrieval latency", ['backend', 'mode'])
+LLM_SECONDS = REGISTRY.histogram(
+    "llm_request_seconds", "LLM call latency", ['model'])
+FIRESTORE_FETCH_SECONDS = REGISTRY.histogram(
+    "firestore_fetch_seconds", "Firestore read latency", ['collection'])
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_seconds", "API request latency", ['method'])
+
+# Counters (observe with value 1); the outcome label carries the result
+TEXT_EXTRACTION_TOTAL = REGISTRY.counter(
+    "resume_text_extraction_total", "Text extraction attempts per backend (ok, empty, error)", ['backend'])
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full", ['level'])
+
+def observe(metric, value: float, outcome: str = "ok", **labels):
+    """
+    Record one observation, labelled with the current endpoint
+
+    Inside capture() the observation is buffered instead, so worker processes
+    can hand it back to the API process.
+    """
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is not None:
+        buffer.append((metric.name, value, outcome, labels))
+        return
+    labels['outcome'] = outcome
+    labels.setdefault('endpoint', current_endpoint.get())
+    metric.observe(value, labels)
+
+
+@contextmanager
+def timed(metric, **labels):
+    """
+    Time a block; the yielded dict may set 'outcome' (defaults to ok, or error on exception)
+
+    Example:
+        with metrics.timed(metrics.TEXT_EXTRACTION_SECONDS, backend='pypdf') as span:
+            text = extract()
+            if not text:
+                span['outcome'] = 'empty'
+    """
+    span = {'outcome': 'ok'}
+    start = time.perf_counter()
+    try:
+        yield span
+    except BaseException:
+        span['outcome'] = 'error'
+        raise
+    finally:
+        observe(metric, time.perf_counter() - start, span['outcome'], **labels)
+
+
+@contextmanager
+def capture():
+    """Buffer observations made by this thread; yields the list of buffered samples"""
+    previous = getattr(_local, 'buffer', None)
+    _local.buffer = []
+    try:
+        yield _local.buffer
+    finally:
+        _local.buffer = previous
+
+
+def replay(samples: Optional[List]):
+    """Record samples buffered by capture(), e.g. in a worker process"""
+    for name, value, outcome, labels in samples or []:
+        metric = REGISTRY.get(name)
+        if metric is not None:
+            observe(metric, value, outcome, **labels)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+class InstrumentedEmbeddings(Embeddings):
+    """Embeddings wrapper recording batch size and latency of every call"""
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined here (e.g. the sentence-transformers client)
+        return getattr(self.wrapped, name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        observe(EMBEDDING_BATCH_SIZE, len(texts), operation='documents')
+        with timed(EMBEDDING_SECONDS, operation='documents'):
+            return self.wrapped.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        observe(EMBEDDING_BATCH_SIZE, 1, operation='query')
+        with timed(EMBEDDING_SECONDS, operation='query'):
+            return self.wrapped.embed_query(text)
@@ -6,6 +6,8 @@ class ApiConfig {
   // Endpoints
   static const String parseResume = '/api/parse-resume';
   static const String calculateATS = '/api/calculate-ats';
+  static const String analyze = '/api/analyze';
+  static const String analyzeLookup = '/api/analyze/lookup';
   static const String askQuestion = '/api/ask-question';
   static const String enhanceResume = '/api/enhance-resume';
   
@@ -51,14 +51,14 @@ class _AnalyzeScreenState extends ConsumerState<AnalyzeScreen> {
     try {
       final apiService = ref.read(apiServiceProvider);
       
-      // Parse resume
-      final parsed = await apiService.parseResume(_filePath!);
-      
-      // Calculate ATS score
-      final atsResult = await apiService.calculateATSScore(
-        parsed,
+      // Parse and score the resume in a single request
+      // (skips the upload when the server already parsed this file)
+      final analysis = await apiService.analyzeResume(
+        _filePath!,
         _jobDescController.text.trim(),
       );
+      final parsed = analysis.parsedResume;
+      final atsResult = analysis.atsResult;
 
       if (!mounted) return;
 
@@ -1,3 +1,6 @@
+import 'dart:io';
+
+import 'package:crypto/crypto.dart';
 import 'package:dio/dio.dart';
 import 'package:flutter_riverpod/flutter_riverpod.dart';
 import '../config/api_config.dart';
@@ -58,6 +61,67 @@ class ApiService {
     }
   }
 
+  // Parse and score in one round trip (raw resume text is not returned).
+  // The file's SHA-256 is sent first; it is only uploaded if the server
+  // has not parsed the same file before.
+  Future<({Map<String, dynamic> parsedResume, ATSResult atsResult})> analyzeResume(
+    String filePath,
+    String jobDescription,
+  ) async {
+    try {
+      final cached = await _lookupAnalysis(filePath, jobDescription);
+      if (cached != null) {
+        return cached;
+      }
+
+      FormData formData = FormData.fromMap({
+        'file': await MultipartFile.fromFile(filePath),
+        'job_description': jobDescription,
+      });
+
+      final response = await _dio.post(
+        ApiConfig.analyze,
+        data: formData,
+      );
+
+      return (
+        parsedResume: Map<String, dynamic>.from(response.data['parsed_resume']),
+        atsResult: ATSResult.fromJson(response.data['ats_result']),
+      );
+    } on DioException catch (e) {
+      throw _handleError(e);
+    }
+  }
+
+  // Hash-first negotiation; returns null when the file has to be uploaded
+  Future<({Map<String, dynamic> parsedResume, ATSResult atsResult})?> _lookupAnalysis(
+    String filePath,
+    String jobDescription,
+  ) async {
+    try {
+      final digest = await sha256.bind(File(filePath).openRead()).first;
+
+      final response = await _dio.post(
+        ApiConfig.analyzeLookup,
+        data: {
+          'sha256': digest.toString(),
+          'job_description': jobDescription,
+        },
+      );
+
+      if (response.data['cached'] != true) {
+        return null;
+      }
+      return (
+        parsedResume: Map<String, dynamic>.from(response.data['parsed_resume']),
+        atsResult: ATSResult.fromJson(response.data['ats_result']),
+      );
+    } on DioException {
+      // Older servers without the lookup endpoint: fall back to uploading
+      return null;
+    }
+  }
+
   // Ask Question (RAG)
   Future<String> askQuestion(String question) async {
     try {
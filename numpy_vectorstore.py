@@ -0,0 +1,214 @@
+"""
+NumPy Vector Store Module
+Brute-force, memory-mapped vector store for the small resume-advice knowledge base
+
+The collection is exported once to an ``embeddings.npy`` matrix of
+L2-normalised vectors plus a ``metadata.json`` sidecar. Loading maps the
+matrix read-only, so it takes milliseconds and every API worker shares the
+same page-cache pages; a query is a single matrix-vector product.
+"""
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+POINTER_FILE = "current.json"
+MATRIX_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.json"
+
+
+def export_numpy_index(index_dir: str, ids: List[str], embeddings: Iterable, documents: List[str],
+                       metadatas: List[Dict], dtype: str = "float32", keep_versions: int = 2) -> str:
+    """
+    Write a new index version and atomically switch the pointer to it
+
+    Args:
+        index_dir: Root directory of the NumPy index
+        ids: Chunk IDs
+        embeddings: Embedding vectors, one per chunk
+        documents: Chunk texts
+        metadatas: Chunk metadata dicts
+        dtype: "float32" or "float16" (halves disk and page-cache size)
+        keep_versions: Number of index versions to keep on disk
+
+    Returns:
+        Path of the written version directory
+    """
+    matrix = np.asarray(list(embeddings), dtype=np.float32)
+    if not len(ids) and matrix.size == 0:
+        # Every source was removed: publish an empty index rather than keep serving stale chunks
+        matrix = matrix.reshape(0, matrix.shape[-1] if matrix.ndim == 2 else 0)
+    if matrix.ndim != 2 or len(matrix) != len(ids):
+        raise ValueError("Expected one embedding vector per chunk")
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+
+    version = f"v{int(time.time() * 1000)}"
+    version_dir = os.path.join(index_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    np.save(os.path.join(version_dir, MATRIX_FILE), matrix.astype(dtype))
+    with open(os.path.join(version_dir, METADATA_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            'ids': list(ids),
+            'documents': list(documents),
+            'metadatas': [m or {} for m in metadatas],
+            'dtype': dtype,
+            'dim': int(matrix.shape[1]) if len(matrix) else 0
+        }, f)
+
+    # Readers only ever follow the pointer, so they never see a half-written version
+    tmp_pointer = os.path.join(index_dir, f"{POINTER_FILE}.tmp")
+    with open(tmp_pointer, 'w', encoding='utf-8') as f:
+        json.dump({'version': version}, f)
+    os.replace(tmp_pointer, os.path.join(index_dir, POINTER_FILE))
+
+    versions = sorted(d for d in os.listdir(index_dir) if d.startswith('v') and os.path.isdir(os.path.join(index_dir, d)))
+    for old in versions[:-keep_versions]:
+        shutil.rmtree(os.path.join(index_dir, old), ignore_errors=True)
+
+    return version_dir
+
+
+def current_version(index_dir: str) -> Optional[str]:
+    """Return the version the index pointer refers to, if any"""
+    try:
+        with open(os.path.join(index_dir, POINTER_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f).get('version')
+    except (OSError, ValueError):
+        return None
+
+
+class NumpyVectorStore(VectorStore):
+    """Read-only vector store answering top-k and MMR queries with one matrix-vector product"""
+
+    def __init__(self, index_dir: str, embedding_function: Embeddings):
+        """
+        Map the current index version
+
+        Args:
+            index_dir: Root directory of the NumPy index
+            embedding_function: Embedding model used for queries
+        """
+        self.version = current_version(index_dir)
+        if not self.version:
+            raise FileNotFoundError(f"No NumPy index found in {index_dir}")
+
+        version_dir = os.path.join(index_dir, self.version)
+        with open(os.path.join(version_dir, METADATA_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        self.index_dir = index_dir
+        self._embedding = embedding_function
+        # A zero-length array cannot be memory-mapped
+        self._matrix = np.load(os.path.join(version_dir, MATRIX_FILE), mmap_mode='r' if meta['ids'] else None)
+        self._ids: List[str] = meta['ids']
+        self._documents: List[str] = meta['documents']
+        self._metadatas: List[Dict] = meta['metadatas']
+        self._positions = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self._embedding
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        raise NotImplementedError("NumpyVectorStore is read-only; re-export the Chroma collection instead")
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None,
+                   **kwargs: Any) -> "NumpyVectorStore":
+        raise NotImplementedError("Use export_numpy_index to build a NumpyVectorStore")
+
+    def get(self, ids: Optional[List[str]] = None, include: Optional[List[str]] = None, **kwargs: Any) -> Dict:
+        """Chroma-compatible subset of ``get`` used by the hybrid retriever"""
+        positions = range(len(self._ids)) if ids is None else [
+            self._positions[chunk_id] for chunk_id in ids if chunk_id in self._positions
+        ]
+        include = include or ["documents", "metadatas"]
+        result = {'ids': [self._ids[i] for i in positions]}
+        if "documents" in include:
+            result['documents'] = [self._documents[i] for i in positions]
+        if "metadatas" in include:
+            result['metadatas'] = [self._metadatas[i] for i in positions]
+        if "embeddings" in include:
+            result['embeddings'] = [np.asarray(self._matrix[i], dtype=np.float32) for i in positions]
+        return result
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self._search(self._embed(query), k)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) + 1e-12
+        return [doc for doc, _ in self._search(query, k)]
+
+    def max_marginal_relevance_search(self, query: str, k: int = 4, fetch_k: int = 20,
+                                      lambda_mult: float = 0.5, **kwargs: Any) -> List[Document]:
+        return self._mmr(self._embed(query), k, fetch_k, lambda_mult)
+
+    def max_marginal_relevance_search_by_vector(self, embedding: List[float], k: int = 4, fetch_k: int = 20,
+                                                lambda_mult: float = 0.5, **kwargs: Any) -> List[Document]:
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) + 1e-12
+        return self._mmr(query, k, fetch_k, lambda_mult)
+
+    def _select_relevance_score_fn(self):
+        # Scores are cosine similarities of normalised vectors
+        return lambda score: (score + 1.0) / 2.0
+
+    def _embed(self, query: str) -> np.ndarray:
+        vector = np.asarray(self._embedding.embed_query(query), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) + 1e-12)
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        if not len(self._matrix):
+            return np.empty(0, dtype=np.float32)
+        # The single matrix-vector product over the whole collection
+        return self._matrix @ query.astype(self._matrix.dtype, copy=False)
+
+    def _top(self, scores: np.ndarray, k: int) -> np.ndarray:
+        # Also covers an empty collection (no scores)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.array([], dtype=np.int64)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def _document(self, i: int) -> Document:
+        return Document(id=self._ids[i], page_content=self._documents[i], metadata=self._metadatas[i])
+
+    def _search(self, query: np.ndarray, k: int) -> List[Tuple[Document, float]]:
+        scores = self._scores(query)
+        return [(self._document(i), float(scores[i])) for i in self._top(scores, k)]
+
+    def _mmr(self, query: np.ndarray, k: int, fetch_k: int, lambda_mult: float) -> List[Document]:
+        scores = self._scores(query)
+        candidates = self._top(scores, fetch_k)
+        if len(candidates) == 0:
+            return []
+
+        vectors = np.asarray(self._matrix[candidates], dtype=np.float32)
+        relevance = scores[candidates].astype(np.float32)
+        selected = [0]
+        max_redundancy = vectors @ vectors[0]
+        while len(selected) < min(k, len(candidates)):
+            mmr = lambda_mult * relevance - (1 - lambda_mult) * max_redundancy
+            mmr[selected] = -np.inf
+            best = int(np.argmax(mmr))
+            selected.append(best)
+            max_redundancy = np.maximum(max_redundancy, vectors @ vectors[best])
+
+        return [self._document(int(candidates[i])) for i in selected]
@@ -0,0 +1,174 @@
+"""
+Parsed Resume Module
+Compact, slotted representation of a ResumeParser result for workloads that hold
+many parsed resumes at once (batch jobs, ranking)
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Bit i of ParsedResume.section_flags is set when SECTION_NAMES[i] was detected
+SECTION_NAMES = ('experience', 'education', 'skills', 'summary', 'projects', 'certifications')
+_SECTION_BITS = {name: 1 << i for i, name in enumerate(SECTION_NAMES)}
+
+FIELDS = ('text', 'word_count', 'email', 'phone', 'sections', 'section_spans',
+          'action_verb_count', 'has_quantifiable_results')
+
+
+def encode_sections(sections: Dict[str, bool]) -> int:
+    """Pack a {section: bool} dict into a bitfield (unknown section names are ignored)"""
+    flags = 0
+    for name, present in sections.items():
+        if present and name in _SECTION_BITS:
+            flags |= _SECTION_BITS[name]
+    return flags
+
+
+def decode_sections(flags: int) -> Dict[str, bool]:
+    return {name: bool(flags & bit) for name, bit in _SECTION_BITS.items()}
+
+
+def section_text(text: str, spans: Optional[Dict[str, List[List[int]]]], names: Sequence[str]) -> str:
+    """
+    Text of the named sections, in document order
+    
+    Args:
+        text: Resume text the spans were computed on
+        spans: {section: [[start, end], ...]} from ResumeParser.segment_sections
+        names: Section types to keep
+        
+    Returns:
+        The sections joined by newlines, or the whole text when none of them was found
+    """
+    ranges = sorted(span for name in names for span in (spans or {}).get(name, ()))
+    if not ranges:
+        return text
+    return "\n".join(text[start:end] for start, end in ranges)
+
+
+class ParsedResume:
+    """
+    One parsed resume without a per-instance __dict__
+
+    Section flags are a single int, phone numbers and section spans tuples, and
+    the lowercase text (and section slices) used by the scorers are only built
+    on first use and then reused.
+    Read access mirrors the dict returned by ResumeParser.parse_resume
+    (resume.get('email'), resume['sections'], 'error' in resume), so
+    ATSScorer accepts either; to_dict() gives the plain dict back.
+    """
+
+    __slots__ = ('text', 'word_count', 'email', 'phone', 'section_flags', 'section_spans',
+                 'action_verb_count', 'has_quantifiable_results', '_lower_text', '_lower_sections')
+
+    def __init__(self, text: str, word_count: int, email: str = "", phone: Iterable[str] = (),
+                 section_flags: int = 0, section_spans: Iterable[Tuple[str, int, int]] = (),
+                 action_verb_count: int = 0, has_quantifiable_results: bool = False):
+        self.text = text
+        self.word_count = word_count
+        self.email = email
+        self.phone = tuple(phone)
+        self.section_flags = section_flags
+        # (section, start, end) in document order
+        self.section_spans = tuple(section_spans)
+        self.action_verb_count = action_verb_count
+        self.has_quantifiable_results = has_quantifiable_results
+        self._lower_text: Optional[str] = None
+        self._lower_sections: Optional[Dict[Tuple[str, ...], str]] = None
+
+    @classmethod
+    def from_dict(cls, parsed: Dict) -> "ParsedResume":
+        """Build from a parse_resume dict (must not be an {'error': ...} result)"""
+        return cls(
+            text=parsed.get('text', ''),
+            word_count=parsed.get('word_count', 0),
+            email=parsed.get('email', ''),
+            phone=parsed.get('phone', ()),
+            section_flags=encode_sections(parsed.get('sections', {})),
+            section_spans=sorted(((name, start, end) for name, spans in parsed.get('section_spans', {}).items()
+                                  for start, end in spans), key=lambda span: span[1]),
+            action_verb_count=parsed.get('action_verb_count', 0),
+            has_quantifiable_results=bool(parsed.get('has_quantifiable_results', False))
+        )
+
+    @property
+    def lower_text(self) -> str:
+        """text.lower(), computed once per instance"""
+        if self._lower_text is None:
+            self._lower_text = self.text.lower()
+        return self._lower_text
+
+    @property
+    def sections(self) -> Dict[str, bool]:
+        return decode_sections(self.section_flags)
+
+    @property
+    def spans(self) -> Dict[str, List[List[int]]]:
+        """section_spans in the {section: [[start, end], ...]} form of the parse dict"""
+        spans: Dict[str, List[List[int]]] = {}
+        for name, start, end in self.section_spans:
+            spans.setdefault(name, []).append([start, end])
+        return spans
+
+    def has_section(self, name: str) -> bool:
+        return bool(self.section_flags & _SECTION_BITS.get(name, 0))
+
+    def lower_section_text(self, names: Tuple[str, ...]) -> str:
+        """Lowercase section_text() for names, computed once per instance and names"""
+        if self._lower_sections is None:
+            self._lower_sections = {}
+        lowered = self._lower_sections.get(names)
+        if lowered is None:
+            if any(name in names for name, _, _ in self.section_spans):
+                lowered = "\n".join(self.text[start:end] for name, start, end in self.section_spans
+                                    if name in names).lower()
+            else:
+                lowered = self.lower_text
+            self._lower_sections[names] = lowered
+        return lowered
+
+    def drop_lower_text(self):
+        """Release the cached lowercase views (e.g. after scoring, before long-term storage)"""
+        self._lower_text = None
+        self._lower_sections = None
+
+    def to_dict(self) -> Dict:
+        """The dict ResumeParser.parse_resume returns, for JSON responses and older callers"""
+        return {
+            'text': self.text,
+            'word_count': self.word_count,
+            'email': self.email,
+            'phone': list(self.phone),
+            'sections': self.sections,
+            'section_spans': self.spans,
+            'action_verb_count': self.action_verb_count,
+            'has_quantifiable_results': self.has_quantifiable_results
+        }
+
+    # Read-only mapping access, so code written against the dict keeps working
+
+    def __getitem__(self, key: str):
+        if key not in FIELDS:
+            raise KeyError(key)
+        if key == 'phone':
+            return list(self.phone)
+        if key == 'section_spans':
+            return self.spans
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return self[key] if key in FIELDS else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in FIELDS
+
+    def keys(self) -> Tuple[str, ...]:
+        return FIELDS
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ParsedResume):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (f"ParsedResume(word_count={self.word_count}, email={self.email!r}, "
+                f"sections={[name for name in SECTION_NAMES if self.has_section(name)]})")
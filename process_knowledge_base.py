@@ -1,63 +1,170 @@
 """
 Process Knowledge Base
 Downloads PDFs from Firebase and processes them into ChromaDB
+
+Ingestion is incremental: an ingestion manifest next to the vector store
+records the storage MD5/generation and the chunk IDs of every source PDF,
+so a sync only downloads and embeds new or changed files and deletes the
+chunks of files that were removed from storage. A BM25 keyword index is
+kept in step with the collection for hybrid retrieval, and with the
+"numpy" vector backend a memory-mapped export is republished on change.
 """
 
 from firebase_utils import init_firebase_from_secrets
-from rag_utility import process_document_to_chroma_db
+from kb_manifest import IngestionManifest
+from rag_utility import (
+    process_document_to_chroma_db,
+    delete_chunks_from_chroma_db,
+    delete_unmanaged_chunks,
+    rebuild_bm25_index,
+    export_numpy_vectorstore,
+    manifest_path,
+    bm25_index_path,
+    numpy_index_path,
+    vector_backend
+)
+from numpy_vectorstore import current_version
+from logging_config import configure_logging
 import os
 import tempfile
+import time
+
+# Ingestion progress from rag_utility is logged at INFO
+configure_logging()
 
-def process_knowledge_base():
+def process_knowledge_base(force: bool = False):
     """
-    Download PDFs from Firebase and process into ChromaDB vector store
+    Sync PDFs from Firebase into the ChromaDB vector store
+
+    Args:
+        force: Re-embed every PDF even if the manifest says it is unchanged
+
+    Returns:
+        Dictionary with counts of added, updated, removed, unchanged and failed files
     """
+    start_total = time.time()
+    summary = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'failed': 0}
+
     # Initialize Firebase
     print("🔥 Initializing Firebase...")
     firebase_manager = init_firebase_from_secrets()
-    
-    # List available PDFs
+
+    # List available PDFs together with their content hashes
     print("📄 Fetching PDF list...")
-    pdf_files = firebase_manager.list_pdfs("knowledge_base/")
-    
-    if not pdf_files:
+    pdf_blobs = firebase_manager.list_pdf_blobs("knowledge_base/")
+
+    if not pdf_blobs:
+        # An empty listing is more likely an outage than an empty bucket,
+        # so never treat it as "everything was deleted"
         print("❌ No PDF files found in Firebase Storage")
-        return
-    
-    print(f"✅ Found {len(pdf_files)} PDF files")
+        return summary
+
+    print(f"✅ Found {len(pdf_blobs)} PDF files")
     print("-" * 50)
-    
-    # Create temporary directory for downloads
-    with tempfile.TemporaryDirectory() as temp_dir:
-        processed_count = 0
-        
-        for pdf_path in pdf_files:
-            filename = os.path.basename(pdf_path)
-            local_path = os.path.join(temp_dir, filename)
-            
-            print(f"\n📥 Processing: {filename}")
-            
-            # Download from Firebase
-            if firebase_manager.download_pdf(pdf_path, local_path):
+
+    manifest = IngestionManifest(manifest_path)
+    # Collections created before hybrid retrieval have no keyword index yet
+    needs_bm25_rebuild = not os.path.exists(bm25_index_path)
+
+    # Chunks ingested before the manifest existed cannot be matched to a
+    # storage file; drop them once and re-ingest everything below
+    if not manifest.existed:
+        print("🧹 No ingestion manifest found, removing unmanaged chunks...")
+        delete_unmanaged_chunks()
+        manifest.save()
+
+    # Delete chunks of files that no longer exist in storage
+    remote_names = {blob['name'] for blob in pdf_blobs}
+    for source in manifest.sources():
+        if source not in remote_names:
+            print(f"\n🗑️ Removing: {os.path.basename(source)}")
+            try:
+                delete_chunks_from_chroma_db(manifest.get_chunk_ids(source))
+                manifest.remove(source)
+                manifest.save()
+                summary['removed'] += 1
+            except Exception as e:
+                summary['failed'] += 1
+                print(f"❌ Error removing {source}: {e}")
+
+    # Work out which files actually need embedding before downloading anything
+    pending = []
+    for blob in pdf_blobs:
+        if not force and manifest.is_current(blob['name'], blob['md5_hash'], blob['generation']):
+            manifest.update_generation(blob['name'], blob['generation'])
+            summary['unchanged'] += 1
+        else:
+            pending.append(blob)
+
+    if pending:
+        # Create temporary directory for downloads
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for blob in pending:
+                pdf_path = blob['name']
+                filename = os.path.basename(pdf_path)
+                local_path = os.path.join(temp_dir, filename)
+                is_update = manifest.get(pdf_path) is not None
+
+                print(f"\n📥 Processing: {filename}")
+
+                # Download from Firebase
+                if not firebase_manager.download_pdf(pdf_path, local_path):
+                    summary['failed'] += 1
+                    print(f"❌ Failed to download {filename}")
+                    continue
+
                 # Process into ChromaDB
                 print(f"🔄 Adding to vector store...")
                 try:
-                    process_document_to_chroma_db(local_path)
-                    processed_count += 1
+                    version = blob['md5_hash'] or blob['generation']
+                    chunk_ids = process_document_to_chroma_db(
+                        local_path,
+                        source_id=pdf_path,
+                        version=version
+                    )
+
+                    # Remove chunks of the previous version that were not overwritten
+                    stale_ids = set(manifest.get_chunk_ids(pdf_path)) - set(chunk_ids)
+                    if stale_ids:
+                        delete_chunks_from_chroma_db(sorted(stale_ids))
+
+                    manifest.record(pdf_path, blob['md5_hash'], blob['generation'], chunk_ids)
+                    manifest.save()
+                    summary['updated' if is_update else 'added'] += 1
                     print(f"✅ {filename} processed successfully")
                 except Exception as e:
+                    summary['failed'] += 1
                     print(f"❌ Error processing {filename}: {e}")
-            else:
-                print(f"❌ Failed to download {filename}")
-    
+                finally:
+                    if os.path.exists(local_path):
+                        os.unlink(local_path)
+
+    manifest.save()
+
+    if needs_bm25_rebuild:
+        print("\n🔎 Building BM25 keyword index...")
+        rebuild_bm25_index()
+
+    # Publish a fresh memory-mapped export for the API workers
+    changed = summary['added'] or summary['updated'] or summary['removed']
+    if vector_backend == "numpy" and (changed or not current_version(numpy_index_path)):
+        print("\n🧮 Exporting NumPy vector index...")
+        export_numpy_vectorstore()
+
     print("-" * 50)
-    print(f"🎉 Completed! Processed {processed_count}/{len(pdf_files)} documents")
+    print(
+        f"🎉 Sync completed in {time.time() - start_total:.2f}s: "
+        f"{summary['added']} added, {summary['updated']} updated, "
+        f"{summary['removed']} removed, {summary['unchanged']} unchanged, "
+        f"{summary['failed']} failed"
+    )
     print("📊 Knowledge base is ready for Q&A!")
+    return summary
 
 
 if __name__ == "__main__":
     print("⚠️  Run this with Streamlit:")
     print("   streamlit run process_knowledge_base.py")
-    
+
     # Uncomment below if running with streamlit
     # process_knowledge_base()
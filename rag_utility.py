@@ -1,18 +1,33 @@
 import os
 import json
+import hashlib
 import shutil
 import time
 import gc
+import itertools
 import logging
+import re
+from typing import Any, Dict, List
+from uuid import UUID
 
-from langchain_community.document_loaders import UnstructuredPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from langchain_groq import ChatGroq
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
+from langchain_core.callbacks import BaseCallbackHandler, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
 
+import metrics
+import tracing
+from bm25_index import BM25Index, reciprocal_rank_fusion
+from kb_manifest import IngestionManifest
+from numpy_vectorstore import NumpyVectorStore, export_numpy_index, current_version
+
+
+logger = logging.getLogger(__name__)
 
 working_dir = os.path.dirname(os.path.abspath((__file__)))
 config_data = json.load(open(f"{working_dir}/config.json"))
@@ -27,11 +42,20 @@ _llm = None
 def get_embedding():
     global _embedding
     if _embedding is None:
-        _embedding = HuggingFaceEmbeddings()
+        _embedding = metrics.InstrumentedEmbeddings(HuggingFaceEmbeddings())
     return _embedding
 
 def get_llm():
     global _llm
+    if _llm is None and os.environ.get("RAG_LLM") == "fake":
+        # Offline stand-in for load tests; never used unless explicitly requested
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+        latency = os.environ.get("RAG_FAKE_LLM_LATENCY")
+        _llm = FakeListChatModel(
+            responses=["Use a clean single-column layout, standard section headings and "
+                       "quantified achievements so ATS parsers can read your resume."],
+            sleep=float(latency) if latency else None
+        )
     if _llm is None:
         _llm = ChatGroq(
             model="llama-3.1-8b-instant",
@@ -42,61 +66,103 @@ def get_llm():
     return _llm
 
 
-def process_document_to_chroma_db(file_name):
-    # load the doc using unstructured
-    loader = UnstructuredPDFLoader(f"{working_dir}/{file_name}")
-    documents = loader.load()
-    
-    # Add file metadata to each document
-    import time
-    start_total = time.time()
+vectorstore_path = f"{working_dir}/doc_vectorstore"
+collection_name = "pdf_documents"
+manifest_path = f"{vectorstore_path}/ingest_manifest.json"
+bm25_index_path = f"{vectorstore_path}/bm25_index.json"
+numpy_index_path = f"{working_dir}/doc_vectorstore_numpy"
 
-    print(f"[TIMER] Starting processing for {file_name}")
-    start_load = time.time()
-    loader = UnstructuredPDFLoader(f"{working_dir}/{file_name}")
-    documents = loader.load()
-    print(f"[TIMER] Document load time: {time.time() - start_load:.2f}s")
+# "chroma" queries doc_vectorstore directly, "numpy" serves queries from a
+# memory-mapped export of it (see export_numpy_vectorstore)
+vector_backend = config_data.get("vector_backend", "chroma")
+numpy_index_dtype = config_data.get("numpy_index_dtype", "float32")
 
-    start_split = time.time()
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=2000,
-        chunk_overlap=200
+# "hybrid" fuses BM25 and dense results, "dense" keeps plain MMR retrieval
+retrieval_mode = config_data.get("retrieval_mode", "hybrid")
+
+# "token" sizes chunks to the embedding model's context window,
+# "character" keeps the legacy 2000/200 character chunks
+splitter_mode = config_data.get("splitter_mode", "token")
+chunk_tokens = config_data.get("chunk_tokens")  # defaults to the model limit
+chunk_overlap_tokens = config_data.get("chunk_overlap_tokens")
+
+# "fast" reads page text with pypdf/pdfplumber, "unstructured" uses the
+# UnstructuredPDFLoader; with unstructured_fallback, documents that fail
+# the fast text quality check are re-loaded with unstructured
+pdf_loader_strategy = config_data.get("pdf_loader", "fast")
+unstructured_fallback = config_data.get("unstructured_fallback", False)
+
+# BM25 index cache, reloaded when the file on disk changes
+_bm25_index = None
+_bm25_mtime = None
+
+# Memory-mapped store cache, reloaded when a new export is published
+_numpy_store = None
+
+
+def open_vectordb():
+    """Open the persistent Chroma collection"""
+    return Chroma(
+        persist_directory=vectorstore_path,
+        embedding_function=get_embedding(),
+        collection_name=collection_name
     )
-    texts = text_splitter.split_documents(documents)
-    print(f"[TIMER] Text splitting time: {time.time() - start_split:.2f}s")
 
-    start_sanitize = time.time()
-    for doc in texts:
-        if doc.metadata:
-            doc.metadata = {
-                k: str(v) if v is not None else ""
-                for k, v in doc.metadata.items()
-                if isinstance(k, str) and k
-            }
-    print(f"[TIMER] Metadata sanitization time: {time.time() - start_sanitize:.2f}s")
 
-    start_vector = time.time()
-    vectorstore_path = f"{working_dir}/doc_vectorstore"
-    collection_name = "pdf_documents"
+def get_vectorstore():
+    """
+    Return the vector store used for question answering.
+    The NumPy store is mapped once per process and shared across requests;
+    Chroma falls back to a fresh client if no NumPy export exists.
+    """
+    global _numpy_store
+    if vector_backend == "numpy":
+        version = current_version(numpy_index_path)
+        if version:
+            if _numpy_store is None or _numpy_store.version != version:
+                _numpy_store = NumpyVectorStore(numpy_index_path, get_embedding())
+            return _numpy_store
+        logger.warning("NumPy index not exported yet, falling back to Chroma")
+    return open_vectordb()
+
+
+def export_numpy_vectorstore(dtype=None):
+    """
+    Export the Chroma collection to the memory-mapped NumPy index
+
+    Args:
+        dtype: "float32" or "float16" (defaults to ``numpy_index_dtype``)
+
+    Returns:
+        Number of exported chunks
+    """
+    start = time.time()
+    vectordb = open_vectordb()
     try:
-        vectordb = Chroma(
-            persist_directory=vectorstore_path,
-            embedding_function=get_embedding(),
-            collection_name=collection_name
-        )
-        vectordb.add_documents(texts)
-        print(f"Added {len(texts)} chunks from {file_name} to existing ChromaDB collection")
-    except Exception:
-        print(f"Creating new ChromaDB collection for {file_name}")
-        vectordb = Chroma.from_documents(
-            documents=texts,
-            embedding=get_embedding(),
-            persist_directory=vectorstore_path,
-            collection_name=collection_name
-        )
-    print(f"[TIMER] Vectorstore time: {time.time() - start_vector:.2f}s")
+        stored = vectordb.get(include=["embeddings", "documents", "metadatas"])
+    finally:
+        close_vectordb(vectordb)
+        vectordb = None
+        gc.collect()
 
-    start_persist = time.time()
+    ids = stored.get("ids", [])
+    export_numpy_index(
+        numpy_index_path,
+        ids,
+        # Chroma returns None rather than [] for an empty collection
+        stored.get("embeddings") if stored.get("embeddings") is not None else [],
+        stored.get("documents") or [],
+        stored.get("metadatas", []),
+        dtype=dtype or numpy_index_dtype
+    )
+    logger.info("Exported %d chunks to NumPy index in %.2fs", len(ids), time.time() - start)
+    return len(ids)
+
+
+def close_vectordb(vectordb):
+    """Persist and release Chroma resources"""
+    if vectordb is None:
+        return
     try:
         if hasattr(vectordb, "persist"):
             try:
@@ -111,44 +177,576 @@ def process_document_to_chroma_db(file_name):
                 pass
     except Exception:
         pass
-    print(f"[TIMER] Persist/shutdown time: {time.time() - start_persist:.2f}s")
 
-    print(f"[TIMER] Total processing time for {file_name}: {time.time() - start_total:.2f}s")
+
+def get_embedding_tokenizer():
+    """
+    Return the tokenizer and max sequence length of the active embedding model.
+    Text beyond max_seq_length tokens is silently truncated when embedded.
+    """
+    embedding = get_embedding()
+    client = getattr(embedding, "_client", None) or getattr(embedding, "client", None)
+    tokenizer = getattr(client, "tokenizer", None)
+    max_seq_length = getattr(client, "max_seq_length", None)
+    if tokenizer is None or not max_seq_length:
+        raise RuntimeError("Embedding model does not expose a tokenizer")
+    return tokenizer, int(max_seq_length)
+
+
+def get_text_splitter():
+    """Build the text splitter configured by ``splitter_mode``"""
+    if splitter_mode == "token":
+        try:
+            tokenizer, max_seq_length = get_embedding_tokenizer()
+            # Leave room for the [CLS]/[SEP] special tokens
+            size = min(int(chunk_tokens or max_seq_length), max_seq_length) - 2
+            overlap = int(chunk_overlap_tokens if chunk_overlap_tokens is not None else size // 10)
+            return RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+                tokenizer,
+                chunk_size=size,
+                chunk_overlap=overlap
+            )
+        except Exception as e:
+            logger.warning("Token splitter unavailable, using character splitter: %s", e)
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=2000,
+        chunk_overlap=200
+    )
+
+
+def splitter_signature():
+    """Short description of the active splitter, folded into chunk IDs"""
+    if splitter_mode == "token":
+        return f"token:{chunk_tokens or 'max'}:{chunk_overlap_tokens if chunk_overlap_tokens is not None else 'auto'}"
+    return "character:2000:200"
+
+
+def clean_pdf_text(text):
+    """Undo the most common PDF text-extraction layout artefacts"""
+    text = text.replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n")
+    # Re-join words hyphenated across line breaks
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    # Join wrapped lines inside a paragraph, keep blank-line paragraph breaks
+    text = re.sub(r"(?<![.:;!?\n])\n(?=[a-z(])", " ", text)
+    text = re.sub(r"[ \t\f\v]+", " ", text)
+    text = re.sub(r" *\n *", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def pdf_text_quality_ok(documents, min_chars_per_page=200, min_printable_ratio=0.95):
+    """
+    Check that fast-extracted page text is usable.
+    Scanned pages extract to nothing and broken font maps extract to
+    replacement/control characters; both fail this check.
+    """
+    if not documents:
+        return False
+    text = "".join(doc.page_content for doc in documents)
+    if len(text) < min_chars_per_page * len(documents):
+        return False
+    printable = sum(1 for ch in text if ch.isprintable() or ch in "\n\t")
+    printable -= text.count("\ufffd")
+    return printable / len(text) >= min_printable_ratio
+
+
+def _load_pdf_pages_fast(file_path):
+    """Load one Document per PDF page with pypdf, or pdfplumber if pypdf is missing"""
+    try:
+        from pypdf import PdfReader
+        reader = PdfReader(file_path)
+        pages = [page.extract_text() or "" for page in reader.pages]
+    except ImportError:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            pages = [page.extract_text() or "" for page in pdf.pages]
+
+    return [
+        Document(page_content=clean_pdf_text(text), metadata={"source": file_path, "page": i + 1})
+        for i, text in enumerate(pages)
+        if text.strip()
+    ]
+
+
+def _load_pdf_unstructured(file_path):
+    # Imported lazily: unstructured pulls in a very heavy dependency tree
+    from langchain_community.document_loaders import UnstructuredPDFLoader
+    return UnstructuredPDFLoader(file_path).load()
+
+
+def load_pdf_documents(file_path, strategy=None):
+    """
+    Load a PDF into LangChain documents with the configured loader strategy
+
+    Args:
+        file_path: Path to the PDF
+        strategy: "fast" or "unstructured" (defaults to ``pdf_loader_strategy``)
+
+    Returns:
+        List of Documents
+    """
+    strategy = strategy or pdf_loader_strategy
+    if strategy == "unstructured":
+        return _load_pdf_unstructured(file_path)
+
+    documents = []
+    try:
+        documents = _load_pdf_pages_fast(file_path)
+    except Exception as e:
+        logger.warning("Fast PDF loader failed on %s: %s", file_path, e)
+
+    if not pdf_text_quality_ok(documents):
+        if unstructured_fallback:
+            logger.info("Fast text quality check failed for %s, falling back to unstructured", file_path)
+            return _load_pdf_unstructured(file_path)
+        logger.warning("Fast text quality check failed for %s (unstructured_fallback is off)", file_path)
+    return documents
+
+
+def make_chunk_ids(source_id, version, count):
+    """
+    Build deterministic chunk IDs for one version of a source document.
+    Re-ingesting the same version yields the same IDs, so Chroma upserts
+    instead of duplicating chunks.
+    """
+    prefix = hashlib.sha1(f"{source_id}@{version}".encode("utf-8")).hexdigest()[:16]
+    return [f"{prefix}-{i:05d}" for i in range(count)]
+
+
+def get_bm25_index():
+    """Return the on-disk BM25 index, reloading it after ingestion updates it"""
+    global _bm25_index, _bm25_mtime
+    try:
+        mtime = os.path.getmtime(bm25_index_path)
+    except OSError:
+        return None
+    if _bm25_index is None or mtime != _bm25_mtime:
+        _bm25_index = BM25Index.load(bm25_index_path)
+        _bm25_mtime = mtime
+    return _bm25_index
+
+
+def update_bm25_index(added=None, removed_ids=None):
+    """
+    Apply chunk additions/removals to the BM25 index stored next to the collection
+
+    Args:
+        added: Iterable of (chunk_id, text) pairs to index
+        removed_ids: Iterable of chunk IDs to drop
+    """
+    index = BM25Index.load(bm25_index_path)
+    if removed_ids:
+        index.remove_documents(removed_ids)
+    if added:
+        index.add_documents(added)
+    index.save(bm25_index_path)
+
+
+def rebuild_bm25_index():
+    """Rebuild the BM25 index from every chunk in the ChromaDB collection"""
+    vectordb = open_vectordb()
+    try:
+        stored = vectordb.get(include=["documents"])
+    finally:
+        close_vectordb(vectordb)
+        vectordb = None
+        gc.collect()
+
+    index = BM25Index()
+    index.add_documents(zip(stored.get("ids", []), stored.get("documents", [])))
+    index.save(bm25_index_path)
+    logger.info("Rebuilt BM25 index with %d chunks", len(index))
+    return len(index)
+
+
+class HybridRetriever(BaseRetriever):
+    """Fuse dense vector search and BM25 keyword search with reciprocal rank fusion"""
+
+    vectordb: Any
+    bm25: Any
+    k: int = 3
+    fetch_k: int = 10
+    rrf_k: int = 60
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        dense_docs = self.vectordb.similarity_search(query, k=self.fetch_k)
+        docs_by_id = {}
+        dense_ranking = []
+        for doc in dense_docs:
+            chunk_id = getattr(doc, "id", None) or doc.metadata.get("chunk_id")
+            if chunk_id:
+                docs_by_id[chunk_id] = doc
+                dense_ranking.append(chunk_id)
+
+        sparse_ranking = [chunk_id for chunk_id, _ in self.bm25.search(query, k=self.fetch_k)]
+
+        fused = reciprocal_rank_fusion([dense_ranking, sparse_ranking], k=self.rrf_k)
+        top_ids = [chunk_id for chunk_id, _ in fused[:self.k]]
+
+        # Keyword-only hits are not in the dense results yet
+        missing = [chunk_id for chunk_id in top_ids if chunk_id not in docs_by_id]
+        if missing:
+            stored = self.vectordb.get(ids=missing, include=["documents", "metadatas"])
+            for chunk_id, text, metadata in zip(
+                stored.get("ids", []), stored.get("documents", []), stored.get("metadatas", [])
+            ):
+                docs_by_id[chunk_id] = Document(page_content=text, metadata=metadata or {})
+
+        return [docs_by_id[chunk_id] for chunk_id in top_ids if chunk_id in docs_by_id]
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Record retriever and LLM latency of a chain run in the metrics registry and the request trace"""
+
+    def __init__(self, backend: str, mode: str, model: str):
+        self.backend = backend
+        self.mode = mode
+        self.model = model
+        self._started: Dict[UUID, float] = {}
+        self._spans: Dict[UUID, Dict] = {}
+
+    def _start(self, run_id: UUID, span_name: str, **attributes):
+        self._started[run_id] = time.perf_counter()
+        self._spans[run_id] = tracing.begin(span_name, **attributes)
+
+    def _finish(self, run_id: UUID, metric, outcome: str, error=None, **labels):
+        start = self._started.pop(run_id, None)
+        if start is not None:
+            metrics.observe(metric, time.perf_counter() - start, outcome, **labels)
+        tracing.end(self._spans.pop(run_id, None), error)
+
+    def on_retriever_start(self, serialized, query, *, run_id, **kwargs):
+        self._start(run_id, 'rag.retrieve', backend=self.backend, mode=self.mode)
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs):
+        outcome = "ok" if documents else "empty"
+        span = self._spans.get(run_id)
+        if span is not None:
+            span['attributes']['documents'] = len(documents)
+        self._finish(run_id, metrics.VECTOR_SEARCH_SECONDS, outcome, backend=self.backend, mode=self.mode)
+
+    def on_retriever_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, metrics.VECTOR_SEARCH_SECONDS, "error", error, backend=self.backend, mode=self.mode)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, 'rag.llm', model=self.model)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id, 'rag.llm', model=self.model)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, metrics.LLM_SECONDS, "ok", model=self.model)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, metrics.LLM_SECONDS, "error", error, model=self.model)
+
+
+def get_retriever(vectordb):
+    """Build the retriever configured by ``retrieval_mode``"""
+    if retrieval_mode == "hybrid":
+        bm25 = get_bm25_index()
+        if bm25 is not None and len(bm25) > 0:
+            return HybridRetriever(vectordb=vectordb, bm25=bm25, k=3, fetch_k=10)
+        logger.warning("BM25 index not available, falling back to dense retrieval")
+
+    # Optimized retriever with better search parameters
+    return vectordb.as_retriever(
+        search_type="mmr",  # Maximum Marginal Relevance for diverse results
+        search_kwargs={
+            "k": 3,  # Reduced to top 3 for faster processing
+            "fetch_k": 10,  # Fetch 10 candidates before MMR
+            "lambda_mult": 0.7  # Balance relevance vs diversity
+        }
+    )
+
+
+def process_document_to_chroma_db(file_name, source_id=None, version=None, loader_strategy=None):
+    """
+    Load, split and embed a PDF into the ChromaDB collection.
+
+    Args:
+        file_name: PDF path (absolute, or relative to this module)
+        source_id: Stable identifier of the source (e.g. its storage path)
+        version: Content version of the source (e.g. its MD5 hash)
+        loader_strategy: "fast" or "unstructured" (defaults to config)
+
+    Returns:
+        List of chunk IDs added to the collection
+    """
+    start_total = time.time()
+    file_path = os.path.join(working_dir, file_name)
+    source_id = source_id or os.path.basename(file_name)
+    version = version or ""
+
+    logger.info("Starting processing for %s", file_name)
+    start_load = time.time()
+    documents = load_pdf_documents(file_path, loader_strategy)
+    logger.info("Document load time: %.2fs", time.time() - start_load)
+
+    start_split = time.time()
+    text_splitter = get_text_splitter()
+    texts = text_splitter.split_documents(documents)
+    logger.info("Text splitting time: %.2fs", time.time() - start_split)
+
+    start_sanitize = time.time()
+    chunk_ids = _label_chunks(texts, source_id, version)
+    logger.info("Metadata sanitization time: %.2fs", time.time() - start_sanitize)
+
+    if not texts:
+        logger.warning("No text chunks extracted from %s", file_name)
+        return []
+
+    start_vector = time.time()
+    try:
+        vectordb = open_vectordb()
+        vectordb.add_documents(texts, ids=chunk_ids)
+        logger.info("Added %d chunks from %s to existing ChromaDB collection", len(texts), file_name)
+    except Exception:
+        logger.info("Creating new ChromaDB collection for %s", file_name)
+        vectordb = Chroma.from_documents(
+            documents=texts,
+            embedding=get_embedding(),
+            ids=chunk_ids,
+            persist_directory=vectorstore_path,
+            collection_name=collection_name
+        )
+    logger.info("Vectorstore time: %.2fs", time.time() - start_vector)
+
+    start_bm25 = time.time()
+    update_bm25_index(added=[(chunk_id, doc.page_content) for chunk_id, doc in zip(chunk_ids, texts)])
+    logger.info("BM25 index time: %.2fs", time.time() - start_bm25)
+
+    start_persist = time.time()
+    close_vectordb(vectordb)
+    logger.info("Persist/shutdown time: %.2fs", time.time() - start_persist)
+
+    logger.info("Total processing time for %s: %.2fs", file_name, time.time() - start_total)
 
     vectordb = None
     gc.collect()
-    return 0
+    return chunk_ids
+
+
+def _label_chunks(texts, source_id, version):
+    """Sanitize chunk metadata and assign deterministic chunk IDs"""
+    chunk_ids = make_chunk_ids(source_id, f"{version}|{splitter_signature()}", len(texts))
+    for doc, chunk_id in zip(texts, chunk_ids):
+        metadata = {
+            k: str(v) if v is not None else ""
+            for k, v in (doc.metadata or {}).items()
+            if isinstance(k, str) and k
+        }
+        metadata["kb_source"] = source_id
+        metadata["kb_version"] = version
+        metadata["chunk_id"] = chunk_id
+        doc.metadata = metadata
+    return chunk_ids
+
+
+def _chunk_origin(metadata):
+    """Metadata identifying the loaded document (e.g. PDF page) a stored chunk came from"""
+    return tuple(sorted((k, v) for k, v in metadata.items() if k != "chunk_id"))
+
+
+def _merge_overlapping_chunks(chunks, max_overlap=400):
+    """Rebuild source text from ordered chunks, dropping the splitter overlap"""
+    text = chunks[0]
+    for chunk in chunks[1:]:
+        overlap = 0
+        for size in range(min(max_overlap, len(text), len(chunk)), 0, -1):
+            if text.endswith(chunk[:size]):
+                overlap = size
+                break
+        text += (chunk[overlap:] if overlap else "\n\n" + chunk)
+    return text
+
+
+def rechunk_collection(dry_run=False):
+    """
+    Migrate the existing collection to the configured splitter.
+
+    Every stored chunk is measured against the embedding model's context
+    window, the chunks of each source are stitched back together and
+    re-split, and the old chunks are replaced in Chroma, the BM25 index
+    and the ingestion manifest. Only sources with a manifest entry are
+    migrated; unmanaged chunks are left for delete_unmanaged_chunks().
+
+    Args:
+        dry_run: Only report truncation, do not modify the collection
+
+    Returns:
+        Dictionary with truncation statistics and migration counts
+    """
+    tokenizer, max_seq_length = get_embedding_tokenizer()
+    vectordb = open_vectordb()
+    try:
+        stored = vectordb.get(include=["documents", "metadatas"])
+        ids = stored.get("ids", [])
+        documents = stored.get("documents", [])
+        metadatas = [m or {} for m in stored.get("metadatas", [])]
+
+        report = {
+            "max_seq_length": max_seq_length,
+            "chunks": len(ids),
+            "chunks_truncated": 0,
+            "tokens_total": 0,
+            "tokens_truncated": 0,
+            "chars_total": 0,
+            "chars_truncated_estimate": 0,
+        }
+        for text in documents:
+            # +2 for the special tokens added by the embedding model
+            n_tokens = len(tokenizer.tokenize(text)) + 2
+            lost = max(0, n_tokens - max_seq_length)
+            report["tokens_total"] += n_tokens
+            report["chars_total"] += len(text)
+            if lost:
+                report["chunks_truncated"] += 1
+                report["tokens_truncated"] += lost
+                report["chars_truncated_estimate"] += int(len(text) * lost / n_tokens)
+        report["pct_text_not_embedded"] = round(
+            100.0 * report["tokens_truncated"] / report["tokens_total"], 2
+        ) if report["tokens_total"] else 0.0
+
+        logger.info(
+            "%d/%d chunks exceed %d tokens; %s%% of stored text was never embedded",
+            report['chunks_truncated'], report['chunks'], max_seq_length, report['pct_text_not_embedded']
+        )
+        if dry_run or not ids:
+            return report
+
+        # Group chunks per manifest source, keeping the order they were split in.
+        # Chunks without a manifest entry (pre-manifest ingests, missing source)
+        # are left alone for delete_unmanaged_chunks.
+        manifest = IngestionManifest(manifest_path)
+        groups = {}
+        unmanaged = 0
+        for chunk_id, text, metadata in zip(ids, documents, metadatas):
+            source = metadata.get("kb_source") or ""
+            if not source or not manifest.get(source):
+                unmanaged += 1
+                continue
+            groups.setdefault(source, []).append((chunk_id, text, metadata))
+
+        text_splitter = get_text_splitter()
+        new_total = 0
+        for source, chunks in groups.items():
+            order = {chunk_id: i for i, chunk_id in enumerate(manifest.get_chunk_ids(source))}
+            chunks.sort(key=lambda c: (order.get(c[0], len(order)), c[0]))
+
+            # The splitter ran per loaded document (one per PDF page), so merge and
+            # re-split each run of chunks sharing the same metadata on its own;
+            # every new chunk keeps its own page instead of the first one's
+            merged = []
+            for _, run in itertools.groupby(chunks, key=lambda c: _chunk_origin(c[2])):
+                run = list(run)
+                merged.append(Document(
+                    page_content=_merge_overlapping_chunks([c[1] for c in run]),
+                    metadata={k: v for k, v in run[0][2].items() if k != "chunk_id"}
+                ))
+            version = merged[0].metadata.get("kb_version", "")
+            texts = text_splitter.split_documents(merged)
+            new_ids = _label_chunks(texts, source, version)
+
+            # Add before deleting, so a failed embedding call leaves the old chunks in place;
+            # IDs are deterministic, so unchanged ones are overwritten rather than removed
+            old_ids = [c[0] for c in chunks]
+            vectordb.add_documents(texts, ids=new_ids)
+            kept = set(new_ids)
+            stale_ids = [chunk_id for chunk_id in old_ids if chunk_id not in kept]
+            if stale_ids:
+                vectordb.delete(ids=stale_ids)
+            update_bm25_index(
+                added=[(chunk_id, doc.page_content) for chunk_id, doc in zip(new_ids, texts)],
+                removed_ids=stale_ids
+            )
+
+            entry = manifest.get(source)
+            manifest.record(source, entry.get("md5_hash", ""), entry.get("generation", ""), new_ids)
+            manifest.save()
+            new_total += len(new_ids)
+            logger.info("Re-chunked %s: %d -> %d chunks", source, len(old_ids), len(new_ids))
+
+        if unmanaged:
+            logger.info("Skipped %d chunks without a manifest entry (see delete_unmanaged_chunks)", unmanaged)
+        report["unmanaged_chunks"] = unmanaged
+        report["sources"] = len(groups)
+        report["new_chunks"] = new_total
+    finally:
+        close_vectordb(vectordb)
+        vectordb = None
+        gc.collect()
+
+    if vector_backend == "numpy":
+        export_numpy_vectorstore()
+    return report
+
+
+def delete_chunks_from_chroma_db(chunk_ids):
+    """Delete chunks by ID from the ChromaDB collection"""
+    if not chunk_ids:
+        return 0
+    vectordb = open_vectordb()
+    try:
+        vectordb.delete(ids=list(chunk_ids))
+        update_bm25_index(removed_ids=chunk_ids)
+        logger.info("Deleted %d chunks from ChromaDB collection", len(chunk_ids))
+    finally:
+        close_vectordb(vectordb)
+        vectordb = None
+        gc.collect()
+    return len(chunk_ids)
+
+
+def delete_unmanaged_chunks():
+    """
+    Delete chunks that were ingested before the manifest existed.
+    Those chunks carry no ``kb_source`` metadata, so a sync cannot tell
+    which storage file they came from; the sync re-ingests them instead.
+    """
+    vectordb = open_vectordb()
+    try:
+        stored = vectordb.get(include=["metadatas"])
+        legacy_ids = [
+            chunk_id
+            for chunk_id, metadata in zip(stored.get("ids", []), stored.get("metadatas", []))
+            if not (metadata or {}).get("kb_source")
+        ]
+        if legacy_ids:
+            vectordb.delete(ids=legacy_ids)
+            update_bm25_index(removed_ids=legacy_ids)
+            logger.info("Deleted %d legacy chunks without a manifest entry", len(legacy_ids))
+    finally:
+        close_vectordb(vectordb)
+        vectordb = None
+        gc.collect()
+    return len(legacy_ids)
 
 def answer_question(user_question):
     vectordb = None
     try:
         # load the persistent vectordb
-        vectorstore_path = f"{working_dir}/doc_vectorstore"
-        collection_name = "pdf_documents"
+        with tracing.span('rag.open_vectorstore', backend=vector_backend):
+            vectordb = get_vectorstore()
         
-        vectordb = Chroma(
-            persist_directory=vectorstore_path,
-            embedding_function=get_embedding(),
-            collection_name=collection_name
-        )
-        
-        # Optimized retriever with better search parameters
-        retriever = vectordb.as_retriever(
-            search_type="mmr",  # Maximum Marginal Relevance for diverse results
-            search_kwargs={
-                "k": 3,  # Reduced to top 3 for faster processing
-                "fetch_k": 10,  # Fetch 10 candidates before MMR
-                "lambda_mult": 0.7  # Balance relevance vs diversity
-            }
-        )
+        retriever = get_retriever(vectordb)
+        llm = get_llm()
+        callbacks = [MetricsCallbackHandler(
+            backend="numpy" if isinstance(vectordb, NumpyVectorStore) else "chroma",
+            mode="hybrid" if isinstance(retriever, HybridRetriever) else "mmr",
+            model=getattr(llm, "model_name", "unknown")
+        )]
         
         # Debug: Check what documents are retrieved
-        retrieved_docs = retriever.get_relevant_documents(user_question)
-        print(f"Retrieved {len(retrieved_docs)} documents for question: {user_question}")
+        retrieved_docs = retriever.get_relevant_documents(user_question, callbacks=callbacks)
+        logger.debug("Retrieved %d documents for question: %s", len(retrieved_docs), user_question)
         if retrieved_docs:
-            print(f"First retrieved chunk preview: {retrieved_docs[0].page_content[:200]}...")
+            logger.debug("First retrieved chunk preview: %.200s...", retrieved_docs[0].page_content)
         else:
-            print("WARNING: No documents retrieved!")
+            logger.warning("No documents retrieved for question")
 
         # Optimized prompt for better responses
         prompt_template = """You are an expert resume and ATS (Applicant Tracking System) advisor. 
@@ -168,17 +766,16 @@ def answer_question(user_question):
         
         # Create optimized chain with custom prompt
         qa_chain = RetrievalQA.from_chain_type(
-            llm=get_llm(),
+            llm=llm,
             chain_type="stuff",
             retriever=retriever,
             return_source_documents=True,
             chain_type_kwargs={"prompt": PROMPT}
         )
-        response = qa_chain.invoke({"query": user_question})
+        with tracing.span('rag.chain'):
+            response = qa_chain.invoke({"query": user_question}, config={"callbacks": callbacks})
         
-        # Debug logging
-        print(f"Response type: {type(response)}")
-        print(f"Response keys: {response.keys() if isinstance(response, dict) else 'Not a dict'}")
+        logger.debug("Response type: %s", type(response).__name__)
         
         # langchain may return a dict or string depending on version
         if isinstance(response, dict):
@@ -190,17 +787,15 @@ def answer_question(user_question):
         if not answer or answer.strip() == "":
             answer = "I apologize, but I couldn't find a relevant answer to your question. Please try rephrasing your question or ask about resume best practices, ATS optimization, or job search strategies."
         
-        print(f"Final answer length: {len(answer)} characters")
+        logger.debug("Final answer length: %d characters", len(answer))
         
     except Exception as e:
-        print(f"ERROR in answer_question: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("answer_question failed: %s", e)
         return f"I encountered an error while processing your question: {str(e)}. Please try again or ask a different question."
     
     finally:
-        # cleanup vectordb resources
-        if vectordb is not None:
+        # cleanup vectordb resources (the shared NumPy store stays mapped)
+        if vectordb is not None and not isinstance(vectordb, NumpyVectorStore):
             try:
                 client = getattr(vectordb, "client", None)
                 if client is not None and hasattr(client, "shutdown"):
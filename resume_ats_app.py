@@ -3,8 +3,12 @@ import streamlit as st
 from resume_parser import ResumeParser
 from ats_scorer import ATSScorer
 from rag_utility import answer_question
+from enhancement_repository import EnhancementContentRepository
+from logging_config import configure_logging
 import tempfile
 
+configure_logging()
+
 # Set working directory
 working_dir = os.getcwd()
 
@@ -29,6 +33,13 @@ def get_scorer():
         st.error(f"Error initializing ATSScorer: {e}")
         return None
 
+@st.cache_resource
+def get_enhancement_repository():
+    # Firebase client and enhancement documents are loaded once per server process
+    repository = EnhancementContentRepository(lambda: dict(st.secrets["firebase"]))
+    repository.start()
+    return repository
+
 # Load models
 parser = get_parser()
 scorer = get_scorer()
@@ -668,37 +679,15 @@ elif st.session_state.mode == 'enhance':
             if st.button(" Start Enhancement", type="primary", use_container_width=True):
                 with st.spinner("Enhancing your resume with AI... This may take a moment."):
                     try:
-                        import firebase_admin
-                        from firebase_admin import credentials, firestore
-                        
-                        # Initialize Firebase if not already initialized
-                        if not firebase_admin._apps:
-                            # Load Firebase credentials from Streamlit secrets
-                            firebase_creds = {
-                                "type": st.secrets["firebase"]["type"],
-                                "project_id": st.secrets["firebase"]["project_id"],
-                                "private_key_id": st.secrets["firebase"]["private_key_id"],
-                                "private_key": st.secrets["firebase"]["private_key"],
-                                "client_email": st.secrets["firebase"]["client_email"],
-                                "client_id": st.secrets["firebase"]["client_id"],
-                                "auth_uri": st.secrets["firebase"]["auth_uri"],
-                                "token_uri": st.secrets["firebase"]["token_uri"],
-                                "auth_provider_x509_cert_url": st.secrets["firebase"]["auth_provider_x509_cert_url"],
-                                "client_x509_cert_url": st.secrets["firebase"]["client_x509_cert_url"],
-                                "universe_domain": st.secrets["firebase"]["universe_domain"]
-                            }
-                            cred = credentials.Certificate(firebase_creds)
-                            firebase_admin.initialize_app(cred)
-                        
-                        db = firestore.client()
-                        
-                        # Fetch enhancement data from Firebase
-                        enhancements_ref = db.collection('resume_enhancements')
-                        
-                        # Get best practices and templates
-                        best_practices = enhancements_ref.document('best_practices').get().to_dict()
-                        action_verbs = enhancements_ref.document('action_verbs').get().to_dict().get('verbs', [])
-                        quantifiable_templates = enhancements_ref.document('quantifiable_templates').get().to_dict().get('templates', [])
+                        # Enhancement data from Firebase, cached in process
+                        # Blocks only for the first fetch on a fresh deploy without a snapshot
+                        content = get_enhancement_repository().get(wait=15)
+                        if content['source'] == 'empty':
+                            raise RuntimeError("Enhancement data unavailable from Firebase")
+                        
+                        best_practices = content['best_practices']
+                        action_verbs = content['action_verbs']
+                        quantifiable_templates = content['quantifiable_templates']
                         
                         # Start enhancement
                         enhanced_data = parsed.copy()
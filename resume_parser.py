@@ -3,8 +3,17 @@ Resume Parser Module
 Extracts and parses content from PDF and DOCX resume files
 """
 
+import logging
+import os
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import metrics
+import tracing
+from docx_extractor import extract_docx_text
+from parsed_resume import SECTION_NAMES, section_text
+
+logger = logging.getLogger(__name__)
 
 # Try pypdf (newer) first, then PyPDF2 (older)
 try:
@@ -28,10 +37,77 @@ try:
 except ImportError:
     Document = None
 
+# Normalized heading line -> section type. 'other' headings end the section
+# before them without starting a scored one.
+SECTION_HEADINGS = {
+    'experience': 'experience', 'work experience': 'experience', 'professional experience': 'experience',
+    'work history': 'experience', 'employment': 'experience', 'employment history': 'experience',
+    'relevant experience': 'experience', 'career history': 'experience', 'internships': 'experience',
+    'education': 'education', 'academic background': 'education', 'academics': 'education',
+    'education and training': 'education', 'qualifications': 'education',
+    'skills': 'skills', 'technical skills': 'skills', 'key skills': 'skills', 'core skills': 'skills',
+    'competencies': 'skills', 'core competencies': 'skills', 'expertise': 'skills',
+    'areas of expertise': 'skills', 'technologies': 'skills', 'tools and technologies': 'skills',
+    'summary': 'summary', 'professional summary': 'summary', 'career summary': 'summary',
+    'profile': 'summary', 'professional profile': 'summary', 'objective': 'summary',
+    'career objective': 'summary', 'about': 'summary', 'about me': 'summary',
+    'projects': 'projects', 'personal projects': 'projects', 'academic projects': 'projects',
+    'key projects': 'projects', 'selected projects': 'projects',
+    'certifications': 'certifications', 'certificates': 'certifications', 'credentials': 'certifications',
+    'licenses and certifications': 'certifications', 'certifications and licenses': 'certifications',
+    'awards': 'other', 'honors': 'other', 'honors and awards': 'other', 'achievements': 'other',
+    'publications': 'other', 'languages': 'other', 'interests': 'other', 'hobbies': 'other',
+    'references': 'other', 'volunteer experience': 'other', 'volunteering': 'other',
+    'technical skills and tools': 'skills', 'skills and tools': 'skills',
+}
+# Keyword fallback for sections no heading matched (headings missing from the table)
+SECTION_KEYWORDS = {
+    'experience': ['experience', 'work history', 'employment', 'professional experience'],
+    'education': ['education', 'academic', 'degree', 'university', 'college'],
+    'skills': ['skills', 'technical skills', 'competencies', 'expertise'],
+    'summary': ['summary', 'profile', 'objective', 'about'],
+    'projects': ['project'],
+    'certifications': ['certification', 'certificate', 'credential'],
+}
+# Sections where achievements (action verbs, metrics) are written
+ACHIEVEMENT_SECTIONS = ('experience', 'projects')
+
+_HEADING_WORDS = re.compile(r'[a-z]+')
+
+
+def _heading(line: str):
+    """
+    Section types a heading line starts, and the offset in line where the body starts
+    
+    Combined headings ("Education & Certifications", "Skills, Expertise")
+    are split on '&', 'and' and ',' and each part is looked up; the line is a
+    heading only when every part is a known heading, so body lines such as
+    "Mentoring and Training" or "Docker, Kubernetes" are not. Returns ((), 0)
+    for body lines.
+    """
+    head, colon, rest = line.partition(':')
+    # Headings are short; the length check keeps most body lines off the regex
+    if len(head) > 40:
+        return (), 0
+    words = _HEADING_WORDS.findall(head.lower().replace('&', ' and ').replace(',', ' and '))
+    kind = SECTION_HEADINGS.get(' '.join(words))
+    if kind is not None:
+        kinds = (kind,)
+    else:
+        parts = ' '.join(words).split(' and ')
+        if len(parts) < 2 or any(part not in SECTION_HEADINGS for part in parts):
+            return (), 0
+        kinds = tuple(dict.fromkeys(SECTION_HEADINGS[part] for part in parts))
+    # "Skills: Python, SQL" keeps its inline content in the section
+    return kinds, (len(head) + 1 if colon and rest.strip() else len(line))
+
 
 class ResumeParser:
     """Parse resume content from PDF/DOCX files"""
     
+    # Bump whenever extraction or parsing changes so cached parses are invalidated
+    VERSION = "3"
+    
     def __init__(self):
         self.action_verbs = [
             'achieved', 'improved', 'developed', 'created', 'managed', 'led',
@@ -51,21 +127,29 @@ class ResumeParser:
             Dictionary containing parsed resume information
         """
         # Extract text
-        text = self.extract_text(file_path)
+        with tracing.span('parse.extract_text', format=os.path.splitext(file_path)[1].lower()) as attrs:
+            text = self.extract_text(file_path)
+            attrs['chars'] = len(text)
         
         if not text:
             return {'error': 'Could not extract text from resume'}
         
-        # Parse sections
-        parsed_data = {
-            'text': text,
-            'word_count': len(text.split()),
-            'email': self.extract_email(text),
-            'phone': self.extract_phone(text),
-            'sections': self.extract_sections(text),
-            'action_verb_count': self.count_action_verbs(text),
-            'has_quantifiable_results': self.has_quantifiable_results(text)
-        }
+        return self.parse_text(text)
+    
+    def parse_text(self, text: str) -> Dict:
+        """Derive the parsed fields (email, phone, sections, ...) from extracted resume text"""
+        with tracing.span('parse.sections'), metrics.timed(metrics.ANALYSIS_SECONDS, stage='sections'):
+            spans = self.segment_sections(text)
+            parsed_data = {
+                'text': text,
+                'word_count': len(text.split()),
+                'email': self.extract_email(text),
+                'phone': self.extract_phone(text),
+                'sections': self.extract_sections(text, spans),
+                'section_spans': spans,
+                'action_verb_count': self.count_action_verbs(text, spans),
+                'has_quantifiable_results': self.has_quantifiable_results(text, spans)
+            }
         
         return parsed_data
     
@@ -84,84 +168,121 @@ class ResumeParser:
         # Try pypdf first (newest, most reliable)
         if pypdf_available:
             try:
-                print(f"Trying pypdf on {file_path}")
+                logger.debug("Trying %s on %s", "pypdf", file_path)
                 from pypdf import PdfReader
-                pdf_reader = PdfReader(file_path)
-                print(f"PDF has {len(pdf_reader.pages)} pages")
-                for i, page in enumerate(pdf_reader.pages):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                        print(f"Page {i+1}: extracted {len(page_text)} chars")
+                with tracing.span('extract.pypdf') as attrs, \
+                        metrics.timed(metrics.TEXT_EXTRACTION_SECONDS, backend='pypdf') as span:
+                    pdf_reader = PdfReader(file_path)
+                    attrs['pages'] = len(pdf_reader.pages)
+                    for i, page in enumerate(pdf_reader.pages):
+                        page_text = page.extract_text()
+                        if page_text:
+                            text += page_text + "\n"
+                            logger.debug("Page %d: extracted %d chars", i + 1, len(page_text))
+                    if not text.strip():
+                        span['outcome'] = 'empty'
+                    attrs['chars'] = len(text)
+                self._count_extraction("pypdf", span['outcome'])
                 if text.strip():
-                    print(f"✓ pypdf successful: {len(text)} chars total")
+                    logger.debug("%s extracted %d chars", "pypdf", len(text))
                     return text
-                else:
-                    print("pypdf extracted no text")
             except Exception as e:
-                print(f"✗ pypdf error: {e}")
-                import traceback
-                traceback.print_exc()
+                self._count_extraction("pypdf", "error")
+                logger.warning("%s failed on %s: %s", "pypdf", file_path, e,
+                               exc_info=logger.isEnabledFor(logging.DEBUG))
         
         # Try pdfplumber (better extraction for complex layouts)
         if pdfplumber:
             try:
-                print(f"Trying pdfplumber on {file_path}")
-                with pdfplumber.open(file_path) as pdf:
-                    print(f"PDF has {len(pdf.pages)} pages")
+                logger.debug("Trying %s on %s", "pdfplumber", file_path)
+                with tracing.span('extract.pdfplumber') as attrs, \
+                        metrics.timed(metrics.TEXT_EXTRACTION_SECONDS, backend='pdfplumber') as span, \
+                        pdfplumber.open(file_path) as pdf:
+                    attrs['pages'] = len(pdf.pages)
                     for i, page in enumerate(pdf.pages):
                         page_text = page.extract_text()
                         if page_text:
                             text += page_text + "\n"
-                            print(f"Page {i+1}: extracted {len(page_text)} chars")
+                            logger.debug("Page %d: extracted %d chars", i + 1, len(page_text))
+                    if not text.strip():
+                        span['outcome'] = 'empty'
+                    attrs['chars'] = len(text)
+                self._count_extraction("pdfplumber", span['outcome'])
                 if text.strip():
-                    print(f"✓ pdfplumber successful: {len(text)} chars total")
+                    logger.debug("%s extracted %d chars", "pdfplumber", len(text))
                     return text
-                else:
-                    print("pdfplumber extracted no text")
             except Exception as e:
-                print(f"✗ pdfplumber error: {e}")
-                import traceback
-                traceback.print_exc()
+                self._count_extraction("pdfplumber", "error")
+                logger.warning("%s failed on %s: %s", "pdfplumber", file_path, e,
+                               exc_info=logger.isEnabledFor(logging.DEBUG))
         
         # Fallback to PyPDF2
         if PyPDF2:
             try:
-                print(f"Trying PyPDF2 on {file_path}")
-                with open(file_path, 'rb') as file:
+                logger.debug("Trying %s on %s", "PyPDF2", file_path)
+                with tracing.span('extract.PyPDF2') as attrs, \
+                        metrics.timed(metrics.TEXT_EXTRACTION_SECONDS, backend='PyPDF2') as span, \
+                        open(file_path, 'rb') as file:
                     pdf_reader = PyPDF2.PdfReader(file)
-                    print(f"PDF has {len(pdf_reader.pages)} pages")
+                    attrs['pages'] = len(pdf_reader.pages)
                     for i, page in enumerate(pdf_reader.pages):
                         page_text = page.extract_text()
                         if page_text:
                             text += page_text + "\n"
-                            print(f"Page {i+1}: extracted {len(page_text)} chars")
+                            logger.debug("Page %d: extracted %d chars", i + 1, len(page_text))
+                    if not text.strip():
+                        span['outcome'] = 'empty'
+                    attrs['chars'] = len(text)
+                self._count_extraction("PyPDF2", span['outcome'])
                 if text.strip():
-                    print(f"✓ PyPDF2 successful: {len(text)} chars total")
+                    logger.debug("%s extracted %d chars", "PyPDF2", len(text))
                     return text
-                else:
-                    print("PyPDF2 extracted no text")
             except Exception as e:
-                print(f"✗ PyPDF2 error: {e}")
-                import traceback
-                traceback.print_exc()
+                self._count_extraction("PyPDF2", "error")
+                logger.warning("%s failed on %s: %s", "PyPDF2", file_path, e,
+                               exc_info=logger.isEnabledFor(logging.DEBUG))
         
-        print(f"✗ Failed to extract text from PDF. Final text length: {len(text)}")
+        logger.warning("Could not extract text from %s", file_path)
         return text
     
     def extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
+        """Extract text from DOCX file: streamed from the zip, python-docx as fallback"""
+        try:
+            with tracing.span('extract.docx-stream') as attrs, \
+                    metrics.timed(metrics.TEXT_EXTRACTION_SECONDS, backend='docx-stream') as span:
+                text, stats = extract_docx_text(file_path)
+                attrs.update(stats)
+                if not text.strip():
+                    span['outcome'] = 'empty'
+            self._count_extraction("docx-stream", span['outcome'])
+            return text
+        except Exception as e:
+            self._count_extraction("docx-stream", "error")
+            logger.warning("%s failed on %s: %s", "docx-stream", file_path, e,
+                           exc_info=logger.isEnabledFor(logging.DEBUG))
+        
         if not Document:
             return ""
         
         try:
-            doc = Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+            with tracing.span('extract.python-docx') as attrs, \
+                    metrics.timed(metrics.TEXT_EXTRACTION_SECONDS, backend='python-docx') as span:
+                doc = Document(file_path)
+                text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+                attrs['paragraphs'] = len(doc.paragraphs)
+                if not text.strip():
+                    span['outcome'] = 'empty'
+            self._count_extraction("python-docx", span['outcome'])
             return text
         except Exception as e:
-            print(f"DOCX extraction error: {e}")
+            self._count_extraction("python-docx", "error")
+            logger.warning("DOCX extraction failed on %s: %s", file_path, e)
             return ""
     
+    def _count_extraction(self, backend: str, outcome: str):
+        """Count an extraction attempt per backend and outcome (ok, empty, error)"""
+        metrics.observe(metrics.TEXT_EXTRACTION_TOTAL, 1, outcome, backend=backend)
+    
     def extract_email(self, text: str) -> str:
         """Extract email address from text"""
         email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
@@ -184,39 +305,53 @@ class ResumeParser:
         
         return list(set(phones))  # Remove duplicates
     
-    def extract_sections(self, text: str) -> Dict[str, bool]:
-        """Detect common resume sections"""
-        text_lower = text.lower()
-        
-        sections = {
-            'experience': any(keyword in text_lower for keyword in [
-                'experience', 'work history', 'employment', 'professional experience'
-            ]),
-            'education': any(keyword in text_lower for keyword in [
-                'education', 'academic', 'degree', 'university', 'college'
-            ]),
-            'skills': any(keyword in text_lower for keyword in [
-                'skills', 'technical skills', 'competencies', 'expertise'
-            ]),
-            'summary': any(keyword in text_lower for keyword in [
-                'summary', 'profile', 'objective', 'about'
-            ]),
-            'projects': 'project' in text_lower,
-            'certifications': any(keyword in text_lower for keyword in [
-                'certification', 'certificate', 'credential'
-            ])
-        }
+    def segment_sections(self, text: str) -> Dict[str, List[List[int]]]:
+        """
+        Split resume text into typed sections at its heading lines, in one pass
         
-        return sections
+        Args:
+            text: Extracted resume text
+            
+        Returns:
+            {section: [[start, end], ...]} character offsets of each section body
+            (heading excluded) in text; empty when no heading was recognized
+        """
+        spans: Dict[str, List[List[int]]] = {}
+        # A combined heading ("Education & Certifications") gives its body to each of its types
+        current, start, pos = (), 0, 0
+        for line in text.splitlines(keepends=True):
+            kinds, body = _heading(line.rstrip('\r\n'))
+            if kinds:
+                for kind in current:
+                    if kind != 'other':
+                        spans.setdefault(kind, []).append([start, pos])
+                current = kinds
+                start = pos + body if body < len(line.rstrip('\r\n')) else pos + len(line)
+            pos += len(line)
+        for kind in current:
+            if kind != 'other':
+                spans.setdefault(kind, []).append([start, len(text)])
+        return spans
     
-    def count_action_verbs(self, text: str) -> int:
-        """Count action verbs in resume"""
+    def extract_sections(self, text: str, spans: Optional[Dict[str, List[List[int]]]] = None) -> Dict[str, bool]:
+        """Detect common resume sections from heading lines, by keyword for sections no heading matched"""
+        if spans is None:
+            spans = self.segment_sections(text)
         text_lower = text.lower()
+        return {
+            name: name in spans or any(keyword in text_lower for keyword in SECTION_KEYWORDS[name])
+            for name in SECTION_NAMES
+        }
+    
+    def count_action_verbs(self, text: str, spans: Optional[Dict[str, List[List[int]]]] = None) -> int:
+        """Count action verbs in the experience and projects sections (whole text if neither was found)"""
+        text_lower = section_text(text, spans, ACHIEVEMENT_SECTIONS).lower()
         count = sum(1 for verb in self.action_verbs if verb in text_lower)
         return count
     
-    def has_quantifiable_results(self, text: str) -> bool:
-        """Check if resume contains quantifiable achievements"""
+    def has_quantifiable_results(self, text: str, spans: Optional[Dict[str, List[List[int]]]] = None) -> bool:
+        """Check if the experience or projects sections (whole text if neither was found) contain quantifiable achievements"""
+        text = section_text(text, spans, ACHIEVEMENT_SECTIONS)
         # Look for percentages, numbers with units, etc.
         patterns = [
             r'\d+%',  # Percentages
@@ -0,0 +1,225 @@
+"""
+Synthetic Documents Module
+Builds small, valid resume files without external dependencies (warmup, load tests, benchmarks)
+"""
+
+import io
+import random
+import zipfile
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+SAMPLE_RESUME_LINES = [
+    "Jane Doe",
+    "jane.doe@example.com | 555-123-4567",
+    "Professional Summary",
+    "Software engineer with 5 years of experience building data platforms.",
+    "Experience",
+    "Senior Software Engineer, Acme Corp",
+    "Led a team of 4 engineers and increased pipeline throughput by 35%.",
+    "Developed Python and SQL services on AWS, saving $120k per year.",
+    "Education",
+    "B.Sc. Computer Science, State University",
+    "Skills",
+    "Python, SQL, Docker, Kubernetes, React, machine learning, communication",
+    "Projects",
+    "Built a resume scoring tool used by 2,000 students.",
+]
+
+SAMPLE_JOB_DESCRIPTION = (
+    "We are hiring a software engineer with strong Python and SQL skills, "
+    "experience with AWS and Docker, and a track record of leading projects. "
+    "Machine learning and data analysis experience is a plus."
+)
+
+
+LINES_PER_PAGE = 52
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "SQL", "AWS", "Azure", "Docker", "Kubernetes", "React",
+    "Node.js", "machine learning", "data analysis", "Pandas", "TensorFlow", "Spark", "Airflow",
+    "PostgreSQL", "MongoDB", "GraphQL", "Terraform", "CI/CD", "Linux", "Go", "TypeScript",
+    "project management", "communication", "leadership", "Agile", "Scrum", "Tableau",
+]
+VERBS = [
+    "Led", "Developed", "Designed", "Implemented", "Built", "Improved", "Optimized", "Launched",
+    "Streamlined", "Delivered", "Managed", "Created", "Reduced", "Increased", "Automated",
+]
+OBJECTS = [
+    "a data pipeline", "the billing service", "an internal analytics dashboard", "the mobile API",
+    "a recommendation engine", "the deployment process", "customer onboarding flows",
+    "a reporting platform", "the search backend", "a fraud detection model",
+]
+RESULTS = [
+    "increasing throughput by {n}%", "saving ${n}k per year", "reducing latency by {n}%",
+    "serving {n} thousand users", "cutting costs by {n}%", "improving retention by {n}%",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Tech"]
+ROLES = ["Software Engineer", "Data Scientist", "Backend Developer", "ML Engineer", "Project Manager"]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_pdf(lines: List[str]) -> bytes:
+    """
+    Build a PDF with one line of Helvetica text per entry, paginated
+
+    Args:
+        lines: Text lines (Latin-1 characters only)
+
+    Returns:
+        PDF file content
+    """
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    page_count = len(pages)
+    # Objects: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(page_count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page_lines in enumerate(pages):
+        stream_lines = ["BT", "/F1 11 Tf", "14 TL", "50 780 Td"]
+        for line in page_lines:
+            stream_lines.append(f"({_pdf_escape(line)}) Tj T*")
+        stream_lines.append("ET")
+        stream = "\n".join(stream_lines).encode('latin-1', errors='replace')
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def build_docx(paragraphs: List[str]) -> bytes:
+    """
+    Build a minimal DOCX (WordprocessingML) with one paragraph per entry
+
+    Args:
+        paragraphs: Paragraph texts
+
+    Returns:
+        DOCX file content
+    """
+    body = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>' for text in paragraphs
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{body}</w:body></w:document>'
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in (('[Content_Types].xml', content_types), ('_rels/.rels', rels),
+                           ('word/document.xml', document)):
+            # Fixed timestamps keep the bytes deterministic
+            archive.writestr(zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0)), data, zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+
+def generate_resume_lines(rng: random.Random, bullets: int) -> List[str]:
+    """Resume text with contact info, the usual sections and the given number of experience bullets"""
+    first = rng.choice(["Alex", "Sam", "Priya", "Chen", "Maria", "Omar"])
+    last = rng.choice(["Lee", "Patel", "Garcia", "Smith", "Khan"])
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "Professional Summary",
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience in {', '.join(rng.sample(SKILLS, 3))}.",
+        "Experience",
+    ]
+    for i in range(bullets):
+        if i % 6 == 0:
+            lines.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)} ({2010 + i % 14} - {2011 + i % 14})")
+        result = rng.choice(RESULTS).format(n=rng.randint(5, 90))
+        lines.append(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, {result}.")
+    lines += [
+        "Education",
+        "B.Sc. Computer Science, State University",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, rng.randint(6, 14))),
+        "Projects",
+        f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} as an open source project.",
+    ]
+    if rng.random() < 0.5:
+        lines += ["Certifications", "AWS Certified Solutions Architect"]
+    return lines
+
+
+def generate_job_description(rng: random.Random, sentences: int) -> str:
+    """Job description with the given number of requirement sentences"""
+    role = rng.choice(ROLES)
+    parts = [f"We are hiring a {role} to join our team."]
+    for _ in range(sentences):
+        skills = rng.sample(SKILLS, 2)
+        parts.append(rng.choice([
+            f"Strong experience with {skills[0]} and {skills[1]} is required.",
+            f"You will own {rng.choice(OBJECTS)} end to end using {skills[0]}.",
+            f"Familiarity with {skills[0]} is a plus; {skills[1]} experience preferred.",
+            f"Collaborate with product and design, demonstrating {rng.choice(['leadership', 'communication', 'teamwork'])}.",
+        ]))
+    return " ".join(parts)
+
+
+def generate_corpus(resumes: int = 50, job_descriptions: int = 20, seed: int = 7) -> Dict:
+    """
+    Deterministic corpus of PDF/DOCX resumes and JDs of varying length
+
+    Returns:
+        Dictionary with 'resumes' (list of {name, format, content, lines}) and
+        'job_descriptions' (list of str); the same seed always yields the same bytes
+    """
+    rng = random.Random(seed)
+    # Mostly one-page resumes with a tail of long ones
+    bullet_counts = [4, 8, 12, 20, 40, 90]
+    corpus_resumes = []
+    for i in range(resumes):
+        lines = generate_resume_lines(rng, rng.choice(bullet_counts))
+        if i % 3 == 2:
+            corpus_resumes.append({'name': f"resume_{i:04d}.docx", 'format': 'docx',
+                                   'content': build_docx(lines), 'lines': lines})
+        else:
+            corpus_resumes.append({'name': f"resume_{i:04d}.pdf", 'format': 'pdf',
+                                   'content': build_pdf(lines), 'lines': lines})
+    jds = [generate_job_description(rng, rng.choice([2, 5, 10, 25, 60])) for _ in range(job_descriptions)]
+    return {'resumes': corpus_resumes, 'job_descriptions': jds}
+
+
+def write_sample_pdf(path: str, lines: List[str] = None) -> str:
+    """Write a synthetic resume PDF to path and return the path"""
+    with open(path, 'wb') as f:
+        f.write(build_pdf(lines or SAMPLE_RESUME_LINES))
+    return path
@@ -0,0 +1,87 @@
+"""
+Resume Section Tests
+Heading detection and section spans of ResumeParser.segment_sections / extract_sections
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_parser import ResumeParser
+
+
+@pytest.fixture
+def parser():
+    return ResumeParser()
+
+
+def section_bodies(parser, text):
+    return {name: [text[start:end] for start, end in spans]
+            for name, spans in parser.segment_sections(text).items()}
+
+
+@pytest.mark.parametrize("heading, expected", [
+    ("EDUCATION & CERTIFICATIONS", {'education', 'certifications'}),
+    ("Technical Skills & Tools", {'skills'}),
+    ("Work Experience & Internships", {'experience'}),
+    ("Skills, Expertise and Technologies", {'skills'}),
+    ("Licenses and Certifications:", {'certifications'}),
+])
+def test_combined_headings(parser, heading, expected):
+    text = f"Jane Doe\n{heading}\nbody line\n"
+    assert set(parser.segment_sections(text)) == expected
+
+
+def test_combined_heading_ends_previous_section(parser):
+    text = ("Work Experience\nLed a team of 5, increased revenue 20%\n"
+            "Technical Skills & Tools\nPython, SQL, Docker\n"
+            "EDUCATION & CERTIFICATIONS\nB.Sc. Computer Science\n")
+    bodies = section_bodies(parser, text)
+    assert bodies['experience'] == ["Led a team of 5, increased revenue 20%\n"]
+    assert bodies['skills'] == ["Python, SQL, Docker\n"]
+    assert bodies['education'] == bodies['certifications'] == ["B.Sc. Computer Science\n"]
+
+
+def test_inline_heading_keeps_content(parser):
+    text = "Experience\nBuilt things\n  Skills: Python, SQL\n"
+    assert section_bodies(parser, text)['skills'] == [" Python, SQL\n"]
+
+
+def test_body_lines_are_not_headings(parser):
+    assert parser.segment_sections("Python and SQL\nReact, Node.js, AWS\n") == {}
+
+
+@pytest.mark.parametrize("line", [
+    "Mentoring and Training",
+    "Docker, Kubernetes, Tools",
+    "Python, Skills",
+    "Java and Education",
+    "Research & Projects",
+    "Tools",
+    "Training",
+])
+def test_body_lines_with_separators_are_not_headings(parser, line):
+    assert parser.segment_sections(f"Jane Doe\n{line}\n") == {}
+
+
+def test_body_line_does_not_split_experience(parser):
+    text = ("Experience\nLed a team of 5, increased revenue 20%\n"
+            "Mentoring and Training\nDeveloped onboarding, saved $10k\n")
+    parsed = parser.parse_text(text)
+    assert parsed['section_spans'].keys() == {'experience'}
+    assert parsed['action_verb_count'] >= 2
+    assert parsed['has_quantifiable_results']
+
+
+def test_unmatched_heading_falls_back_to_keywords(parser):
+    # Only "Experience" is a known heading; the others are found by keyword
+    text = "Experience\nBuilt things\nAcademic History\nState University\nMy Skillset: skills in Python\n"
+    parsed = parser.parse_text(text)
+    assert parsed['section_spans'].keys() == {'experience'}
+    assert parsed['sections']['experience']
+    assert parsed['sections']['education']
+    assert parsed['sections']['skills']
+    assert not parsed['sections']['certifications']
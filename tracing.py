@@ -0,0 +1,337 @@
+"""
+Tracing Module
+Request-scoped spans propagated through contextvars, sampled per request and
+exported as JSON lines (plain or OpenTelemetry OTLP/JSON records)
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# Fraction of requests traced; a sampled W3C traceparent header always is
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", 0.0))
+# jsonl, otlp or none
+TRACE_EXPORT = os.environ.get("TRACE_EXPORT", "jsonl").lower()
+TRACE_FILE = os.environ.get("TRACE_FILE", "traces.jsonl")
+# Recent sampled traces kept in memory for /api/traces
+TRACE_BUFFER = int(os.environ.get("TRACE_BUFFER", 200))
+SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "resume-ats-api")
+
+logger = logging.getLogger(__name__)
+
+
+def _new_id(nbytes: int) -> str:
+    return random.getrandbits(nbytes * 8).to_bytes(nbytes, 'big').hex()
+
+
+class Trace:
+    """Spans of one request; spans from executor threads append to the same list"""
+
+    def __init__(self, name: str, trace_id: Optional[str] = None, sampled: bool = False,
+                 parent_id: Optional[str] = None, attributes: Optional[Dict] = None):
+        self.name = name
+        self.trace_id = trace_id or _new_id(16)
+        self.sampled = sampled
+        self.root_id = _new_id(8)
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.duration_ms = None
+        self.status = 'ok'
+        self.spans: List[Dict] = []
+
+    def to_dict(self) -> Dict:
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'start_unix_ns': self.start_ns,
+            'duration_ms': self.duration_ms,
+            'status': self.status,
+            'attributes': self.attributes,
+            'spans': sorted(self.spans, key=lambda s: s['start_unix_ns']),
+        }
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+_recent: deque = deque(maxlen=max(TRACE_BUFFER, 0))
+_export_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_exporter_lock = threading.Lock()
+_exporter_pid = None
+
+
+def request_id() -> Optional[str]:
+    """Trace ID of the request being served (also set for unsampled requests)"""
+    trace = current_trace.get()
+    return trace.trace_id if trace else None
+
+
+def parse_traceparent(header: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[bool]]:
+    """(trace_id, parent span_id, sampled) from a W3C traceparent header, Nones if invalid"""
+    parts = (header or "").strip().split('-')
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None, None, None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None, None, None
+    if parts[1] == '0' * 32:
+        return None, None, None
+    return parts[1].lower(), parts[2].lower(), bool(flags & 1)
+
+
+def traceparent(trace: Trace) -> str:
+    return f"00-{trace.trace_id}-{trace.root_id}-{'01' if trace.sampled else '00'}"
+
+
+def begin(name: str, **attributes) -> Optional[Dict]:
+    """
+    Open a span under the current span without making it current
+
+    For start/end callbacks (e.g. LangChain) that cannot wrap a block;
+    returns None when the request is not sampled. Close it with end().
+    """
+    trace = current_trace.get()
+    if trace is None or not trace.sampled:
+        return None
+    return {
+        'trace': trace,
+        'span_id': _new_id(8),
+        'parent_id': _current_span.get() or trace.root_id,
+        'name': name,
+        'attributes': attributes,
+        'start_unix_ns': time.time_ns(),
+        'start': time.perf_counter(),
+    }
+
+
+def end(handle: Optional[Dict], error: Optional[BaseException] = None):
+    """Close a span opened by begin() and attach it to its trace"""
+    if handle is None:
+        return
+    record = {
+        'span_id': handle['span_id'],
+        'parent_id': handle['parent_id'],
+        'name': handle['name'],
+        'start_unix_ns': handle['start_unix_ns'],
+        'duration_ms': round((time.perf_counter() - handle['start']) * 1000, 3),
+        'status': 'error' if error is not None else 'ok',
+        'attributes': handle['attributes'],
+        'thread': threading.current_thread().name,
+        'pid': os.getpid(),
+    }
+    if error is not None:
+        record['error'] = f"{type(error).__name__}: {error}"
+    # list.append is atomic, so concurrent executor threads need no lock
+    handle['trace'].spans.append(record)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Trace a block; the yielded dict holds span attributes and may be extended
+
+    Costs one ContextVar lookup when the request is not sampled.
+
+    Example:
+        with tracing.span('pdf.pypdf') as attrs:
+            attrs['pages'] = len(reader.pages)
+    """
+    handle = begin(name, **attributes)
+    if handle is None:
+        yield attributes
+        return
+    token = _current_span.set(handle['span_id'])
+    try:
+        yield handle['attributes']
+    except BaseException as e:
+        _current_span.reset(token)
+        end(handle, e)
+        raise
+    _current_span.reset(token)
+    end(handle)
+
+
+@contextmanager
+def start_trace(name: str, traceparent_header: Optional[str] = None, **attributes):
+    """
+    Root of a request's trace; exported on exit when sampled
+
+    An incoming traceparent header supplies the trace ID and the sampling
+    decision, so a client can force a trace of one slow request.
+    """
+    trace_id, parent_id, sampled = parse_traceparent(traceparent_header)
+    if sampled is None:
+        sampled = TRACE_SAMPLE_RATE > 0 and random.random() < TRACE_SAMPLE_RATE
+    trace = Trace(name, trace_id, sampled, parent_id, attributes)
+    trace_token = current_trace.set(trace)
+    span_token = _current_span.set(trace.root_id)
+    start = time.perf_counter()
+    try:
+        yield trace
+    except BaseException as e:
+        trace.status = 'error'
+        trace.attributes['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        trace.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        _current_span.reset(span_token)
+        current_trace.reset(trace_token)
+        if trace.sampled:
+            _finish(trace)
+
+
+# ---------------------------------------------------------------------------
+# Worker processes: spans are recorded there and handed back with the result
+# ---------------------------------------------------------------------------
+
+def carrier() -> Optional[Tuple[str, str, bool]]:
+    """Picklable (trace_id, span_id, sampled) of the current span, None outside a request"""
+    trace = current_trace.get()
+    if trace is None:
+        return None
+    return trace.trace_id, _current_span.get() or trace.root_id, trace.sampled
+
+
+@contextmanager
+def remote(context: Optional[Tuple[str, str, bool]]):
+    """
+    Continue a trace in a worker process; yields the list its spans are collected in
+
+    Unsampled requests still carry their ID, so worker log lines can be correlated.
+    """
+    if context is None:
+        yield []
+        return
+    trace_id, parent_id, sampled = context
+    trace = Trace("remote", trace_id, sampled)
+    trace.root_id = parent_id
+    trace_token = current_trace.set(trace)
+    span_token = _current_span.set(parent_id)
+    try:
+        yield trace.spans
+    finally:
+        _current_span.reset(span_token)
+        current_trace.reset(trace_token)
+
+
+def adopt(spans: Optional[List[Dict]]):
+    """Attach spans returned by remote() to the current trace"""
+    trace = current_trace.get()
+    if trace is not None and spans:
+        trace.spans.extend(spans)
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: Dict) -> List[Dict]:
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items()]
+
+
+def to_otlp(trace: Trace) -> Dict:
+    """OTLP/JSON ExportTraceServiceRequest for one trace (readable by OpenTelemetry collectors)"""
+    def otlp_span(span_id, parent_id, name, start_ns, duration_ms, status, attributes, kind, error=None):
+        record = {
+            'traceId': trace.trace_id,
+            'spanId': span_id,
+            'name': name,
+            'kind': kind,
+            'startTimeUnixNano': str(start_ns),
+            'endTimeUnixNano': str(start_ns + int(duration_ms * 1e6)),
+            'attributes': _otlp_attributes(attributes),
+            'status': {'code': 2, 'message': error or ''} if status == 'error' else {'code': 1},
+        }
+        if parent_id:
+            record['parentSpanId'] = parent_id
+        return record
+
+    # SPAN_KIND_SERVER for the request, SPAN_KIND_INTERNAL for the rest
+    spans = [otlp_span(trace.root_id, trace.parent_id, trace.name, trace.start_ns, trace.duration_ms,
+                       trace.status, trace.attributes, 2, trace.attributes.get('error'))]
+    for s in trace.spans:
+        attributes = dict(s['attributes'], **{'thread.name': s['thread'], 'process.pid': s['pid']})
+        spans.append(otlp_span(s['span_id'], s['parent_id'], s['name'], s['start_unix_ns'], s['duration_ms'],
+                               s['status'], attributes, 1, s.get('error')))
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': _otlp_attributes({'service.name': SERVICE_NAME})},
+            'scopeSpans': [{'scope': {'name': 'tracing'}, 'spans': spans}],
+        }]
+    }
+
+
+def _export_loop():
+    while True:
+        line = _export_queue.get()
+        try:
+            # O_APPEND keeps lines from forked workers sharing the file intact
+            fd = os.open(TRACE_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.warning("Trace export failed: %s", e)
+
+
+def _ensure_exporter():
+    global _exporter_pid
+    # One writer thread per process (forked server workers start their own)
+    if _exporter_pid == os.getpid():
+        return
+    with _exporter_lock:
+        if _exporter_pid != os.getpid():
+            threading.Thread(target=_export_loop, name="trace-exporter", daemon=True).start()
+            _exporter_pid = os.getpid()
+
+
+def _finish(trace: Trace):
+    _recent.append(trace)
+    if TRACE_EXPORT not in ('jsonl', 'otlp'):
+        return
+    record = to_otlp(trace) if TRACE_EXPORT == 'otlp' else trace.to_dict()
+    _ensure_exporter()
+    # Serialized here; the writer thread only does file I/O
+    _export_queue.put((json.dumps(record, default=str) + "\n").encode('utf-8'))
+
+
+def recent(limit: int = 50) -> List[Dict]:
+    """Summaries of the most recent sampled traces, newest first"""
+    traces = list(_recent)[-limit:][::-1] if limit > 0 else []
+    return [{
+        'trace_id': t.trace_id,
+        'name': t.name,
+        'duration_ms': t.duration_ms,
+        'status': t.status,
+        'spans': len(t.spans),
+    } for t in traces]
+
+
+def get(trace_id: str) -> Optional[Dict]:
+    """A recent sampled trace with all its spans"""
+    for trace in reversed(list(_recent)):
+        if trace.trace_id == trace_id:
+            return trace.to_dict()
+    return None